@@ -2,8 +2,11 @@
 API REST para o gerenciador de senhas com suporte a múltiplos usuários
 """
 import base64
+import json
+import time
 from fastapi import FastAPI, HTTPException, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from typing import Optional, List, Tuple
 from datetime import datetime
 
@@ -11,11 +14,23 @@ from schemas import (
     PasswordCreate, PasswordUpdate, PasswordResponse, PasswordDetailResponse,
     UserRegister, UserLogin, LoginResponse,
     WalletExportRequest, WalletImportRequest,
-    PasswordGenerateRequest, PasswordGenerateResponse, MessageResponse
+    PasswordGenerateRequest, PasswordGenerateResponse, MessageResponse,
+    PasswordGenerateBatchRequest, PasswordGenerateBatchResponse,
+    PassphraseGenerateRequest, PassphraseGenerateResponse
 )
 from auth import auth_manager, SessionInfo
 from password_manager import PasswordManager
 from password_generator import PasswordGenerator
+from password_pool import PasswordPool
+from password_policy import PasswordPolicy, compile_policy
+from passphrase import default_wordlist
+from compression import CompressionMiddleware, compression_stats
+from profiling import ProfilingMiddleware, profiling_enabled
+from query_trace import QueryTraceMiddleware
+from metrics import (
+    registry, MetricsMiddleware,
+    WALLET_ENTRIES, WALLET_BYTES, WALLET_DURATION
+)
 
 app = FastAPI(
     title="Password Manager API",
@@ -31,6 +46,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Wallets exportados e listagens grandes são JSON muito compressível
+app.add_middleware(CompressionMiddleware)
+
+# Profiling só é instalado quando configurado (custo zero quando desligado)
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware)
+
+# Request id + resumo de consultas SQL (header X-DB-Queries em modo debug)
+app.add_middleware(QueryTraceMiddleware)
+
+# Adicionado por último para ficar mais externo e medir o tempo total
+app.add_middleware(MetricsMiddleware)
+
+registry.gauge(
+    "auth_active_sessions",
+    "Sessões ativas (não expiradas) no AuthManager",
+    auth_manager.count_active_sessions,
+)
+registry.add_collector(compression_stats.prometheus_lines)
+
+# Senhas pré-geradas para o endpoint interativo de geração
+password_pool = PasswordPool()
+registry.add_collector(password_pool.prometheus_lines)
+
+
+@app.on_event("startup")
+async def start_password_pool():
+    password_pool.start()
+
+
+@app.on_event("shutdown")
+async def close_password_pool():
+    password_pool.close()
+
 
 def get_user_from_token(token: str = Header(..., alias="X-Session-Token")) -> Tuple[PasswordManager, int]:
     """
@@ -182,13 +231,14 @@ async def create_password(
             expiration_date=password_data.expiration_date,
             custom_password=password_data.custom_password,
             encrypted_password=encrypted_bytes,
+            policy=PasswordPolicy(**password_data.policy.model_dump()) if password_data.policy else None,
         )
         
         entry = pm.get_password(entry_id, user_id)
         if not entry:
             raise HTTPException(status_code=500, detail="Erro ao recuperar senha criada")
         
-        entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+        entropy_level = entry.entropy_level or PasswordGenerator.get_entropy_level(entry.entropy)
         
         return PasswordResponse(
             id=entry.id,
@@ -229,7 +279,7 @@ async def list_passwords(pm_and_user: Tuple[PasswordManager, int] = Depends(get_
         entries = pm.get_all_passwords(user_id)
         result = []
         for entry in entries:
-            entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+            entropy_level = entry.entropy_level or PasswordGenerator.get_entropy_level(entry.entropy)
             result.append(PasswordResponse(
                 id=entry.id,
                 title=entry.title,
@@ -269,7 +319,7 @@ async def get_password(
             raise HTTPException(status_code=404, detail="Senha não encontrada ou acesso negado")
 
         encrypted_b64 = base64.b64encode(entry.password).decode("utf-8")
-        entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+        entropy_level = entry.entropy_level or PasswordGenerator.get_entropy_level(entry.entropy)
         
         return PasswordDetailResponse(
             id=entry.id,
@@ -337,7 +387,7 @@ async def update_password(
         if not entry:
             raise HTTPException(status_code=500, detail="Erro ao recuperar senha atualizada")
         
-        entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+        entropy_level = entry.entropy_level or PasswordGenerator.get_entropy_level(entry.entropy)
         
         return PasswordResponse(
             id=entry.id,
@@ -400,13 +450,26 @@ async def generate_test_password(
     """
     Gera uma senha de teste sem salvar
     
+    Com policy, a senha segue a política do site (mínimos por tipo,
+    caracteres proibidos, sem repetição, pronunciável); sem policy, vem
+    do pool pré-gerado.
+    
     Returns:
         Senha gerada com informações de entropia
     """
     pm, user_id = pm_and_user
     
     try:
-        password = PasswordGenerator.generate(
+        if request.policy:
+            compiled = compile_policy(PasswordPolicy(**request.policy.model_dump()))
+            return PasswordGenerateResponse(
+                password=compiled.generate(),
+                length=request.policy.length,
+                entropy=compiled.entropy,
+                entropy_level=PasswordGenerator.get_entropy_level(compiled.entropy)
+            )
+        
+        password = password_pool.take(
             length=request.length,
             use_uppercase=request.use_uppercase,
             use_lowercase=request.use_lowercase,
@@ -435,6 +498,139 @@ async def generate_test_password(
         raise HTTPException(status_code=500, detail=f"Erro ao gerar senha: {str(e)}")
 
 
+# Acima disso a resposta do lote é enviada em streaming, em blocos
+GENERATE_BATCH_STREAM_THRESHOLD = 1000
+GENERATE_BATCH_CHUNK = 1000
+
+
+def _stream_generated_batch(request: PasswordGenerateBatchRequest, entropy: float, entropy_level: str):
+    """Gera o JSON do lote em blocos, sem montar todas as senhas em memória"""
+    header = {
+        "count": request.count,
+        "length": request.length,
+        "entropy": entropy,
+        "entropy_level": entropy_level,
+    }
+    yield json.dumps(header)[:-1] + ', "passwords": ['
+    remaining = request.count
+    first = True
+    while remaining > 0:
+        chunk = min(remaining, GENERATE_BATCH_CHUNK)
+        passwords = PasswordGenerator.generate_batch(
+            chunk,
+            request.length,
+            request.use_uppercase,
+            request.use_lowercase,
+            request.use_digits,
+            request.use_special
+        )
+        body = ", ".join(json.dumps(password) for password in passwords)
+        yield body if first else ", " + body
+        first = False
+        remaining -= chunk
+    yield "]}"
+
+
+@app.post("/api/passwords/generate/batch", response_model=PasswordGenerateBatchResponse)
+async def generate_password_batch(
+    request: PasswordGenerateBatchRequest,
+    pm_and_user: Tuple[PasswordManager, int] = Depends(get_user_from_token)
+):
+    """
+    Gera várias senhas de teste sem salvar
+    
+    O count é limitado pelo schema (MAX_GENERATE_BATCH). Lotes maiores que
+    GENERATE_BATCH_STREAM_THRESHOLD são enviados em streaming, no mesmo
+    formato JSON da resposta normal.
+    
+    Returns:
+        Senhas geradas com informações de entropia
+    """
+    try:
+        entropy = PasswordGenerator.calculate_entropy(
+            request.length,
+            request.use_uppercase,
+            request.use_lowercase,
+            request.use_digits,
+            request.use_special
+        )
+        entropy_level = PasswordGenerator.get_entropy_level(entropy)
+        
+        # Valida as opções antes de começar a resposta em streaming
+        # (entropia zero = nenhum tipo de caractere selecionado)
+        if entropy == 0:
+            raise ValueError("Pelo menos um tipo de caractere deve ser selecionado")
+        
+        if request.count > GENERATE_BATCH_STREAM_THRESHOLD:
+            return StreamingResponse(
+                _stream_generated_batch(request, entropy, entropy_level),
+                media_type="application/json"
+            )
+        
+        passwords = PasswordGenerator.generate_batch(
+            request.count,
+            request.length,
+            request.use_uppercase,
+            request.use_lowercase,
+            request.use_digits,
+            request.use_special
+        )
+        return PasswordGenerateBatchResponse(
+            passwords=passwords,
+            count=len(passwords),
+            length=request.length,
+            entropy=entropy,
+            entropy_level=entropy_level
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao gerar senhas: {str(e)}")
+
+
+@app.post("/api/passwords/generate/passphrase", response_model=PassphraseGenerateResponse)
+async def generate_passphrase(
+    request: PassphraseGenerateRequest,
+    pm_and_user: Tuple[PasswordManager, int] = Depends(get_user_from_token)
+):
+    """
+    Gera uma passphrase (diceware) de teste sem salvar
+    
+    Returns:
+        Passphrase gerada com a entropia exata para a wordlist configurada
+    """
+    try:
+        wordlist = default_wordlist()
+        passphrase = PasswordGenerator.generate_passphrase(
+            words=request.words,
+            separator=request.separator,
+            capitalization=request.capitalization,
+            include_digit=request.include_digit,
+            wordlist=wordlist
+        )
+        entropy = PasswordGenerator.calculate_passphrase_entropy(
+            request.words,
+            len(wordlist),
+            request.capitalization,
+            request.include_digit,
+            wordlist.cased_words
+        )
+        
+        return PassphraseGenerateResponse(
+            passphrase=passphrase,
+            words=request.words,
+            wordlist_size=len(wordlist),
+            entropy=entropy,
+            entropy_level=PasswordGenerator.get_entropy_level(entropy)
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro ao gerar passphrase: {str(e)}")
+
+
 @app.get("/api/wallet/export")
 async def wallet_export(pm_and_user: Tuple[PasswordManager, int] = Depends(get_user_from_token)):
     """
@@ -445,9 +641,11 @@ async def wallet_export(pm_and_user: Tuple[PasswordManager, int] = Depends(get_u
     """
     pm, user_id = pm_and_user
     
+    started = time.perf_counter()
     entries = pm.get_all_passwords(user_id)
 
     payload = []
+    exported_bytes = 0
     for e in entries:
         payload.append({
             "title": e.title,
@@ -463,6 +661,11 @@ async def wallet_export(pm_and_user: Tuple[PasswordManager, int] = Depends(get_u
             "updated_at": e.updated_at,
             "encrypted_password": base64.b64encode(e.password).decode("utf-8")
         })
+        exported_bytes += len(e.password)
+
+    WALLET_ENTRIES.inc(len(payload), direction="export")
+    WALLET_BYTES.inc(exported_bytes, direction="export")
+    WALLET_DURATION.observe(time.perf_counter() - started, direction="export")
 
     return {
         "exported_at": datetime.now().isoformat(),
@@ -504,7 +707,9 @@ async def wallet_import(
     if "entries" not in data:
         raise HTTPException(status_code=400, detail="Formato inválido de wallet.")
 
+    started = time.perf_counter()
     count = 0
+    imported_bytes = 0
     for entry in data["entries"]:
         encrypted_b64 = entry.get("encrypted_password")
         if not encrypted_b64:
@@ -528,10 +733,49 @@ async def wallet_import(
             encrypted_password=encrypted_bytes
         )
         count += 1
+        imported_bytes += len(encrypted_bytes)
+
+    WALLET_ENTRIES.inc(count, direction="import")
+    WALLET_BYTES.inc(imported_bytes, direction="import")
+    WALLET_DURATION.observe(time.perf_counter() - started, direction="import")
 
     return {"success": True, "imported": count}
 
 
+# ===== STATS ENDPOINTS =====
+
+@app.get("/api/stats/compression")
+async def compression_statistics():
+    """
+    Estatísticas de compressão por rota
+
+    Returns:
+        Razão de compressão, bytes e tempo de CPU por rota/codificação
+    """
+    return {"routes": compression_stats.snapshot()}
+
+
+@app.get("/api/stats/password-pool")
+async def password_pool_statistics():
+    """
+    Estatísticas do pool de senhas pré-geradas
+
+    Returns:
+        Hits, misses, taxa de acerto e ocupação por conjunto de opções
+    """
+    return password_pool.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Métricas no formato de exposição de texto do Prometheus
+
+    Inclui latência por rota/status, tempo de bcrypt, tempo de consultas
+    por método do DatabaseManager, sessões ativas e throughput de wallet.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 
 if __name__ == "__main__":
     import uvicorn
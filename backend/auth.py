@@ -12,6 +12,7 @@ import bcrypt
 from password_manager import PasswordManager
 from database import DatabaseManager
 from models import User
+from metrics import BCRYPT_DURATION
 
 
 class SessionInfo:
@@ -77,10 +78,11 @@ class AuthManager:
                 return False, "Username já existe"
 
             # Hash da senha com bcrypt
-            password_hash = bcrypt.hashpw(
-                password.encode('utf-8'),
-                bcrypt.gensalt(rounds=self.bcrypt_cost)
-            ).decode('utf-8')
+            with BCRYPT_DURATION.time(operation="hash"):
+                password_hash = bcrypt.hashpw(
+                    password.encode('utf-8'),
+                    bcrypt.gensalt(rounds=self.bcrypt_cost)
+                ).decode('utf-8')
 
             # Cria o usuário
             now = datetime.now()
@@ -125,10 +127,12 @@ class AuthManager:
                 return None, None, "Username ou senha incorretos"
 
             # Verifica a senha com bcrypt
-            if not bcrypt.checkpw(
-                password.encode('utf-8'),
-                user.password_hash.encode('utf-8')
-            ):
+            with BCRYPT_DURATION.time(operation="verify"):
+                password_ok = bcrypt.checkpw(
+                    password.encode('utf-8'),
+                    user.password_hash.encode('utf-8')
+                )
+            if not password_ok:
                 return None, None, "Username ou senha incorretos"
 
             # ===== SESSION FIXATION PROTECTION =====
@@ -201,6 +205,13 @@ class AuthManager:
         """Verifica rapidamente se um token existe"""
         return token in self.sessions
 
+    def count_active_sessions(self) -> int:
+        """Conta as sessões ainda não expiradas (usado pelas métricas)"""
+        return sum(
+            1 for session in list(self.sessions.values())
+            if not session.is_expired(self.session_timeout_minutes)
+        )
+
 
 # Instância global
 auth_manager = AuthManager()
@@ -0,0 +1,331 @@
+"""
+Índice local de senhas vazadas (hashes SHA-1 no formato do HIBP)
+
+Nenhuma consulta sai da máquina: a lista de hashes (por exemplo o download
+"Pwned Passwords" em SHA-1, linhas "HASH:CONTAGEM") é convertida offline
+em 256 shards ordenados, um por primeiro byte do hash:
+
+    índice/
+        manifest.json
+        00.bin ... ff.bin
+
+Cada shard (little-endian):
+    cabeçalho  magic "PWBI" | versão u16 | reservado u16 | quantidade u32
+    registros  quantidade x (19 bytes restantes do SHA-1 | contagem u32), ordenados
+
+Os shards são abertos com mmap sob demanda e a busca é binária sobre
+registros de tamanho fixo: O(log n), sem carregar nada no heap. range()
+devolve todos os sufixos de um prefixo hexadecimal, no mesmo modelo de
+k-anonimato da API range do HIBP.
+
+Para gerar:
+    python breach_index.py build pwned-passwords-sha1.txt breach_index/
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+MAGIC = b"PWBI"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+SUFFIX_SIZE = 19
+COUNT = struct.Struct("<I")
+RECORD_SIZE = SUFFIX_SIZE + COUNT.size
+MANIFEST = "manifest.json"
+
+DEFAULT_INDEX_DIR = os.getenv(
+    "BREACH_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "breach_index")
+)
+
+
+def password_digest(password: str) -> bytes:
+    """SHA-1 da senha (mesmo hash usado pelo HIBP)"""
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+def _shard_name(first_byte: int) -> str:
+    return f"{first_byte:02x}.bin"
+
+
+class _Shard:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Shard do índice de vazamentos inválido: {path}")
+        if HEADER.size + count * RECORD_SIZE > len(self._mmap):
+            self._mmap.close()
+            raise ValueError(f"Shard do índice de vazamentos truncado: {path}")
+        self.count = count
+
+    def suffix(self, index: int) -> bytes:
+        start = HEADER.size + index * RECORD_SIZE
+        return self._mmap[start:start + SUFFIX_SIZE]
+
+    def count_at(self, index: int) -> int:
+        return COUNT.unpack_from(self._mmap, HEADER.size + index * RECORD_SIZE + SUFFIX_SIZE)[0]
+
+    def lower_bound(self, suffix: bytes, lo: int = 0) -> int:
+        hi = self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.suffix(mid) < suffix:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def close(self):
+        self._mmap.close()
+
+
+class BreachIndex:
+    """Consulta ao índice de vazamentos gerado por build_index"""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Diretório com manifest.json e os shards
+        """
+        manifest_path = os.path.join(directory, MANIFEST)
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError("Índice de vazamentos de versão não suportada")
+        self.directory = directory
+        self._shards: Dict[int, Optional[_Shard]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.manifest.get("records", 0)
+
+    def _shard(self, first_byte: int) -> Optional[_Shard]:
+        shard = self._shards.get(first_byte, False)
+        if shard is False:
+            with self._lock:
+                shard = self._shards.get(first_byte, False)
+                if shard is False:
+                    path = os.path.join(self.directory, _shard_name(first_byte))
+                    shard = _Shard(path) if os.path.exists(path) else None
+                    self._shards[first_byte] = shard
+        return shard
+
+    def count_digest(self, digest: bytes) -> int:
+        """
+        Quantas vezes o hash aparece nos vazamentos
+
+        Args:
+            digest: SHA-1 (20 bytes)
+
+        Returns:
+            Contagem (0 se não vazou)
+        """
+        shard = self._shard(digest[0])
+        if shard is None:
+            return 0
+        suffix = digest[1:]
+        index = shard.lower_bound(suffix)
+        if index < shard.count and shard.suffix(index) == suffix:
+            return shard.count_at(index)
+        return 0
+
+    def count(self, password: str) -> int:
+        """Quantas vezes a senha aparece nos vazamentos (0 se não vazou)"""
+        return self.count_digest(password_digest(password))
+
+    def is_breached(self, password: str) -> bool:
+        return self.count(password) > 0
+
+    def count_many(self, digests: Iterable[bytes]) -> List[int]:
+        """
+        Consulta vários hashes de uma vez
+
+        Os hashes são ordenados antes da busca: cada shard é visitado uma
+        vez e a busca binária recomeça de onde a anterior parou.
+
+        Args:
+            digests: Hashes SHA-1 (20 bytes)
+
+        Returns:
+            Contagens, na mesma ordem da entrada
+        """
+        digests = list(digests)
+        counts = [0] * len(digests)
+        order = sorted(range(len(digests)), key=digests.__getitem__)
+        current_byte = None
+        shard = None
+        lo = 0
+        for position in order:
+            digest = digests[position]
+            if digest[0] != current_byte:
+                current_byte = digest[0]
+                shard = self._shard(current_byte)
+                lo = 0
+            if shard is None:
+                continue
+            suffix = digest[1:]
+            lo = shard.lower_bound(suffix, lo)
+            if lo < shard.count and shard.suffix(lo) == suffix:
+                counts[position] = shard.count_at(lo)
+        return counts
+
+    def range(self, prefix: str) -> List[Tuple[str, int]]:
+        """
+        Todos os hashes que começam com um prefixo (k-anonimato)
+
+        Args:
+            prefix: Prefixo hexadecimal com pelo menos 2 dígitos (o HIBP usa 5)
+
+        Returns:
+            Lista de (sufixo hexadecimal após o prefixo, contagem)
+        """
+        prefix = prefix.lower()
+        if len(prefix) < 2 or len(prefix) > 40:
+            raise ValueError("O prefixo deve ter entre 2 e 40 dígitos hexadecimais")
+        low = bytes.fromhex(prefix.ljust(40, "0"))
+        high = bytes.fromhex(prefix.ljust(40, "f"))
+        shard = self._shard(low[0])
+        if shard is None:
+            return []
+        result = []
+        index = shard.lower_bound(low[1:])
+        while index < shard.count:
+            suffix = shard.suffix(index)
+            if suffix > high[1:]:
+                break
+            full = (low[:1] + suffix).hex()
+            result.append((full[len(prefix):].upper(), shard.count_at(index)))
+            index += 1
+        return result
+
+    def close(self):
+        with self._lock:
+            for shard in self._shards.values():
+                if shard is not None:
+                    shard.close()
+            self._shards.clear()
+
+
+def _parse_line(line: str) -> Optional[Tuple[bytes, int]]:
+    line = line.strip()
+    if not line:
+        return None
+    digest_hex, _, count = line.partition(":")
+    if len(digest_hex) != 40:
+        raise ValueError(f"Linha inválida na lista de hashes: {line[:60]}")
+    return bytes.fromhex(digest_hex), int(count or 1)
+
+
+def build_index(lines: Iterable[str], directory: str, source: str = "") -> dict:
+    """
+    Gera o índice a partir de linhas "SHA1:CONTAGEM"
+
+    Os registros são distribuídos em 256 arquivos temporários pelo primeiro
+    byte do hash e cada um é ordenado em memória (1/256 da lista por vez),
+    então a lista completa nunca precisa caber na memória.
+
+    Args:
+        lines: Linhas da lista de hashes (a ordem não importa)
+        directory: Diretório de saída
+        source: Descrição da origem, gravada no manifest
+
+    Returns:
+        Manifest gravado
+    """
+    started = time.perf_counter()
+    os.makedirs(directory, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix="breach_build_", dir=directory)
+    buckets = [open(os.path.join(workdir, f"{i:02x}.tmp"), "wb") for i in range(256)]
+    try:
+        for line in lines:
+            parsed = _parse_line(line)
+            if parsed is None:
+                continue
+            digest, count = parsed
+            buckets[digest[0]].write(digest[1:] + COUNT.pack(min(count, 0xFFFFFFFF)))
+    finally:
+        for bucket in buckets:
+            bucket.close()
+
+    total = 0
+    for i in range(256):
+        bucket_path = os.path.join(workdir, f"{i:02x}.tmp")
+        with open(bucket_path, "rb") as f:
+            data = f.read()
+        os.remove(bucket_path)
+        records = sorted(data[offset:offset + RECORD_SIZE] for offset in range(0, len(data), RECORD_SIZE))
+
+        # Hashes repetidos na origem: soma as contagens
+        merged: List[bytes] = []
+        for record in records:
+            if merged and merged[-1][:SUFFIX_SIZE] == record[:SUFFIX_SIZE]:
+                previous = COUNT.unpack_from(merged[-1], SUFFIX_SIZE)[0]
+                added = COUNT.unpack_from(record, SUFFIX_SIZE)[0]
+                merged[-1] = record[:SUFFIX_SIZE] + COUNT.pack(min(previous + added, 0xFFFFFFFF))
+            else:
+                merged.append(record)
+
+        shard_path = os.path.join(directory, _shard_name(i))
+        with open(shard_path + ".tmp", "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(merged)))
+            f.write(b"".join(merged))
+        os.replace(shard_path + ".tmp", shard_path)
+        total += len(merged)
+    os.rmdir(workdir)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "records": total,
+        "source": source,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "build_seconds": round(time.perf_counter() - started, 3),
+    }
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+_default_index: Optional[BreachIndex] = None
+_default_checked = False
+_default_lock = threading.Lock()
+
+
+def default_index() -> Optional[BreachIndex]:
+    """
+    Índice padrão (BREACH_INDEX_DIR ou backend/breach_index)
+
+    Returns:
+        BreachIndex, ou None se nenhum índice foi gerado
+    """
+    global _default_index, _default_checked
+    if not _default_checked:
+        with _default_lock:
+            if not _default_checked:
+                if os.path.exists(os.path.join(DEFAULT_INDEX_DIR, MANIFEST)):
+                    _default_index = BreachIndex(DEFAULT_INDEX_DIR)
+                _default_checked = True
+    return _default_index
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] != "build":
+        print("Uso: python breach_index.py build <hashes-sha1.txt> <diretório>")
+        sys.exit(1)
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        manifest = build_index(f, sys.argv[3], source=os.path.basename(sys.argv[2]))
+    print(f"{manifest['records']} hashes indexados em {manifest['build_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Middleware de compressão de respostas (gzip/brotli) para a API
+"""
+import os
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from metrics import _format_labels, route_template
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional
+    brotli = None
+
+
+# Respostas menores que isso não compensam o custo de CPU da compressão
+DEFAULT_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+DEFAULT_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+DEFAULT_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# Tipos que já chegam comprimidos (ou não ganham nada com compressão)
+_SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+def parse_accept_encoding(header_value: str) -> Dict[str, float]:
+    """
+    Interpreta o header Accept-Encoding
+
+    Args:
+        header_value: Valor do header (ex.: "gzip, br;q=0.8")
+
+    Returns:
+        Dicionário codificação -> qvalue
+    """
+    encodings = {}
+    for part in header_value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+
+def choose_encoding(header_value: str) -> Optional[str]:
+    """
+    Escolhe a melhor codificação suportada pelo cliente
+
+    Prefere brotli (quando instalado) e depois gzip, respeitando q=0.
+
+    Returns:
+        "br", "gzip" ou None se nenhuma for aceitável
+    """
+    if not header_value:
+        return None
+    accepted = parse_accept_encoding(header_value)
+    wildcard = accepted.get("*", 0.0)
+
+    candidates = []
+    if brotli is not None:
+        candidates.append("br")
+    candidates.append("gzip")
+
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Compressor incremental para gzip ou brotli"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 -> container gzip
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(b"") + self._obj.flush()
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.finish() if self.encoding == "br" else self._obj.flush()
+
+
+class CompressionStats:
+    """
+    Estatísticas de compressão por rota
+
+    Guarda bytes de entrada/saída, tempo de CPU gasto comprimindo e
+    quantas respostas foram comprimidas ou puladas.
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], List[float]] = {}
+
+    def record(self, route: str, encoding: str, raw_bytes: int, compressed_bytes: int, cpu_seconds: float):
+        """Registra uma resposta comprimida"""
+        stats = self._routes.setdefault((route, encoding), [0, 0, 0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += raw_bytes
+        stats[2] += compressed_bytes
+        stats[3] += cpu_seconds
+
+    def record_skipped(self, route: str):
+        """Registra uma resposta que não foi comprimida (pequena ou sem suporte)"""
+        stats = self._routes.setdefault((route, "identity"), [0, 0, 0, 0.0, 0])
+        stats[4] += 1
+
+    def snapshot(self) -> List[dict]:
+        """
+        Retorna as estatísticas atuais
+
+        Returns:
+            Lista de dicionários com route, encoding, responses, raw_bytes,
+            compressed_bytes, ratio, cpu_seconds e skipped
+        """
+        result = []
+        for (route, encoding), (count, raw, compressed, cpu, skipped) in list(self._routes.items()):
+            result.append({
+                "route": route,
+                "encoding": encoding,
+                "responses": count,
+                "raw_bytes": raw,
+                "compressed_bytes": compressed,
+                "ratio": round(raw / compressed, 3) if compressed else None,
+                "cpu_seconds": round(cpu, 6),
+                "skipped": skipped,
+            })
+        return result
+
+    def prometheus_lines(self) -> List[str]:
+        """Linhas no formato de exposição do Prometheus (coletor do /metrics)"""
+        lines = [
+            "# HELP http_response_compression_raw_bytes_total Bytes antes da compressão",
+            "# TYPE http_response_compression_raw_bytes_total counter",
+            "# HELP http_response_compression_bytes_total Bytes após a compressão",
+            "# TYPE http_response_compression_bytes_total counter",
+            "# HELP http_response_compression_cpu_seconds_total CPU gasto comprimindo",
+            "# TYPE http_response_compression_cpu_seconds_total counter",
+            "# HELP http_response_compression_skipped_total Respostas enviadas sem compressão",
+            "# TYPE http_response_compression_skipped_total counter",
+        ]
+        for item in self.snapshot():
+            labels = _format_labels(("route", "encoding"), (item["route"], item["encoding"]))
+            if item["encoding"] == "identity":
+                lines.append(f"http_response_compression_skipped_total{labels} {item['skipped']}")
+                continue
+            lines.append(f"http_response_compression_raw_bytes_total{labels} {item['raw_bytes']}")
+            lines.append(f"http_response_compression_bytes_total{labels} {item['compressed_bytes']}")
+            lines.append(f"http_response_compression_cpu_seconds_total{labels} {item['cpu_seconds']}")
+        return lines
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime respostas com gzip ou brotli
+
+    - Negocia a codificação pelo Accept-Encoding
+    - Respostas menores que minimum_size são enviadas sem compressão
+    - Compatível com StreamingResponse: cada chunk é comprimido e enviado
+      com flush, sem acumular o corpo inteiro em memória
+    - Registra razão de compressão e tempo de CPU por rota
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+        stats: CompressionStats = compression_stats,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Estado de compressão de uma única resposta"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope: dict, send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.send_downstream = send
+        self.encoding = encoding
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.cpu_seconds = 0.0
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Adia o envio: os headers dependem do tamanho do primeiro chunk
+            self.start_message = message
+            headers = message.get("headers", [])
+            for name, value in headers:
+                if name == b"content-encoding":
+                    self.passthrough = True
+                elif name == b"content-type" and value.decode("latin-1").startswith(_SKIP_CONTENT_TYPES):
+                    self.passthrough = True
+            return
+
+        if message_type != "http.response.body":
+            await self.send_downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start = self.start_message
+            self.start_message = None
+            small = not more_body and len(body) < self.middleware.minimum_size
+            if self.passthrough or small:
+                self.passthrough = True
+                self.middleware.stats.record_skipped(route_template(self.scope))
+                await self.send_downstream(start)
+                await self.send_downstream(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers = [
+                (name, value) for name, value in start.get("headers", [])
+                if name != b"content-length"
+            ]
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            headers.append((b"vary", b"Accept-Encoding"))
+            payload = self._compress(body, final=not more_body)
+            if not more_body:
+                headers.append((b"content-length", str(len(payload)).encode("latin-1")))
+            await self.send_downstream({**start, "headers": headers})
+            await self.send_downstream({"type": "http.response.body", "body": payload, "more_body": more_body})
+            if not more_body:
+                self._record()
+            return
+
+        if self.passthrough:
+            await self.send_downstream(message)
+            return
+
+        payload = self._compress(body, final=not more_body)
+        await self.send_downstream({"type": "http.response.body", "body": payload, "more_body": more_body})
+        if not more_body:
+            self._record()
+
+    def _compress(self, body: bytes, final: bool) -> bytes:
+        started = time.thread_time()
+        out = self.compressor.compress(body)
+        # Streaming: flush a cada chunk para o cliente receber dados imediatamente
+        out += self.compressor.finish() if final else self.compressor.flush()
+        self.cpu_seconds += time.thread_time() - started
+        self.raw_bytes += len(body)
+        self.compressed_bytes += len(out)
+        return out
+
+    def _record(self):
+        self.middleware.stats.record(
+            route_template(self.scope),
+            self.encoding,
+            self.raw_bytes,
+            self.compressed_bytes,
+            self.cpu_seconds,
+        )
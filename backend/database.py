@@ -6,6 +6,13 @@ import json
 from datetime import datetime
 from typing import List, Optional
 from models import PasswordEntry, User
+from password_generator import PasswordGenerator
+from metrics import DB_QUERY_DURATION, timed
+import query_trace
+
+
+# Versão do schema gravada em PRAGMA user_version ao fim das migrações
+SCHEMA_VERSION = 1
 
 
 class DatabaseManager:
@@ -21,11 +28,25 @@ class DatabaseManager:
         self.db_path = db_path
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Abre uma conexão com rastreamento de consultas (ver query_trace)"""
+        return query_trace.connect(self.db_path)
+    
     def _init_database(self):
-        """Inicializa o banco de dados criando as tabelas necessárias"""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Inicializa o banco de dados criando as tabelas necessárias
+
+        Roda a cada DatabaseManager (a cada login); um banco já na
+        SCHEMA_VERSION custa só a leitura do user_version.
+        """
+        conn = self._connect()
         cursor = conn.cursor()
         
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            conn.close()
+            return
+        
         # Tabela de usuários
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -55,15 +76,38 @@ class DatabaseManager:
                 expiration_date TEXT,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
+                entropy_level TEXT,
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
             )
         """)
         
+        self._migrate_entropy_level(cursor)
+        
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
         conn.close()
     
+    def _migrate_entropy_level(self, cursor):
+        """
+        Adiciona a coluna entropy_level em bancos antigos e preenche as
+        linhas que ainda não têm o nível gravado
+        """
+        cursor.execute("PRAGMA table_info(password_entries)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if "entropy_level" not in columns:
+            cursor.execute("ALTER TABLE password_entries ADD COLUMN entropy_level TEXT")
+        
+        cursor.execute("SELECT id, entropy FROM password_entries WHERE entropy_level IS NULL")
+        pending = cursor.fetchall()
+        if pending:
+            cursor.executemany(
+                "UPDATE password_entries SET entropy_level = ? WHERE id = ?",
+                [(PasswordGenerator.get_entropy_level(entropy), entry_id) for entry_id, entropy in pending]
+            )
+    
     # ===== USER OPERATIONS =====
     
+    @timed(DB_QUERY_DURATION, method="create_user")
     def create_user(self, user: User) -> int:
         """
         Cria um novo usuário
@@ -77,7 +121,7 @@ class DatabaseManager:
         Raises:
             sqlite3.IntegrityError: Se username ou email já existem
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -98,9 +142,10 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    @timed(DB_QUERY_DURATION, method="get_user_by_username")
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Busca um usuário por username"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
@@ -111,9 +156,10 @@ class DatabaseManager:
             return self._row_to_user(row)
         return None
     
+    @timed(DB_QUERY_DURATION, method="get_user_by_id")
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Busca um usuário por ID"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
@@ -137,6 +183,7 @@ class DatabaseManager:
     
     # ===== PASSWORD OPERATIONS =====
     
+    @timed(DB_QUERY_DURATION, method="create_entry")
     def create_entry(self, entry: PasswordEntry, encrypted_password: bytes) -> int:
         """
         Cria uma nova entrada de senha
@@ -148,14 +195,14 @@ class DatabaseManager:
         Returns:
             ID da entrada criada
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
             INSERT INTO password_entries 
             (user_id, title, site, password_encrypted, length, use_uppercase, use_lowercase, 
-             use_digits, use_special, entropy, expiration_date, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             use_digits, use_special, entropy, expiration_date, created_at, updated_at, entropy_level)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             entry.user_id,
             entry.title,
@@ -169,7 +216,8 @@ class DatabaseManager:
             entry.entropy,
             entry.expiration_date.isoformat() if entry.expiration_date else None,
             entry.created_at.isoformat(),
-            entry.updated_at.isoformat()
+            entry.updated_at.isoformat(),
+            self._entropy_level(entry)
         ))
         
         entry_id = cursor.lastrowid
@@ -177,9 +225,10 @@ class DatabaseManager:
         conn.close()
         return entry_id
     
+    @timed(DB_QUERY_DURATION, method="get_all_entries_for_user")
     def get_all_entries_for_user(self, user_id: int) -> List[PasswordEntry]:
         """Retorna todas as entradas de senha de um usuário"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute(
@@ -194,6 +243,7 @@ class DatabaseManager:
             entries.append(self._row_to_entry(row))
         return entries
     
+    @timed(DB_QUERY_DURATION, method="get_entry_by_id")
     def get_entry_by_id(self, entry_id: int) -> Optional[PasswordEntry]:
         """
         Retorna uma entrada por ID
@@ -204,7 +254,7 @@ class DatabaseManager:
         Returns:
             PasswordEntry ou None se não encontrado
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM password_entries WHERE id = ?", (entry_id,))
@@ -215,6 +265,7 @@ class DatabaseManager:
             return self._row_to_entry(row)
         return None
     
+    @timed(DB_QUERY_DURATION, method="update_entry")
     def update_entry(self, entry_id: int, entry: PasswordEntry, encrypted_password: bytes):
         """
         Atualiza uma entrada de senha
@@ -224,14 +275,14 @@ class DatabaseManager:
             entry: Objeto PasswordEntry atualizado
             encrypted_password: Senha criptografada em bytes
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("""
             UPDATE password_entries 
             SET title = ?, site = ?, password_encrypted = ?, length = ?,
                 use_uppercase = ?, use_lowercase = ?, use_digits = ?, use_special = ?,
-                entropy = ?, expiration_date = ?, updated_at = ?
+                entropy = ?, expiration_date = ?, updated_at = ?, entropy_level = ?
             WHERE id = ?
         """, (
             entry.title,
@@ -245,12 +296,14 @@ class DatabaseManager:
             entry.entropy,
             entry.expiration_date.isoformat() if entry.expiration_date else None,
             entry.updated_at.isoformat(),
+            self._entropy_level(entry),
             entry_id
         ))
         
         conn.commit()
         conn.close()
     
+    @timed(DB_QUERY_DURATION, method="delete_entry")
     def delete_entry(self, entry_id: int):
         """
         Deleta uma entrada de senha
@@ -258,13 +311,18 @@ class DatabaseManager:
         Args:
             entry_id: ID da entrada
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute("DELETE FROM password_entries WHERE id = ?", (entry_id,))
         conn.commit()
         conn.close()
     
+    @staticmethod
+    def _entropy_level(entry: PasswordEntry) -> str:
+        """Nível a gravar (calculado só se o chamador não preencheu)"""
+        return entry.entropy_level or PasswordGenerator.get_entropy_level(entry.entropy)
+    
     def _row_to_entry(self, row) -> PasswordEntry:
         """Converte uma linha do banco em PasswordEntry"""
         return PasswordEntry(
@@ -281,7 +339,8 @@ class DatabaseManager:
             entropy=row[10],
             expiration_date=datetime.fromisoformat(row[11]) if row[11] else None,
             created_at=datetime.fromisoformat(row[12]),
-            updated_at=datetime.fromisoformat(row[13])
+            updated_at=datetime.fromisoformat(row[13]),
+            entropy_level=row[14]
         )
 
 
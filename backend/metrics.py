@@ -0,0 +1,349 @@
+"""
+Métricas da API no formato de exposição de texto do Prometheus
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+# Buckets padrão (segundos) cobrindo de consultas SQLite a hashes bcrypt
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+# Label de rota das requisições sem rota casada
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: dict) -> str:
+    """
+    Retorna o template da rota (ex.: /api/passwords/{entry_id}) para o scope
+
+    O FastAPI grava a rota casada em scope["route"] durante o roteamento;
+    usar o template evita uma série de métricas por ID. Requisições que não
+    casaram com nenhuma rota (404, arquivos estáticos) ficam todas em
+    UNMATCHED_ROUTE: o caminho bruto criaria uma série por URL e vem do
+    cliente.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    return UNMATCHED_ROUTE
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    """Base das métricas: nome, ajuda e nomes de labels"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Linhas de amostra da métrica (sem HELP/TYPE)"""
+
+
+class Counter(_Metric):
+    """
+    Contador monotônico
+
+    Sem lock: sob o GIL a perda de um incremento exige troca de thread
+    exatamente no meio do "+=", o que é aceitável para observabilidade.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """Incrementa o contador para o conjunto de labels"""
+        key = self._key(labels)
+        cell = self._values.get(key)
+        if cell is None:
+            cell = self._values.setdefault(key, [0])
+        cell[0] += amount
+
+    def value(self, **labels) -> float:
+        """Valor atual (útil em benchmarks e testes manuais)"""
+        cell = self._values.get(self._key(labels))
+        return cell[0] if cell else 0
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(cell[0])}"
+            for key, cell in list(self._values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """
+    Gauge lido no momento da coleta
+
+    Recebe uma função que devolve o valor atual, evitando manter um
+    contador paralelo que poderia divergir da fonte (ex.: sessões ativas).
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], float]):
+        super().__init__(name, documentation)
+        self.callback = callback
+
+    def _samples(self) -> List[str]:
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """
+    Histograma com buckets fixos
+
+    Cada conjunto de labels guarda uma lista [contagens por bucket..., soma];
+    observe() faz uma busca binária e dois incrementos, sem lock. Os
+    valores cumulativos são calculados apenas na coleta.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        """Registra uma observação (em segundos, por convenção)"""
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # len(buckets) contagens + bucket +Inf + soma
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager que observa a duração do bloco"""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        """Total de observações para o conjunto de labels"""
+        series = self._series.get(self._key(labels))
+        return sum(series[:-1]) if series else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        bounds = self.buckets + (float("inf"),)
+        for key, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer:
+    """Mede a duração de um bloco e registra no histograma"""
+
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+def timed(histogram: Histogram, **labels):
+    """
+    Decorator que registra a duração de cada chamada no histograma
+
+    Args:
+        histogram: Histograma de destino
+        **labels: Labels fixos da série (ex.: method="create_entry")
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, **labels)
+        return wrapper
+    return decorator
+
+
+class MetricsRegistry:
+    """Registro das métricas expostas em /metrics"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Registra uma métrica e a devolve (permite uso em atribuição)"""
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]):
+        """Registra uma função que gera linhas extras na coleta"""
+        self._collectors.append(collector)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], float]) -> Gauge:
+        return self.register(Gauge(name, documentation, callback))
+
+    def render(self) -> str:
+        """Gera o texto no formato de exposição do Prometheus (0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception:
+                continue
+        return "\n".join(lines) + "\n"
+
+
+# Instância global
+registry = MetricsRegistry()
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota e status",
+    ("method", "route", "status"),
+)
+BCRYPT_DURATION = registry.histogram(
+    "bcrypt_duration_seconds",
+    "Tempo gasto em hash/verificação bcrypt",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds",
+    "Tempo das operações do DatabaseManager por método",
+    ("method",),
+)
+WALLET_ENTRIES = registry.counter(
+    "wallet_entries_total",
+    "Entradas processadas em import/export de wallet",
+    ("direction",),
+)
+WALLET_BYTES = registry.counter(
+    "wallet_bytes_total",
+    "Bytes de senhas criptografadas processados em import/export de wallet",
+    ("direction",),
+)
+WALLET_DURATION = registry.histogram(
+    "wallet_transfer_duration_seconds",
+    "Duração das operações de import/export de wallet",
+    ("direction",),
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede a latência de cada requisição
+
+    Usa o template da rota como label para manter a cardinalidade baixa.
+    """
+
+    def __init__(self, app, histogram: Histogram = REQUEST_DURATION):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.histogram.observe(
+                time.perf_counter() - started,
+                method=scope.get("method", ""),
+                route=route_template(scope),
+                status=status[0],
+            )
@@ -34,4 +34,5 @@ class PasswordEntry:
     expiration_date: Optional[datetime]
     created_at: datetime
     updated_at: datetime
+    entropy_level: Optional[str] = None  # gravado junto com a entropia (leitura não recalcula)
 
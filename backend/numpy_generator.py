@@ -0,0 +1,113 @@
+"""
+Geração de senhas em lote vetorizada com NumPy (opcional)
+
+Para jobs offline de grande volume (popular vaults de teste, rotacionar
+credenciais de milhares de contas de serviço). Sem NumPy instalado,
+generate_batch cai para PasswordGenerator.generate_batch.
+"""
+import os
+from typing import List
+
+from password_generator import PasswordGenerator
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional
+    np = None
+
+
+NUMPY_AVAILABLE = np is not None
+
+
+def _class_strings(
+    use_uppercase: bool,
+    use_lowercase: bool,
+    use_digits: bool,
+    use_special: bool
+) -> List[str]:
+    flags = (use_uppercase, use_lowercase, use_digits, use_special)
+    sets = (
+        PasswordGenerator.UPPERCASE,
+        PasswordGenerator.LOWERCASE,
+        PasswordGenerator.DIGITS,
+        PasswordGenerator.SPECIAL,
+    )
+    return [chars for enabled, chars in zip(flags, sets) if enabled]
+
+
+def _random_indices(rows: int, length: int, charset_size: int) -> "np.ndarray":
+    """
+    Matriz rows x length de índices uniformes em [0, charset_size)
+
+    Bytes acima do maior múltiplo de charset_size são sorteados de novo
+    (mascaramento por rejeição), eliminando o viés de módulo.
+    """
+    limit = 256 - 256 % charset_size
+    raw = np.frombuffer(os.urandom(rows * length), dtype=np.uint8).reshape(rows, length).copy()
+    rejected = raw >= limit
+    pending = int(rejected.sum())
+    while pending:
+        raw[rejected] = np.frombuffer(os.urandom(pending), dtype=np.uint8)
+        rejected = raw >= limit
+        pending = int(rejected.sum())
+    return raw % charset_size
+
+
+def generate_batch(
+    count: int,
+    length: int,
+    use_uppercase: bool = True,
+    use_lowercase: bool = True,
+    use_digits: bool = True,
+    use_special: bool = True,
+    use_numpy: bool = True
+) -> List[str]:
+    """
+    Gera count senhas de uma vez
+
+    Com NumPy: um bloco de bytes do CSPRNG vira uma matriz uint8
+    (count x length), mapeada no charset com rejeição; cada linha é
+    verificada de forma vetorizada quanto à presença de todas as classes
+    selecionadas e as linhas reprovadas são sorteadas de novo. O resultado
+    é uniforme entre as senhas válidas. As linhas são decodificadas para
+    str em uma única passada.
+
+    Args:
+        count: Quantidade de senhas
+        length: Tamanho de cada senha
+        use_uppercase: Incluir letras maiúsculas
+        use_lowercase: Incluir letras minúsculas
+        use_digits: Incluir dígitos
+        use_special: Incluir caracteres especiais
+        use_numpy: False força o caminho em Python puro
+
+    Returns:
+        Lista com count senhas
+    """
+    classes = _class_strings(use_uppercase, use_lowercase, use_digits, use_special)
+    if not classes:
+        raise ValueError("Pelo menos um tipo de caractere deve ser selecionado")
+
+    # Com menos posições que classes não há senha que contenha todas
+    if np is None or not use_numpy or length < len(classes) or count <= 0:
+        return PasswordGenerator.generate_batch(
+            count, length, use_uppercase, use_lowercase, use_digits, use_special
+        )
+
+    charset = "".join(classes)
+    table = np.frombuffer(charset.encode("ascii"), dtype=np.uint8)
+    class_of = np.repeat(np.arange(len(classes), dtype=np.uint8), [len(chars) for chars in classes])
+
+    result = np.empty((count, length), dtype=np.uint8)
+    pending = np.arange(count)
+    while pending.size:
+        indices = _random_indices(pending.size, length, len(charset))
+        row_classes = class_of[indices]
+        valid = np.ones(pending.size, dtype=bool)
+        for class_index in range(len(classes)):
+            valid &= (row_classes == class_index).any(axis=1)
+        result[pending[valid]] = table[indices[valid]]
+        pending = pending[~valid]
+
+    text = result.tobytes().decode("ascii")
+    return [text[i:i + length] for i in range(0, count * length, length)]
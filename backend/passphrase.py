@@ -0,0 +1,198 @@
+"""
+Wordlist binária mapeada em memória para geração de passphrases (diceware)
+
+Formato do arquivo (little-endian):
+    cabeçalho  magic "PWWL" | versão u16 | reservado u16 | quantidade u32 |
+               palavras com maiúscula u32 (ver Wordlist.cased_words)
+    offsets    (quantidade + 1) x u32, offset absoluto do início de cada palavra
+    palavras   UTF-8 concatenadas, sem separador
+
+O arquivo é aberto com mmap: abrir uma lista de 1M palavras não lê nada
+além do cabeçalho, e cada palavra é acessada pelo índice com duas leituras
+de offset. Nada é copiado para o heap além da palavra sorteada.
+
+Para gerar o arquivo a partir de uma lista texto (uma palavra por linha,
+ou o formato da EFF "11111<TAB>palavra"):
+    python passphrase.py build eff_large_wordlist.txt wordlist.bin
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import Iterable, List, Optional
+
+
+MAGIC = b"PWWL"
+# Versão 2: só palavras de letras e contagem de cased_words no cabeçalho
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHII")
+OFFSET = struct.Struct("<I")
+SPAN = struct.Struct("<II")
+
+DEFAULT_WORDLIST = os.getenv(
+    "PASSPHRASE_WORDLIST",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlist.bin")
+)
+
+
+class Wordlist:
+    """Wordlist somente leitura com acesso aleatório por índice"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Arquivo gerado por build_wordlist
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError("Arquivo de wordlist inválido")
+        magic, version, _, count, cased_words = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError("Arquivo de wordlist inválido")
+        if version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(
+                "Versão de wordlist não suportada: gere o arquivo de novo com "
+                "python passphrase.py build"
+            )
+        if count < 2 or HEADER.size + (count + 1) * OFFSET.size > len(self._mmap):
+            self._mmap.close()
+            raise ValueError("Arquivo de wordlist truncado")
+        self._count = count
+        self._cased_words = cased_words
+
+    def __len__(self) -> int:
+        return self._count
+
+    def word(self, index: int) -> str:
+        """
+        Retorna a palavra na posição index
+
+        Args:
+            index: Índice em [0, len(wordlist))
+
+        Returns:
+            Palavra decodificada
+        """
+        if not 0 <= index < self._count:
+            raise IndexError("Índice fora da wordlist")
+        start, end = SPAN.unpack_from(self._mmap, HEADER.size + index * OFFSET.size)
+        return self._mmap[start:end].decode("utf-8")
+
+    @property
+    def cased_words(self) -> int:
+        """
+        Quantidade de palavras cuja primeira letra tem maiúscula e minúscula
+
+        Só essas mudam com a capitalização "random" (ver
+        calculate_passphrase_entropy). Contada por build_wordlist.
+        """
+        return self._cased_words
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _parse_line(line: str) -> Optional[str]:
+    # Formato EFF: "11111\tabacus"; lista simples: "abacus"
+    parts = line.split()
+    if not parts:
+        return None
+    return parts[-1].lower()
+
+
+def build_wordlist(words: Iterable[str], output_path: str) -> int:
+    """
+    Grava uma wordlist no formato binário
+
+    As palavras são normalizadas para minúsculas e deduplicadas (mantendo a
+    ordem). Palavras com qualquer caractere que não seja letra ("yo-yo",
+    "t-shirt", dígitos) são descartadas: como o separador não pode ter
+    letras, ele nunca aparece dentro de uma palavra, e nem ele, nem o
+    dígito extra, nem a capitalização geram passphrases repetidas. Assim a
+    entropia calculada é exata.
+
+    Args:
+        words: Palavras (ou linhas no formato EFF)
+        output_path: Arquivo de saída
+
+    Returns:
+        Quantidade de palavras gravadas
+    """
+    seen = set()
+    encoded: List[bytes] = []
+    cased_words = 0
+    for line in words:
+        word = _parse_line(line)
+        if not word or word in seen or not word.isalpha():
+            continue
+        seen.add(word)
+        encoded.append(word.encode("utf-8"))
+        if word[0].upper() != word[0].lower():
+            cased_words += 1
+
+    if len(encoded) < 2:
+        raise ValueError("A wordlist precisa de pelo menos duas palavras")
+
+    offset = HEADER.size + (len(encoded) + 1) * OFFSET.size
+    offsets = [offset]
+    for data in encoded:
+        offset += len(data)
+        offsets.append(offset)
+    if offset > 0xFFFFFFFF:
+        raise ValueError("Wordlist grande demais para o formato")
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(encoded), cased_words))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, output_path)
+    return len(encoded)
+
+
+_default_wordlist: Optional[Wordlist] = None
+_default_lock = threading.Lock()
+
+
+def default_wordlist() -> Wordlist:
+    """
+    Wordlist padrão (PASSPHRASE_WORDLIST ou backend/wordlist.bin)
+
+    Aberta uma única vez, na primeira passphrase gerada.
+    """
+    global _default_wordlist
+    if _default_wordlist is None:
+        with _default_lock:
+            if _default_wordlist is None:
+                if not os.path.exists(DEFAULT_WORDLIST):
+                    raise FileNotFoundError(
+                        f"Wordlist de passphrases não encontrada: {DEFAULT_WORDLIST}"
+                    )
+                _default_wordlist = Wordlist(DEFAULT_WORDLIST)
+    return _default_wordlist
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] != "build":
+        print("Uso: python passphrase.py build <lista.txt> <wordlist.bin>")
+        sys.exit(1)
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        count = build_wordlist(f, sys.argv[3])
+    print(f"{count} palavras gravadas em {sys.argv[3]}")
+
+
+if __name__ == "__main__":
+    main()
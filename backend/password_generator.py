@@ -1,9 +1,115 @@
 """
 Gerador de senhas com cálculo de entropia
 """
-import random
+import itertools
+import os
+import secrets
 import string
 import math
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from passphrase import Wordlist, default_wordlist
+from breach_index import default_index, password_digest
+
+
+class _EntropyBuffer:
+    """
+    Buffer de bytes do CSPRNG (os.urandom) reaproveitado entre chamadas
+
+    Lê a entropia em blocos grandes para evitar uma syscall por caractere.
+    """
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offset = 0
+
+    def take(self, n: int) -> bytearray:
+        """Retorna n bytes aleatórios"""
+        end = self._offset + n
+        if end > len(self._buffer):
+            old = self._buffer
+            self._buffer = old[self._offset:] + os.urandom(max(n, self.CHUNK_SIZE))
+            old[:] = bytes(len(old))
+            self._offset = 0
+            end = n
+        chunk = self._buffer[self._offset:end]
+        self._offset = end
+        return chunk
+
+    def clear(self):
+        """Zera e descarta os bytes ainda não usados"""
+        self._buffer[:] = bytes(len(self._buffer))
+        self._buffer = bytearray()
+        self._offset = 0
+
+    def randbelow(self, n: int) -> int:
+        """Inteiro uniforme em [0, n) com rejeição (sem viés de módulo)"""
+        if n > 256:
+            return secrets.randbelow(n)
+        limit = 256 - 256 % n
+        while True:
+            value = self.take(1)[0]
+            if value < limit:
+                return value % n
+
+
+class _Charset:
+    """
+    Charset pré-compilado para mapear bytes aleatórios em caracteres
+
+    Bytes >= limit (o maior múltiplo do tamanho do charset que cabe em 256)
+    são descartados, o que elimina o viés de módulo; o mapeamento e o
+    descarte são feitos em C por bytes.translate.
+    """
+
+    def __init__(self, chars: str):
+        size = len(chars)
+        self.chars = chars
+        self.limit = 256 - 256 % size
+        self.table = bytes(ord(chars[b % size]) if b < self.limit else 0 for b in range(256))
+        self.rejected = bytes(range(self.limit, 256))
+
+    def draw(self, entropy: _EntropyBuffer, count: int) -> str:
+        """Sorteia count caracteres uniformes do charset"""
+        out = b""
+        while len(out) < count:
+            missing = count - len(out)
+            raw = entropy.take(missing * 256 // self.limit + 8)
+            out += raw.translate(self.table, self.rejected)
+        return out[:count].decode("ascii")
+
+
+_thread_state = threading.local()
+
+
+def _entropy() -> _EntropyBuffer:
+    """Buffer de entropia da thread atual (evita lock entre threads)"""
+    buffer = getattr(_thread_state, "entropy", None)
+    if buffer is None:
+        buffer = _thread_state.entropy = _EntropyBuffer()
+    return buffer
+
+
+def _clear_before_fork():
+    # Só o buffer da thread que chama o fork: os das outras threads podem
+    # estar em uso e não são alcançáveis pelo filho (ver _reset_after_fork)
+    buffer = getattr(_thread_state, "entropy", None)
+    if buffer is not None:
+        buffer.clear()
+
+
+def _reset_after_fork():
+    # O filho herda a memória do pai: sem isto os dois entregariam as
+    # mesmas senhas a partir dos bytes que sobraram no buffer
+    global _thread_state
+    _thread_state = threading.local()
+
+
+if hasattr(os, "register_at_fork"):  # só existe em sistemas Unix
+    os.register_at_fork(before=_clear_before_fork, after_in_child=_reset_after_fork)
 
 
 class PasswordGenerator:
@@ -14,13 +120,47 @@ class PasswordGenerator:
     DIGITS = string.digits
     SPECIAL = "!@#$%^&*()_+-=[]{}|;:,.<>?"
     
+    # Tentativas de sortear de novo uma senha que está na lista de vazamentos
+    MAX_BREACH_RETRIES = 100
+    
+    # Capitalização das palavras da passphrase ("random": Título ou minúscula, por palavra)
+    CAPITALIZATION_MODES = ("lower", "title", "upper", "random")
+    
+    _compiled: Dict[Tuple[bool, bool, bool, bool], Tuple[_Charset, List[_Charset]]] = {}
+
+    @staticmethod
+    def _compile(
+        use_uppercase: bool,
+        use_lowercase: bool,
+        use_digits: bool,
+        use_special: bool
+    ) -> Tuple[_Charset, List[_Charset]]:
+        """Retorna (charset completo, charsets obrigatórios) para as opções"""
+        key = (use_uppercase, use_lowercase, use_digits, use_special)
+        compiled = PasswordGenerator._compiled.get(key)
+        if compiled is None:
+            classes = [
+                chars for enabled, chars in zip(key, (
+                    PasswordGenerator.UPPERCASE,
+                    PasswordGenerator.LOWERCASE,
+                    PasswordGenerator.DIGITS,
+                    PasswordGenerator.SPECIAL,
+                )) if enabled
+            ]
+            if not classes:
+                raise ValueError("Pelo menos um tipo de caractere deve ser selecionado")
+            compiled = (_Charset("".join(classes)), [_Charset(chars) for chars in classes])
+            PasswordGenerator._compiled[key] = compiled
+        return compiled
+
     @staticmethod
     def generate(
         length: int,
         use_uppercase: bool = True,
         use_lowercase: bool = True,
         use_digits: bool = True,
-        use_special: bool = True
+        use_special: bool = True,
+        reject_breached: bool = True
     ) -> str:
         """
         Gera uma senha aleatória
@@ -31,39 +171,192 @@ class PasswordGenerator:
             use_lowercase: Incluir letras minúsculas
             use_digits: Incluir dígitos
             use_special: Incluir caracteres especiais
+            reject_breached: Descarta senhas presentes no índice local de vazamentos
             
         Returns:
             Senha gerada
         """
-        charset = ""
-        if use_uppercase:
-            charset += PasswordGenerator.UPPERCASE
-        if use_lowercase:
-            charset += PasswordGenerator.LOWERCASE
-        if use_digits:
-            charset += PasswordGenerator.DIGITS
-        if use_special:
-            charset += PasswordGenerator.SPECIAL
+        return PasswordGenerator.generate_batch(
+            1, length, use_uppercase, use_lowercase, use_digits, use_special, reject_breached
+        )[0]
+
+    @staticmethod
+    def generate_batch(
+        count: int,
+        length: int,
+        use_uppercase: bool = True,
+        use_lowercase: bool = True,
+        use_digits: bool = True,
+        use_special: bool = True,
+        reject_breached: bool = True
+    ) -> List[str]:
+        """
+        Gera várias senhas aleatórias de uma vez
         
-        if not charset:
-            raise ValueError("Pelo menos um tipo de caractere deve ser selecionado")
+        A entropia vem do CSPRNG do sistema, lida em bloco para todas as
+        senhas. Cada senha tem ao menos um caractere de cada classe
+        selecionada: os caracteres obrigatórios são inseridos em posições
+        sorteadas entre os demais, o que equivale a embaralhar a senha
+        inteira sem precisar de um sorteio por posição.
         
-        password_chars = []
-        if use_uppercase:
-            password_chars.append(random.choice(PasswordGenerator.UPPERCASE))
-        if use_lowercase:
-            password_chars.append(random.choice(PasswordGenerator.LOWERCASE))
-        if use_digits:
-            password_chars.append(random.choice(PasswordGenerator.DIGITS))
-        if use_special:
-            password_chars.append(random.choice(PasswordGenerator.SPECIAL))
+        Se houver um índice local de vazamentos (breach_index.py), senhas
+        presentes nele são sorteadas de novo.
         
-        while len(password_chars) < length:
-            password_chars.append(random.choice(charset))
+        Args:
+            count: Quantidade de senhas
+            length: Tamanho de cada senha
+            use_uppercase: Incluir letras maiúsculas
+            use_lowercase: Incluir letras minúsculas
+            use_digits: Incluir dígitos
+            use_special: Incluir caracteres especiais
+            reject_breached: Descarta senhas presentes no índice local de vazamentos
+            
+        Returns:
+            Lista com count senhas
+        """
+        full, required = PasswordGenerator._compile(
+            use_uppercase, use_lowercase, use_digits, use_special
+        )
+        entropy = _entropy()
+        fill_length = max(length - len(required), 0)
+        fill = full.draw(entropy, count * fill_length)
+        required_chars = [charset.draw(entropy, count) for charset in required]
+
+        passwords = []
+        for i in range(count):
+            chars = list(fill[i * fill_length:(i + 1) * fill_length])
+            for class_chars in required_chars:
+                chars.insert(entropy.randbelow(len(chars) + 1), class_chars[i])
+            passwords.append("".join(chars[:length]))
+        
+        index = default_index() if reject_breached else None
+        if index is not None:
+            PasswordGenerator._replace_breached(
+                passwords, index,
+                lambda n: PasswordGenerator.generate_batch(
+                    n, length, use_uppercase, use_lowercase, use_digits, use_special,
+                    reject_breached=False
+                )
+            )
+        return passwords
+    
+    @staticmethod
+    def _replace_breached(
+        passwords: List[str],
+        index,
+        regenerate: Callable[[int], List[str]]
+    ):
+        """
+        Sorteia de novo, no lugar, as senhas que aparecem no índice de vazamentos
+        
+        Args:
+            passwords: Senhas geradas (alteradas no lugar)
+            index: BreachIndex a consultar
+            regenerate: Gera n senhas novas com as mesmas opções
+        """
+        breached = [
+            i for i, count in enumerate(index.count_many(password_digest(p) for p in passwords))
+            if count
+        ]
+        for _ in range(PasswordGenerator.MAX_BREACH_RETRIES):
+            if not breached:
+                return
+            candidates = regenerate(len(breached))
+            counts = index.count_many(password_digest(p) for p in candidates)
+            still_breached = []
+            for i, candidate, count in zip(breached, candidates, counts):
+                if count:
+                    still_breached.append(i)
+                else:
+                    passwords[i] = candidate
+            breached = still_breached
+        if breached:
+            raise ValueError(
+                "Não foi possível gerar uma senha fora da lista de vazamentos; "
+                "aumente o tamanho ou os tipos de caractere"
+            )
+    
+    @staticmethod
+    def generate_passphrase(
+        words: int = 6,
+        separator: str = "-",
+        capitalization: str = "lower",
+        include_digit: bool = False,
+        wordlist: Optional[Wordlist] = None
+    ) -> str:
+        """
+        Gera uma passphrase no estilo diceware
         
-        random.shuffle(password_chars)
+        Cada palavra é sorteada de forma independente e uniforme pelo índice
+        na wordlist (mapeada em memória, ver passphrase.py).
         
-        return ''.join(password_chars[:length])
+        Args:
+            words: Quantidade de palavras
+            separator: Separador entre as palavras (não vazio e sem letras
+                ou dígitos; as palavras só têm letras, então sequências
+                diferentes de palavras nunca geram o mesmo texto)
+            capitalization: Um de CAPITALIZATION_MODES
+            include_digit: Acrescenta um dígito ao fim de uma palavra sorteada
+            wordlist: Wordlist a usar (padrão: default_wordlist())
+            
+        Returns:
+            Passphrase gerada
+        """
+        if words < 1:
+            raise ValueError("A passphrase precisa de pelo menos uma palavra")
+        if not separator or any(ch.isalnum() for ch in separator):
+            raise ValueError("O separador não pode ser vazio nem conter letras ou dígitos")
+        if capitalization not in PasswordGenerator.CAPITALIZATION_MODES:
+            raise ValueError(f"Capitalização inválida: {capitalization}")
+        wordlist = wordlist or default_wordlist()
+        entropy = _entropy()
+        
+        chosen = []
+        for _ in range(words):
+            word = wordlist.word(entropy.randbelow(len(wordlist)))
+            if capitalization == "title" or (capitalization == "random" and entropy.randbelow(2)):
+                word = word[:1].upper() + word[1:]
+            elif capitalization == "upper":
+                word = word.upper()
+            chosen.append(word)
+        
+        if include_digit:
+            position = entropy.randbelow(words)
+            chosen[position] += PasswordGenerator.DIGITS[entropy.randbelow(10)]
+        return separator.join(chosen)
+    
+    @staticmethod
+    def calculate_passphrase_entropy(
+        words: int,
+        wordlist_size: int,
+        capitalization: str = "lower",
+        include_digit: bool = False,
+        cased_words: Optional[int] = None
+    ) -> float:
+        """
+        Calcula a entropia exata de uma passphrase gerada por generate_passphrase
+        
+        Args:
+            words: Quantidade de palavras
+            wordlist_size: Quantidade de palavras na wordlist
+            capitalization: Um de CAPITALIZATION_MODES
+            include_digit: Se um dígito foi acrescentado
+            cased_words: Palavras da wordlist cuja primeira letra tem
+                maiúscula (Wordlist.cased_words; padrão: todas). No modo
+                "random" só elas valem o bit da capitalização
+            
+        Returns:
+            Entropia em bits
+        """
+        if words < 1 or wordlist_size < 2:
+            return 0.0
+        entropy = words * math.log2(wordlist_size)
+        if capitalization == "random":
+            cased_words = wordlist_size if cased_words is None else cased_words
+            entropy += words * cased_words / wordlist_size
+        if include_digit:
+            entropy += math.log2(10 * words)
+        return round(entropy, 2)
     
     @staticmethod
     def calculate_entropy(
@@ -76,6 +369,9 @@ class PasswordGenerator:
         """
         Calcula a entropia de uma senha baseado no tamanho e charset
         
+        Tamanhos até ENTROPY_TABLE_MAX_LENGTH saem da tabela pré-calculada
+        (_ENTROPY_TABLE); acima disso a conta é feita na hora.
+        
         Args:
             length: Tamanho da senha
             use_uppercase: Incluir letras maiúsculas
@@ -86,21 +382,11 @@ class PasswordGenerator:
         Returns:
             Entropia em bits
         """
-        charset_size = 0
-        if use_uppercase:
-            charset_size += len(PasswordGenerator.UPPERCASE)
-        if use_lowercase:
-            charset_size += len(PasswordGenerator.LOWERCASE)
-        if use_digits:
-            charset_size += len(PasswordGenerator.DIGITS)
-        if use_special:
-            charset_size += len(PasswordGenerator.SPECIAL)
-        
-        if charset_size == 0:
-            return 0.0
-        
-        entropy = length * math.log2(charset_size)
-        return round(entropy, 2)
+        key = (length, bool(use_uppercase), bool(use_lowercase), bool(use_digits), bool(use_special))
+        entropy = _ENTROPY_TABLE.get(key)
+        if entropy is None:
+            entropy = _compute_entropy(*key)
+        return entropy
     
     @staticmethod
     def get_entropy_level(entropy: float) -> str:
@@ -122,3 +408,38 @@ class PasswordGenerator:
         else:
             return "Muito Forte"
 
+
+# Tamanho máximo aceito pela API; tamanhos maiores são calculados sob demanda
+ENTROPY_TABLE_MAX_LENGTH = 128
+
+
+def _compute_entropy(
+    length: int,
+    use_uppercase: bool,
+    use_lowercase: bool,
+    use_digits: bool,
+    use_special: bool
+) -> float:
+    charset_size = 0
+    if use_uppercase:
+        charset_size += len(PasswordGenerator.UPPERCASE)
+    if use_lowercase:
+        charset_size += len(PasswordGenerator.LOWERCASE)
+    if use_digits:
+        charset_size += len(PasswordGenerator.DIGITS)
+    if use_special:
+        charset_size += len(PasswordGenerator.SPECIAL)
+    
+    if charset_size == 0:
+        return 0.0
+    
+    entropy = length * math.log2(charset_size)
+    return round(entropy, 2)
+
+
+# (tamanho, maiúsculas, minúsculas, dígitos, especiais) -> entropia; 129 x 16 entradas
+_ENTROPY_TABLE: Dict[Tuple[int, bool, bool, bool, bool], float] = {
+    (length, *flags): _compute_entropy(length, *flags)
+    for length in range(ENTROPY_TABLE_MAX_LENGTH + 1)
+    for flags in itertools.product((False, True), repeat=4)
+}
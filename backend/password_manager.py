@@ -5,6 +5,7 @@ from typing import List, Optional
 from models import PasswordEntry
 from database import DatabaseManager
 from password_generator import PasswordGenerator
+from password_policy import PasswordPolicy, compile_policy
 
 
 class PasswordManager:
@@ -42,6 +43,7 @@ class PasswordManager:
         expiration_date: Optional[datetime] = None,
         custom_password: Optional[str] = None,
         encrypted_password: Optional[bytes] = None,
+        policy: Optional[PasswordPolicy] = None,
     ) -> int:
         """
         Cria uma nova senha para um usuário.
@@ -49,6 +51,8 @@ class PasswordManager:
         - O SERVIDOR NÃO GERA NEM CRIPTOGRAFA SENHA.
         - encrypted_password deve vir do CLIENTE (já criptografado).
         - user_id garante isolamento de dados.
+        - policy (opcional): política usada na geração; define tamanho,
+          tipos e entropia no lugar dos parâmetros individuais.
         """
         if encrypted_password is None:
             raise ValueError(
@@ -57,9 +61,15 @@ class PasswordManager:
 
         now = datetime.now()
 
-        entropy = PasswordGenerator.calculate_entropy(
-            length, use_uppercase, use_lowercase, use_digits, use_special
-        )
+        if policy is not None:
+            length = policy.length
+            use_uppercase, use_lowercase, use_digits, use_special = policy.flags()
+            entropy = compile_policy(policy).entropy
+        else:
+            entropy = PasswordGenerator.calculate_entropy(
+                length, use_uppercase, use_lowercase, use_digits, use_special
+            )
+        entropy_level = PasswordGenerator.get_entropy_level(entropy)
 
         entry = PasswordEntry(
             id=None,
@@ -73,6 +83,7 @@ class PasswordManager:
             use_digits=use_digits,
             use_special=use_special,
             entropy=entropy,
+            entropy_level=entropy_level,
             expiration_date=expiration_date,
             created_at=now,
             updated_at=now,
@@ -157,6 +168,7 @@ class PasswordManager:
             entry.use_digits,
             entry.use_special,
         )
+        entry.entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
 
         # Decide qual blob criptografado salvar
         if encrypted_password is not None:
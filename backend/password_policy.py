@@ -0,0 +1,312 @@
+"""
+Políticas de geração de senha por site
+
+Uma PasswordPolicy declara o que o site exige: tipos de caractere, mínimo
+por tipo, caracteres proibidos, sem repetição consecutiva e modo
+pronunciável. compile_policy() transforma a política uma única vez em
+charsets pré-calculados (_Charset) e em uma tabela de classes para o
+verificador; a geração lê a entropia em bloco e monta cada senha já
+satisfazendo as regras, sem sortear candidatas e descartar as inválidas.
+
+Exemplo:
+    policy = PasswordPolicy(length=20, min_digits=3, banned_chars="<>", no_repeats=True)
+    compiled = compile_policy(policy)
+    password = compiled.generate()
+    compiled.violations("abc")  # lista de regras não atendidas
+"""
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+from breach_index import default_index
+from password_generator import PasswordGenerator, _Charset, _entropy
+
+
+# Letras usadas no modo pronunciável (sílabas consoante + vogal)
+VOWELS = "aeiou"
+CONSONANTS = "bcdfghjklmnprstvz"
+
+# Marca, na tabela de classes, um caractere fora da política
+_OUTSIDE = ord("x")
+
+
+@dataclass(frozen=True)
+class PasswordPolicy:
+    """
+    Política declarativa de geração
+
+    Um tipo habilitado sempre aparece ao menos uma vez (como em
+    PasswordGenerator.generate); min_* aumenta esse mínimo. no_repeats
+    proíbe o mesmo caractere em posições vizinhas.
+    """
+    length: int = 16
+    use_uppercase: bool = True
+    use_lowercase: bool = True
+    use_digits: bool = True
+    use_special: bool = True
+    min_uppercase: int = 0
+    min_lowercase: int = 0
+    min_digits: int = 0
+    min_special: int = 0
+    banned_chars: str = ""
+    no_repeats: bool = False
+    pronounceable: bool = False
+
+    def flags(self) -> Tuple[bool, bool, bool, bool]:
+        """(use_uppercase, use_lowercase, use_digits, use_special)"""
+        return (self.use_uppercase, self.use_lowercase, self.use_digits, self.use_special)
+
+
+class CompiledPolicy:
+    """Política pré-compilada: charsets, mínimos, entropia e verificador"""
+
+    CLASS_NAMES = ("maiúsculas", "minúsculas", "dígitos", "caracteres especiais")
+
+    def __init__(self, policy: PasswordPolicy):
+        if policy.length < 1:
+            raise ValueError("O tamanho da senha deve ser positivo")
+        if not any(policy.flags()):
+            raise ValueError("Pelo menos um tipo de caractere deve ser selecionado")
+
+        self.policy = policy
+        banned = set(policy.banned_chars)
+        sources = (
+            PasswordGenerator.UPPERCASE,
+            PasswordGenerator.LOWERCASE,
+            PasswordGenerator.DIGITS,
+            PasswordGenerator.SPECIAL,
+        )
+        requested = (policy.min_uppercase, policy.min_lowercase, policy.min_digits, policy.min_special)
+
+        # (índice da classe, caracteres permitidos, mínimo) de cada tipo habilitado
+        self.classes: List[Tuple[int, str, int]] = []
+        for class_id, (enabled, chars, minimum) in enumerate(zip(policy.flags(), sources, requested)):
+            if minimum < 0:
+                raise ValueError("Os mínimos por tipo não podem ser negativos")
+            if not enabled:
+                if minimum:
+                    raise ValueError(
+                        f"Mínimo de {self.CLASS_NAMES[class_id]} definido para um tipo desabilitado"
+                    )
+                continue
+            allowed = "".join(c for c in chars if c not in banned)
+            if not allowed:
+                raise ValueError(
+                    f"Todos os {self.CLASS_NAMES[class_id]} estão na lista de proibidos"
+                )
+            if policy.no_repeats and len(allowed) < 3:
+                raise ValueError(
+                    f"Sem repetição, {self.CLASS_NAMES[class_id]} precisam de pelo menos "
+                    "3 caracteres permitidos"
+                )
+            self.classes.append((class_id, allowed, max(minimum, 1)))
+
+        self.required = sum(minimum for _, _, minimum in self.classes)
+        if self.required > policy.length:
+            raise ValueError(
+                f"Os mínimos por tipo somam {self.required}, mais que o tamanho da senha"
+            )
+
+        # Tabela byte -> classe ("0".."3") usada pelo verificador com bytes.translate
+        table = bytearray([_OUTSIDE]) * 256
+        for class_id, allowed, _ in self.classes:
+            for char in allowed:
+                table[ord(char)] = ord("0") + class_id
+        self._class_table = bytes(table)
+        self._class_chars = {class_id: allowed for class_id, allowed, _ in self.classes}
+        self._class_of = {
+            char: class_id for class_id, allowed, _ in self.classes for char in allowed
+        }
+
+        if policy.pronounceable:
+            self._compile_pronounceable(banned)
+        else:
+            self._full = _Charset("".join(allowed for _, allowed, _ in self.classes))
+            self._charsets = [(_Charset(allowed), minimum) for _, allowed, minimum in self.classes]
+            self.entropy = round(policy.length * math.log2(len(self._full.chars)), 2)
+
+    def _compile_pronounceable(self, banned: set):
+        """
+        Modo pronunciável: sílabas consoante + vogal, seguidas de um bloco
+        com os dígitos e especiais obrigatórios
+        """
+        policy = self.policy
+        if not (policy.use_uppercase or policy.use_lowercase):
+            raise ValueError("O modo pronunciável precisa de letras")
+
+        def allowed_letters(letters: str) -> str:
+            # Com maiúsculas e minúsculas, a letra precisa ser permitida nos dois casos
+            return "".join(
+                c for c in letters
+                if not (policy.use_lowercase and c in banned)
+                and not (policy.use_uppercase and c.upper() in banned)
+            )
+
+        consonants = allowed_letters(CONSONANTS)
+        vowels = allowed_letters(VOWELS)
+        if not consonants or not vowels:
+            raise ValueError("Letras proibidas demais para o modo pronunciável")
+
+        tail = [
+            (_Charset(allowed), minimum)
+            for class_id, allowed, minimum in self.classes if class_id >= 2
+        ]
+        letters = policy.length - sum(minimum for _, minimum in tail)
+        uppercase = (policy.min_uppercase or 1) if policy.use_uppercase else 0
+        if policy.use_uppercase and policy.use_lowercase:
+            minimum_letters = uppercase + max(policy.min_lowercase, 1)
+        else:
+            minimum_letters = max(2, policy.min_uppercase, policy.min_lowercase)
+        if letters < minimum_letters:
+            raise ValueError("Tamanho insuficiente para as letras do modo pronunciável")
+
+        upper_only = policy.use_uppercase and not policy.use_lowercase
+        self._consonants = _Charset(consonants.upper() if upper_only else consonants)
+        self._vowels = _Charset(vowels.upper() if upper_only else vowels)
+        self._letters = letters
+        # Letras a passar para maiúscula quando os dois casos estão habilitados
+        self._capitals = uppercase if policy.use_lowercase else 0
+        self._tail = tail
+
+        consonant_count = (letters + 1) // 2
+        bits = consonant_count * math.log2(len(consonants))
+        bits += (letters - consonant_count) * math.log2(len(vowels))
+        bits += math.log2(math.comb(letters, self._capitals))
+        tail_length = policy.length - letters
+        for charset, minimum in tail:
+            bits += minimum * math.log2(len(charset.chars))
+            bits += math.log2(math.comb(tail_length, minimum))
+            tail_length -= minimum
+        self.entropy = round(bits, 2)
+
+    def generate(self, reject_breached: bool = True) -> str:
+        """Gera uma senha que satisfaz a política"""
+        return self.generate_batch(1, reject_breached)[0]
+
+    def generate_batch(self, count: int, reject_breached: bool = True) -> List[str]:
+        """
+        Gera várias senhas que satisfazem a política
+
+        A entropia de todas as senhas é sorteada em bloco por classe; os
+        caracteres obrigatórios são inseridos em posições sorteadas (como em
+        PasswordGenerator.generate_batch) e repetições vizinhas são trocadas
+        por outro caractere da mesma classe, o que preserva os mínimos sem
+        descartar a senha.
+
+        Args:
+            count: Quantidade de senhas
+            reject_breached: Descarta senhas presentes no índice local de vazamentos
+
+        Returns:
+            Lista com count senhas
+        """
+        if self.policy.pronounceable:
+            passwords = self._generate_pronounceable(count)
+        else:
+            passwords = self._generate_random(count)
+
+        index = default_index() if reject_breached else None
+        if index is not None:
+            PasswordGenerator._replace_breached(
+                passwords, index, lambda n: self.generate_batch(n, reject_breached=False)
+            )
+        return passwords
+
+    def _generate_random(self, count: int) -> List[str]:
+        entropy = _entropy()
+        fill_length = self.policy.length - self.required
+        fill = self._full.draw(entropy, count * fill_length)
+        required = [(charset.draw(entropy, count * minimum), minimum) for charset, minimum in self._charsets]
+
+        passwords = []
+        for i in range(count):
+            chars = list(fill[i * fill_length:(i + 1) * fill_length])
+            for drawn, minimum in required:
+                for char in drawn[i * minimum:(i + 1) * minimum]:
+                    chars.insert(entropy.randbelow(len(chars) + 1), char)
+            if self.policy.no_repeats:
+                self._break_repeats(chars, entropy)
+            passwords.append("".join(chars))
+        return passwords
+
+    def _generate_pronounceable(self, count: int) -> List[str]:
+        entropy = _entropy()
+        letters = self._letters
+        consonant_count = (letters + 1) // 2
+        consonants = self._consonants.draw(entropy, count * consonant_count)
+        vowels = self._vowels.draw(entropy, count * (letters - consonant_count))
+        tails = [(charset.draw(entropy, count * minimum), minimum) for charset, minimum in self._tail]
+
+        passwords = []
+        for i in range(count):
+            word = [""] * letters
+            word[0::2] = consonants[i * consonant_count:(i + 1) * consonant_count]
+            word[1::2] = vowels[i * (letters - consonant_count):(i + 1) * (letters - consonant_count)]
+            positions = list(range(letters))
+            for j in range(self._capitals):
+                k = j + entropy.randbelow(letters - j)
+                positions[j], positions[k] = positions[k], positions[j]
+                word[positions[j]] = word[positions[j]].upper()
+
+            tail = []
+            for drawn, minimum in tails:
+                for char in drawn[i * minimum:(i + 1) * minimum]:
+                    tail.insert(entropy.randbelow(len(tail) + 1), char)
+            if self.policy.no_repeats:
+                self._break_repeats(tail, entropy)
+            passwords.append("".join(word + tail))
+        return passwords
+
+    def _break_repeats(self, chars: List[str], entropy):
+        """Troca cada caractere igual ao anterior por outro da mesma classe"""
+        for i in range(1, len(chars)):
+            if chars[i] != chars[i - 1]:
+                continue
+            following = chars[i + 1] if i + 1 < len(chars) else None
+            candidates = [
+                c for c in self._class_chars[self._class_of[chars[i]]]
+                if c != chars[i - 1] and c != following
+            ]
+            chars[i] = candidates[entropy.randbelow(len(candidates))]
+
+    def violations(self, password: str) -> List[str]:
+        """
+        Regras da política que a senha não atende
+
+        Args:
+            password: Senha a verificar (por exemplo uma senha customizada)
+
+        Returns:
+            Lista de mensagens (vazia se a senha atende a política)
+        """
+        policy = self.policy
+        problems = []
+        if len(password) != policy.length:
+            problems.append(f"A senha deve ter {policy.length} caracteres")
+
+        classes = password.encode("ascii", errors="ignore").translate(self._class_table)
+        if _OUTSIDE in classes or not password.isascii():
+            problems.append("A senha contém caracteres proibidos ou fora dos tipos habilitados")
+        for class_id, _, minimum in self.classes:
+            if classes.count(ord("0") + class_id) < minimum:
+                problems.append(f"A senha precisa de pelo menos {minimum} {self.CLASS_NAMES[class_id]}")
+
+        if policy.no_repeats and any(a == b for a, b in zip(password, password[1:])):
+            problems.append("A senha não pode repetir o mesmo caractere em sequência")
+        return problems
+
+    def check(self, password: str) -> bool:
+        """True se a senha atende a política"""
+        return not self.violations(password)
+
+
+@lru_cache(maxsize=256)
+def compile_policy(policy: PasswordPolicy) -> CompiledPolicy:
+    """
+    Compila (e guarda em cache) uma política
+
+    Raises:
+        ValueError: Se a política não pode ser satisfeita
+    """
+    return CompiledPolicy(policy)
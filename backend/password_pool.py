@@ -0,0 +1,237 @@
+"""
+Pool de senhas pré-geradas com reposição em background
+
+A geração interativa (endpoint /api/passwords/generate, GUI e CLI locais)
+passa a retirar senhas prontas de um pool por conjunto de opções
+(tamanho + classes de caracteres). Uma thread repõe o pool em lote via
+PasswordGenerator.generate_batch quando ele cai abaixo do nível mínimo.
+
+Garantias:
+- cada senha é entregue uma única vez (popleft sob lock)
+- close() zera e descarta tudo o que ainda estiver no pool; depois dele
+  take() gera na hora, sem guardar nada, até um novo start()
+- o número de conjuntos de opções mantidos é limitado (LRU)
+
+As senhas ficam guardadas como bytearray para que possam ser zeradas no
+descarte; a str entregue ao chamador segue o ciclo de vida normal do Python.
+"""
+import os
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from password_generator import PasswordGenerator
+
+
+DEFAULT_CAPACITY = int(os.getenv("PASSWORD_POOL_SIZE", "64"))
+DEFAULT_LOW_WATER = int(os.getenv("PASSWORD_POOL_LOW_WATER", "16"))
+DEFAULT_MAX_KEYS = int(os.getenv("PASSWORD_POOL_MAX_KEYS", "32"))
+
+PoolKey = Tuple[int, bool, bool, bool, bool]
+
+
+def _wipe(buffer: bytearray):
+    for i in range(len(buffer)):
+        buffer[i] = 0
+
+
+class PasswordPool:
+    """Pool limitado de senhas por conjunto de opções"""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        low_water: int = DEFAULT_LOW_WATER,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        generator: Callable[..., List[str]] = PasswordGenerator.generate_batch
+    ):
+        """
+        Args:
+            capacity: Senhas mantidas por conjunto de opções
+            low_water: Abaixo deste nível o conjunto é reposto em background
+            max_keys: Máximo de conjuntos de opções mantidos (LRU)
+            generator: Função de geração em lote (mesma assinatura de generate_batch)
+        """
+        if capacity < 1 or not 0 <= low_water < capacity:
+            raise ValueError("Configuração inválida do pool de senhas")
+        self.capacity = capacity
+        self.low_water = low_water
+        self.max_keys = max_keys
+        self.generator = generator
+
+        self._pools: "OrderedDict[PoolKey, Deque[bytearray]]" = OrderedDict()
+        self._pending: "OrderedDict[PoolKey, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._worker: Optional[threading.Thread] = None
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "refills": 0, "generated": 0, "evictions": 0}
+
+    def start(self):
+        """
+        Inicia a thread de reposição
+
+        Chamado automaticamente no primeiro take; depois de close() só
+        start() reabre o pool.
+        """
+        with self._lock:
+            self._start_locked()
+
+    def _start_locked(self):
+        if self._closed:
+            self._closed = False
+            self._worker = None
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="password-pool", daemon=True)
+            self._worker.start()
+
+    def take(
+        self,
+        length: int = 16,
+        use_uppercase: bool = True,
+        use_lowercase: bool = True,
+        use_digits: bool = True,
+        use_special: bool = True
+    ) -> str:
+        """
+        Retira uma senha do pool (gera na hora se o pool estiver vazio ou
+        fechado)
+
+        Args:
+            length: Tamanho da senha
+            use_uppercase: Incluir letras maiúsculas
+            use_lowercase: Incluir letras minúsculas
+            use_digits: Incluir dígitos
+            use_special: Incluir caracteres especiais
+
+        Returns:
+            Senha gerada, nunca entregue antes
+        """
+        key = (length, use_uppercase, use_lowercase, use_digits, use_special)
+        with self._lock:
+            # Fechado (ex.: take durante o atexit): não reinicia a thread nem guarda senhas
+            closed = self._closed
+            if not closed:
+                self._start_locked()
+                pool = self._pools.get(key)
+                if pool:
+                    self._pools.move_to_end(key)
+                    buffer = pool.popleft()
+                    self._stats["hits"] += 1
+                    if len(pool) < self.low_water:
+                        self._schedule_locked(key)
+                    password = buffer.decode("ascii")
+                    _wipe(buffer)
+                    return password
+            self._stats["misses"] += 1
+
+        # Falta: gera fora do lock (também valida as opções antes de criar o conjunto)
+        password = self.generator(1, *key)[0]
+        if not closed:
+            with self._lock:
+                if not self._closed:
+                    self._schedule_locked(key)
+        return password
+
+    def _schedule_locked(self, key: PoolKey):
+        if key not in self._pools:
+            self._pools[key] = deque()
+            while len(self._pools) > self.max_keys:
+                evicted_key, evicted = self._pools.popitem(last=False)
+                self._pending.pop(evicted_key, None)
+                for buffer in evicted:
+                    _wipe(buffer)
+                self._stats["evictions"] += 1
+        self._pending[key] = None
+        self._wakeup.notify()
+
+    def _stopped_locked(self) -> bool:
+        # Uma thread de um ciclo anterior (close + start) também deve parar
+        return self._closed or self._worker is not threading.current_thread()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopped_locked():
+                    self._wakeup.wait()
+                if self._stopped_locked():
+                    return
+                key, _ = self._pending.popitem(last=False)
+                pool = self._pools.get(key)
+                missing = self.capacity - len(pool) if pool is not None else 0
+            if missing <= 0:
+                continue
+
+            try:
+                passwords = self.generator(missing, *key)
+            except ValueError:
+                continue
+
+            with self._lock:
+                if self._stopped_locked():
+                    return
+                pool = self._pools.get(key)
+                if pool is None:
+                    continue
+                space = self.capacity - len(pool)
+                pool.extend(bytearray(password, "ascii") for password in passwords[:space])
+                self._stats["refills"] += 1
+                self._stats["generated"] += len(passwords)
+
+    def stats(self) -> dict:
+        """
+        Estatísticas de uso do pool
+
+        Returns:
+            Dicionário com hits, misses, hit_rate, refills, generated,
+            evictions e o tamanho atual de cada conjunto de opções
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            sizes = [
+                {
+                    "length": key[0],
+                    "use_uppercase": key[1],
+                    "use_lowercase": key[2],
+                    "use_digits": key[3],
+                    "use_special": key[4],
+                    "available": len(pool),
+                }
+                for key, pool in self._pools.items()
+            ]
+        requests = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / requests, 4) if requests else None
+        stats["capacity"] = self.capacity
+        stats["low_water"] = self.low_water
+        stats["pools"] = sizes
+        return stats
+
+    def prometheus_lines(self) -> List[str]:
+        """Linhas no formato de exposição do Prometheus (coletor do /metrics)"""
+        stats = self.stats()
+        return [
+            "# HELP password_pool_hits_total Senhas entregues a partir do pool",
+            "# TYPE password_pool_hits_total counter",
+            f"password_pool_hits_total {stats['hits']}",
+            "# HELP password_pool_misses_total Senhas geradas na hora por pool vazio",
+            "# TYPE password_pool_misses_total counter",
+            f"password_pool_misses_total {stats['misses']}",
+            "# HELP password_pool_available Senhas disponíveis no pool",
+            "# TYPE password_pool_available gauge",
+            f"password_pool_available {sum(item['available'] for item in stats['pools'])}",
+        ]
+
+    def close(self):
+        """Para a reposição e zera todas as senhas ainda no pool"""
+        with self._lock:
+            self._closed = True
+            for pool in self._pools.values():
+                for buffer in pool:
+                    _wipe(buffer)
+                pool.clear()
+            self._pools.clear()
+            self._pending.clear()
+            self._wakeup.notify_all()
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join(timeout=5)
@@ -0,0 +1,188 @@
+"""
+Profiling opcional por requisição (cProfile ou amostragem estatística)
+
+Desligado por padrão. Para ativar defina uma das variáveis de ambiente:
+- PROFILE_SAMPLE_RATE: fração das requisições a perfilar (ex.: 0.01)
+- PROFILE_ADMIN_TOKEN: token que, enviado no header X-Profile-Token,
+  força o profiling daquela requisição
+"""
+import cProfile
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from metrics import route_template
+
+
+PROFILE_HEADER = b"x-profile-token"
+
+DEFAULT_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+DEFAULT_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN") or None
+DEFAULT_OUTPUT_DIR = os.getenv("PROFILE_DIR", "profiles")
+DEFAULT_MAX_BYTES = int(os.getenv("PROFILE_MAX_BYTES", str(50 * 1024 * 1024)))
+DEFAULT_FORMAT = os.getenv("PROFILE_FORMAT", "pstats")  # "pstats" ou "collapsed"
+DEFAULT_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+
+def profiling_enabled() -> bool:
+    """Indica se o middleware deve ser instalado (custo zero quando False)"""
+    return DEFAULT_SAMPLE_RATE > 0 or DEFAULT_ADMIN_TOKEN is not None
+
+
+class _StackSampler:
+    """
+    Profiler estatístico: amostra a pilha de uma thread em intervalo fixo
+
+    Gera pilhas completas no formato "collapsed" (uma linha por pilha,
+    frames separados por ";" seguidos da contagem), aceito por
+    flamegraph.pl e speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila uma fração das requisições
+
+    - Amostra sample_rate das requisições ou as que trazem o header
+      X-Profile-Token igual ao token de administrador
+    - Grava um arquivo .prof (pstats) ou .collapsed por requisição
+    - Mantém o diretório de saída abaixo de max_bytes apagando os mais antigos
+
+    Como o event loop intercala requisições, o perfil pode incluir trabalho
+    de outras requisições concorrentes; apenas uma requisição é perfilada
+    por vez para não misturar perfis.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        admin_token: Optional[str] = DEFAULT_ADMIN_TOKEN,
+        output_dir: str = DEFAULT_OUTPUT_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        output_format: str = DEFAULT_FORMAT,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ):
+        if output_format not in ("pstats", "collapsed"):
+            raise ValueError("output_format deve ser 'pstats' ou 'collapsed'")
+        self.app = app
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode("utf-8") if admin_token else None
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.output_format = output_format
+        self.sample_interval = sample_interval
+        self._busy = threading.Lock()
+
+    def _should_profile(self, scope: dict) -> bool:
+        if self.admin_token is not None:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_HEADER:
+                    return secrets.compare_digest(value, self.admin_token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            if self.output_format == "collapsed":
+                sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+                sampler.start()
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    sampler.stop()
+                self._write(scope, status[0], sampler.dump, "collapsed")
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    profiler.disable()
+                self._write(scope, status[0], profiler.dump_stats, "prof")
+        finally:
+            self._busy.release()
+
+    def _write(self, scope: dict, status: int, dump, extension: str):
+        """Grava o perfil e aplica o limite de disco"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            route = re.sub(r"[^A-Za-z0-9]+", "_", route_template(scope)).strip("_") or "root"
+            filename = (
+                f"{time.strftime('%Y%m%d-%H%M%S')}_{int(time.time() * 1000) % 1000:03d}"
+                f"_{scope.get('method', '')}_{route}_{status}.{extension}"
+            )
+            dump(os.path.join(self.output_dir, filename))
+            self._enforce_disk_cap()
+        except OSError:
+            # Profiling nunca deve derrubar a requisição
+            pass
+
+    def _enforce_disk_cap(self):
+        files = []
+        total = 0
+        for name in os.listdir(self.output_dir):
+            if not name.endswith((".prof", ".collapsed")):
+                continue
+            path = os.path.join(self.output_dir, name)
+            stat = os.stat(path)
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
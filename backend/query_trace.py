@@ -0,0 +1,196 @@
+"""
+Rastreamento de consultas SQL do DatabaseManager
+
+Cada statement executado por uma conexão criada com connect() tem o SQL
+normalizado, a duração e o número de linhas registrados na requisição
+corrente (identificada pelo request id), e statements acima do limite
+SLOW_QUERY_MS geram um log de consulta lenta.
+"""
+import logging
+import os
+import re
+import sqlite3
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+logger = logging.getLogger("query_trace")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "50"))
+# Em modo debug o resumo de consultas vai num header da resposta
+DEBUG = os.getenv("API_DEBUG", "").lower() in ("1", "true", "yes")
+MAX_RECORDS_PER_REQUEST = 1000
+
+REQUEST_ID_HEADER = b"x-request-id"
+QUERY_SUMMARY_HEADER = b"x-db-queries"
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normaliza um statement para agrupamento
+
+    Colapsa espaços e troca literais por "?", de modo que a mesma
+    consulta com valores diferentes gere a mesma chave.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+@dataclass
+class QueryRecord:
+    """Um statement executado"""
+    sql: str
+    duration: float
+    rows: int
+    request_id: Optional[str]
+    slow_logged: bool = False
+
+
+@dataclass
+class RequestTrace:
+    """Consultas executadas durante uma requisição"""
+    request_id: str
+    queries: List[QueryRecord] = field(default_factory=list)
+    count: int = 0
+    total_time: float = 0.0
+
+    def summary(self) -> str:
+        """Resumo no formato do header X-DB-Queries"""
+        return f"count={self.count}; total_ms={self.total_time * 1000:.3f}"
+
+
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+def get_current_trace() -> Optional[RequestTrace]:
+    """Retorna o rastreamento da requisição corrente (se houver)"""
+    return _current_trace.get()
+
+
+def _check_slow(record: QueryRecord):
+    if not record.slow_logged and record.duration * 1000 >= SLOW_QUERY_MS:
+        record.slow_logged = True
+        logger.warning(
+            "consulta lenta request_id=%s duration_ms=%.3f rows=%d sql=%s",
+            record.request_id, record.duration * 1000, record.rows, record.sql,
+        )
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor que mede execute() e fetch*() e registra o statement"""
+
+    _record: Optional[QueryRecord] = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            duration = time.perf_counter() - started
+            trace = _current_trace.get()
+            record = QueryRecord(
+                sql=normalize_sql(sql),
+                duration=duration,
+                rows=max(self.rowcount, 0),
+                request_id=trace.request_id if trace else current_request_id.get(),
+            )
+            self._record = record
+            if trace is not None:
+                trace.count += 1
+                trace.total_time += duration
+                if len(trace.queries) < MAX_RECORDS_PER_REQUEST:
+                    trace.queries.append(record)
+            # SELECTs só são avaliados após o fetch, quando as linhas são conhecidas
+            if record.sql[:6].upper() != "SELECT":
+                _check_slow(record)
+
+    def _account_fetch(self, started: float, rows: int):
+        duration = time.perf_counter() - started
+        record = self._record
+        if record is None:
+            return
+        record.duration += duration
+        record.rows += rows
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.total_time += duration
+        _check_slow(record)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._account_fetch(started, 1 if row is not None else 0)
+        return row
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._account_fetch(started, len(rows))
+        return rows
+
+
+class TracedConnection(sqlite3.Connection):
+    """Conexão cujos cursores são TracedCursor"""
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or TracedCursor)
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Abre uma conexão SQLite com rastreamento de consultas"""
+    return sqlite3.connect(db_path, factory=TracedConnection)
+
+
+class QueryTraceMiddleware:
+    """
+    Middleware ASGI que associa um request id a cada requisição
+
+    - Usa o X-Request-ID recebido ou gera um novo, devolvendo-o na resposta
+    - Em modo debug (API_DEBUG=1) adiciona X-DB-Queries com o número de
+      consultas e o tempo total de banco da requisição
+    """
+
+    def __init__(self, app, debug: bool = DEBUG):
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:128]
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex
+
+        trace = RequestTrace(request_id=request_id)
+        id_token = current_request_id.set(request_id)
+        trace_token = _current_trace.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                if self.debug:
+                    headers.append((QUERY_SUMMARY_HEADER, trace.summary().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(trace_token)
+            current_request_id.reset(id_token)
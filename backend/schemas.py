@@ -1,11 +1,27 @@
 """
 Schemas Pydantic para validação de dados da API
 """
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List
 from datetime import datetime
 
 
+class PasswordPolicySchema(BaseModel):
+    """Schema de política de geração (ver password_policy.PasswordPolicy)"""
+    length: int = Field(default=16, ge=4, le=128)
+    use_uppercase: bool = Field(default=True)
+    use_lowercase: bool = Field(default=True)
+    use_digits: bool = Field(default=True)
+    use_special: bool = Field(default=True)
+    min_uppercase: int = Field(default=0, ge=0, le=128)
+    min_lowercase: int = Field(default=0, ge=0, le=128)
+    min_digits: int = Field(default=0, ge=0, le=128)
+    min_special: int = Field(default=0, ge=0, le=128)
+    banned_chars: str = Field(default="", max_length=100)
+    no_repeats: bool = Field(default=False)
+    pronounceable: bool = Field(default=False)
+
+
 class PasswordCreate(BaseModel):
     """Schema para criação de senha"""
     title: str = Field(..., min_length=1, max_length=200)
@@ -18,6 +34,7 @@ class PasswordCreate(BaseModel):
     expiration_date: Optional[datetime] = None
     custom_password: Optional[str] = None
     encrypted_password: Optional[str] = None
+    policy: Optional[PasswordPolicySchema] = None
 
 
 class PasswordUpdate(BaseModel):
@@ -96,6 +113,7 @@ class PasswordGenerateRequest(BaseModel):
     use_lowercase: bool = Field(default=True)
     use_digits: bool = Field(default=True)
     use_special: bool = Field(default=True)
+    policy: Optional[PasswordPolicySchema] = None
 
 
 class PasswordGenerateResponse(BaseModel):
@@ -106,6 +124,54 @@ class PasswordGenerateResponse(BaseModel):
     entropy_level: str
 
 
+# Limite de senhas por requisição de geração em lote
+MAX_GENERATE_BATCH = 10000
+
+
+class PasswordGenerateBatchRequest(BaseModel):
+    """Schema para geração de senhas em lote"""
+    count: int = Field(default=10, ge=1, le=MAX_GENERATE_BATCH)
+    length: int = Field(default=16, ge=4, le=128)
+    use_uppercase: bool = Field(default=True)
+    use_lowercase: bool = Field(default=True)
+    use_digits: bool = Field(default=True)
+    use_special: bool = Field(default=True)
+
+
+class PasswordGenerateBatchResponse(BaseModel):
+    """Schema de resposta para geração em lote (mesma entropia para todas)"""
+    passwords: List[str]
+    count: int
+    length: int
+    entropy: float
+    entropy_level: str
+
+
+class PassphraseGenerateRequest(BaseModel):
+    """Schema para geração de passphrase (diceware)"""
+    words: int = Field(default=6, ge=3, le=20)
+    separator: str = Field(default="-", max_length=3)
+    capitalization: str = Field(default="lower", pattern="^(lower|title|upper|random)$")
+    include_digit: bool = Field(default=False)
+
+    @field_validator("separator")
+    @classmethod
+    def separator_without_letters(cls, value: str) -> str:
+        # Com letras ou dígitos no separador, textos iguais vêm de palavras diferentes
+        if not value or any(ch.isalnum() for ch in value):
+            raise ValueError("O separador não pode ser vazio nem conter letras ou dígitos")
+        return value
+
+
+class PassphraseGenerateResponse(BaseModel):
+    """Schema de resposta para geração de passphrase"""
+    passphrase: str
+    words: int
+    wordlist_size: int
+    entropy: float
+    entropy_level: str
+
+
 class MessageResponse(BaseModel):
     """Schema para mensagens de resposta"""
     message: str
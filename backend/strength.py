@@ -0,0 +1,732 @@
+"""
+Estimador de força de senhas no estilo zxcvbn
+
+calculate_entropy() mede o espaço de busca de uma senha aleatória a partir
+das opções de geração; para senhas escolhidas por pessoas isso superestima
+muito a força. Este módulo estima quantas tentativas um atacante precisaria,
+procurando padrões conhecidos:
+
+- palavras de dicionário por ranking (inclusive com maiúsculas e l33t)
+- caminhos no teclado (qwerty)
+- repetições ("aaaa", "abcabc")
+- sequências ("abcd", "9876")
+- datas e anos
+
+A senha é coberta pela sequência de padrões com o menor número de
+tentativas (programação dinâmica); o que sobra é contado como força bruta.
+
+O dicionário de ranking é um arquivo binário ordenado e mapeado em memória
+(busca binária com poda por prefixo), carregado só no primeiro uso. Sem o
+arquivo, usa uma lista embutida com as senhas mais comuns. Para gerar:
+    python strength.py build senhas_comuns.txt palavras_pt.txt strength_dict.bin
+(cada arquivo com uma palavra por linha, da mais para a menos comum)
+"""
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+MAGIC = b"PWRD"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+U32 = struct.Struct("<I")
+SPAN = struct.Struct("<II")
+
+DEFAULT_DICTIONARY = os.getenv(
+    "STRENGTH_DICTIONARY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "strength_dict.bin")
+)
+
+# Senhas longas passam pelos matchers em blocos deste tamanho; um resto que só
+# continua a repetição ou a sequência do bloco anterior conta pelas repetições a mais
+MAX_ANALYZED_LENGTH = 64
+MIN_WORD_LENGTH = 3
+# Intervalos de prefixos curtos ficam em cache (no máximo ~95^2 entradas por dicionário)
+PREFIX_CACHE_LENGTH = 2
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_SINGLE_CHAR = 10
+MIN_GUESSES_MULTI_CHAR = 50
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+REFERENCE_YEAR = datetime.now().year
+MIN_YEAR_SPACE = 20
+
+# Lista embutida (fallback), da mais para a menos comum
+BUILTIN_WORDS = (
+    "123456", "password", "123456789", "12345678", "12345", "qwerty", "senha",
+    "1234567", "111111", "123123", "abc123", "1234567890", "password1", "iloveyou",
+    "000000", "admin", "qwerty123", "123321", "654321", "666666", "121212",
+    "dragon", "monkey", "letmein", "football", "baseball", "welcome", "master",
+    "shadow", "sunshine", "princess", "trustno1", "superman", "batman", "michael",
+    "jordan", "login", "starwars", "hello", "freedom", "whatever", "qazwsx",
+    "ninja", "mustang", "access", "flower", "charlie", "secret", "summer",
+    "winter", "love", "brasil", "flamengo", "corinthians", "palmeiras",
+    "santos", "gremio", "amor", "deus", "mudar", "teste", "usuario", "mudar123",
+    "senha123", "admin123", "root", "google", "computer", "internet", "jesus",
+    "familia", "felicidade", "saudade", "futebol", "casa", "gato", "cachorro",
+)
+
+L33T_TABLE = {
+    "4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "3": "e", "6": "g",
+    "1": "i", "!": "i", "|": "i", "0": "o", "$": "s", "5": "s", "7": "t",
+    "+": "t", "2": "z", "%": "x",
+}
+_L33T_TRANSLATION = str.maketrans(L33T_TABLE)
+
+KEYBOARD_ROWS = (
+    ("`1234567890-=", "~!@#$%^&*()_+"),
+    ("qwertyuiop[]\\", "QWERTYUIOP{}|"),
+    ("asdfghjkl;'", 'ASDFGHJKL:"'),
+    ("zxcvbnm,./", "ZXCVBNM<>?"),
+)
+# Teclado inclinado: vizinhos (linha, coluna) relativos
+KEYBOARD_DIRECTIONS = ((0, -1), (0, 1), (-1, 0), (-1, 1), (1, -1), (1, 0))
+
+DATE_SEPARATED = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+YEAR = re.compile(r"19\d\d|20\d\d")
+DATE_SPLITS = {
+    4: ((1, 2), (2, 3)),
+    5: ((1, 3), (2, 3)),
+    6: ((1, 2), (2, 4), (4, 5)),
+    7: ((1, 3), (2, 3), (4, 5), (4, 6)),
+    8: ((2, 4), (4, 6)),
+}
+
+
+def _build_keyboard() -> Tuple[Dict[str, Tuple[int, int, bool]], Dict[Tuple[int, int], str], float, int]:
+    positions = {}
+    keys = {}
+    for row, (lower, upper) in enumerate(KEYBOARD_ROWS):
+        for col, (key, shifted) in enumerate(zip(lower, upper)):
+            positions[key] = (row, col, False)
+            positions[shifted] = (row, col, True)
+            keys[(row, col)] = key
+    degrees = [
+        sum((row + dr, col + dc) in keys for dr, dc in KEYBOARD_DIRECTIONS)
+        for row, col in keys
+    ]
+    return positions, keys, sum(degrees) / len(degrees), len(keys)
+
+
+KEYBOARD_POSITIONS, _KEYBOARD_KEYS, KEYBOARD_AVERAGE_DEGREE, KEYBOARD_STARTING_POSITIONS = _build_keyboard()
+
+
+class Match:
+    """Trecho password[i:j + 1] reconhecido como um padrão"""
+
+    __slots__ = ("pattern", "i", "j", "token", "guesses_log10")
+
+    def __init__(self, pattern: str, i: int, j: int, token: str, guesses: float):
+        self.pattern = pattern
+        self.i = i
+        self.j = j
+        self.token = token
+        minimum = MIN_GUESSES_SINGLE_CHAR if len(token) == 1 else MIN_GUESSES_MULTI_CHAR
+        if pattern != "bruteforce":
+            guesses = max(guesses, minimum)
+        self.guesses_log10 = math.log10(guesses)
+
+    def to_dict(self) -> dict:
+        return {
+            "pattern": self.pattern,
+            "token": self.token,
+            "guesses_log10": round(self.guesses_log10, 3),
+        }
+
+
+class StrengthResult:
+    """Resultado da estimativa de força"""
+
+    __slots__ = ("guesses_log10", "entropy", "score", "sequence")
+
+    def __init__(self, guesses_log10: float, sequence: List[Match]):
+        self.guesses_log10 = guesses_log10
+        # Em bits, comparável com calculate_entropy/get_entropy_level
+        self.entropy = round(guesses_log10 * math.log2(10), 2)
+        self.score = _score(guesses_log10)
+        self.sequence = sequence
+
+    def to_dict(self) -> dict:
+        return {
+            "guesses_log10": round(self.guesses_log10, 3),
+            "entropy": self.entropy,
+            "score": self.score,
+            "sequence": [match.to_dict() for match in self.sequence],
+        }
+
+
+def _score(guesses_log10: float) -> int:
+    """Nota de 0 a 4 (mesmos limiares do zxcvbn)"""
+    for score, threshold in enumerate((3, 6, 8, 10)):
+        if guesses_log10 < threshold:
+            return score
+    return 4
+
+
+# ===== DICIONÁRIO =====
+
+class _RankedDictionary(ABC):
+    """Palavras ordenadas com ranking; busca binária com poda por prefixo"""
+
+    def __init__(self):
+        # Intervalos dos prefixos curtos (ver PREFIX_CACHE_LENGTH)
+        self._ranges: Dict[bytes, Tuple[int, int]] = {}
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Quantidade de palavras"""
+
+    @abstractmethod
+    def _word(self, index: int) -> bytes:
+        """Palavra na posição index (em ordem de bytes), em UTF-8"""
+
+    @abstractmethod
+    def _rank(self, index: int) -> int:
+        """Ranking da palavra na posição index (1 = a mais comum)"""
+
+    def _lower_bound(self, key: bytes, lo: int, hi: int) -> int:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _prefix_range(self, prefix: bytes, lo: int, hi: int) -> Tuple[int, int]:
+        """Intervalo [lo, hi) das palavras que começam com prefix"""
+        cached = self._ranges.get(prefix)
+        if cached is None:
+            lo = self._lower_bound(prefix, lo, hi)
+            # 0xff nunca aparece em UTF-8: limita todas as continuações do prefixo
+            cached = (lo, self._lower_bound(prefix + b"\xff", lo, hi))
+            if len(prefix) <= PREFIX_CACHE_LENGTH:
+                self._ranges[prefix] = cached
+        return cached
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Procura palavras do dicionário dentro de text (já em minúsculas)
+
+        Returns:
+            Lista de (i, j, rank) para cada text[i:j + 1] no dicionário
+        """
+        found = []
+        size = len(self)
+        for i in range(len(text)):
+            lo, hi = 0, size
+            for j in range(i, len(text)):
+                prefix = text[i:j + 1].encode("utf-8")
+                lo, hi = self._prefix_range(prefix, lo, hi)
+                if lo >= hi:
+                    # Nenhuma palavra começa com este prefixo: não adianta estender
+                    break
+                if j - i + 1 >= MIN_WORD_LENGTH and self._word(lo) == prefix:
+                    found.append((i, j, self._rank(lo)))
+        return found
+
+
+class _MemoryDictionary(_RankedDictionary):
+    def __init__(self, words: Iterable[str]):
+        ranks = {}
+        for rank, word in enumerate(words, start=1):
+            ranks.setdefault(word.lower(), rank)
+        super().__init__()
+        self._words = sorted(word.encode("utf-8") for word in ranks)
+        self._ranks = [ranks[word.decode("utf-8")] for word in self._words]
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def _word(self, index: int) -> bytes:
+        return self._words[index]
+
+    def _rank(self, index: int) -> int:
+        return self._ranks[index]
+
+    def _lower_bound(self, key: bytes, lo: int, hi: int) -> int:
+        return bisect_left(self._words, key, lo, hi)
+
+
+class _FileDictionary(_RankedDictionary):
+    """
+    Arquivo (little-endian):
+        cabeçalho  magic "PWRD" | versão u16 | reservado u16 | quantidade u32
+        offsets    (quantidade + 1) x u32, absolutos, palavras em ordem de bytes
+        rankings   quantidade x u32
+        palavras   UTF-8 concatenadas
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError("Dicionário de força inválido")
+        magic, version, _, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError("Dicionário de força inválido ou de versão não suportada")
+        super().__init__()
+        self._count = count
+        self._ranks_offset = HEADER.size + (count + 1) * U32.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _word(self, index: int) -> bytes:
+        start, end = SPAN.unpack_from(self._mmap, HEADER.size + index * U32.size)
+        return self._mmap[start:end]
+
+    def _rank(self, index: int) -> int:
+        return U32.unpack_from(self._mmap, self._ranks_offset + index * U32.size)[0]
+
+
+def build_dictionary(sources: List[Iterable[str]], output_path: str) -> int:
+    """
+    Grava o dicionário de ranking no formato binário
+
+    O ranking de uma palavra é a posição dela no arquivo de origem (1 = mais
+    comum); se aparecer em mais de um arquivo, vale o menor ranking.
+
+    Args:
+        sources: Listas de palavras, uma por linha, da mais para a menos comum
+        output_path: Arquivo de saída
+
+    Returns:
+        Quantidade de palavras gravadas
+    """
+    ranks: Dict[bytes, int] = {}
+    for source in sources:
+        rank = 0
+        for line in source:
+            word = line.strip().lower()
+            if not word:
+                continue
+            rank += 1
+            if len(word) < MIN_WORD_LENGTH:
+                continue
+            key = word.encode("utf-8")
+            if rank < ranks.get(key, rank + 1):
+                ranks[key] = rank
+
+    words = sorted(ranks)
+    offset = HEADER.size + (len(words) + 1) * U32.size + len(words) * U32.size
+    offsets = [offset]
+    for word in words:
+        offset += len(word)
+        offsets.append(offset)
+    if offset > 0xFFFFFFFF:
+        raise ValueError("Dicionário grande demais para o formato")
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(words)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(struct.pack(f"<{len(words)}I", *(ranks[word] for word in words)))
+        f.write(b"".join(words))
+    os.replace(tmp_path, output_path)
+    return len(words)
+
+
+_dictionary: Optional[_RankedDictionary] = None
+_dictionary_lock = threading.Lock()
+
+
+def _get_dictionary() -> _RankedDictionary:
+    """Dicionário carregado sob demanda (arquivo, ou a lista embutida)"""
+    global _dictionary
+    if _dictionary is None:
+        with _dictionary_lock:
+            if _dictionary is None:
+                if os.path.exists(DEFAULT_DICTIONARY):
+                    _dictionary = _FileDictionary(DEFAULT_DICTIONARY)
+                else:
+                    _dictionary = _MemoryDictionary(BUILTIN_WORDS)
+    return _dictionary
+
+
+# ===== MATCHERS =====
+
+def _variations(changed: int, unchanged: int) -> int:
+    """Formas de escolher quais caracteres sofreram a variação (maiúscula, l33t, shift)"""
+    if changed == 0:
+        return 1
+    if unchanged == 0:
+        return 2
+    return sum(math.comb(changed + unchanged, k) for k in range(1, min(changed, unchanged) + 1))
+
+
+def _uppercase_variations(token: str) -> int:
+    if token.islower() or not any(c.isalpha() for c in token):
+        return 1
+    if token.isupper() or token[0].isupper() and token[1:].islower() or token[-1].isupper() and token[:-1].islower():
+        return 2
+    upper = sum(c.isupper() for c in token)
+    lower = sum(c.islower() for c in token)
+    return _variations(upper, lower)
+
+
+def _l33t_variations(token: str, unleeted: str) -> int:
+    variations = 1
+    for char in set(token):
+        plain = L33T_TABLE.get(char)
+        if plain is None:
+            continue
+        subbed = token.count(char)
+        unsubbed = token.lower().count(plain)
+        variations *= _variations(subbed, unsubbed)
+    return variations
+
+
+def _dictionary_matches(password: str, dictionary: _RankedDictionary) -> List[Match]:
+    lower = password.lower()
+    unleeted = lower.translate(_L33T_TRANSLATION)
+    matches = []
+    for i, j, rank in dictionary.find(lower):
+        token = password[i:j + 1]
+        matches.append(Match("dictionary", i, j, token, rank * _uppercase_variations(token)))
+    if unleeted != lower:
+        for i, j, rank in dictionary.find(unleeted):
+            token = password[i:j + 1]
+            if token.lower() == unleeted[i:j + 1]:
+                continue
+            guesses = rank * _uppercase_variations(token) * _l33t_variations(token, unleeted[i:j + 1])
+            matches.append(Match("dictionary", i, j, token, guesses))
+    return matches
+
+
+def _spatial_guesses(length: int, turns: int, shifted: int) -> float:
+    guesses = 0.0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * KEYBOARD_STARTING_POSITIONS * KEYBOARD_AVERAGE_DEGREE ** j
+    return guesses * _variations(shifted, length - shifted)
+
+
+def _spatial_matches(password: str) -> List[Match]:
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 1:
+        start = KEYBOARD_POSITIONS.get(password[i])
+        if start is None:
+            i += 1
+            continue
+        j = i
+        turns = 0
+        last_direction = None
+        shifted = int(start[2])
+        row, col = start[0], start[1]
+        while j + 1 < n:
+            position = KEYBOARD_POSITIONS.get(password[j + 1])
+            if position is None:
+                break
+            step = (position[0] - row, position[1] - col)
+            if step not in KEYBOARD_DIRECTIONS:
+                break
+            if step != last_direction:
+                turns += 1
+                last_direction = step
+            shifted += position[2]
+            row, col = position[0], position[1]
+            j += 1
+        if j - i + 1 >= 3:
+            matches.append(Match("spatial", i, j, password[i:j + 1], _spatial_guesses(j - i + 1, turns, shifted)))
+        i = j if j > i else i + 1
+    return matches
+
+
+def _sequence_matches(password: str) -> List[Match]:
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 2:
+        delta = ord(password[i + 1]) - ord(password[i])
+        j = i + 1
+        if 0 < abs(delta) <= 5:
+            while j + 1 < n and ord(password[j + 1]) - ord(password[j]) == delta:
+                j += 1
+        if j - i + 1 >= 3:
+            token = password[i:j + 1]
+            if token[0] in "aAzZ019":
+                base = 4
+            elif token[0].isdigit():
+                base = 10
+            else:
+                base = 26
+            if delta < 0:
+                base *= 2
+            matches.append(Match("sequence", i, j, token, base * len(token)))
+            i = j
+        else:
+            i += 1
+    return matches
+
+
+def _repeat_matches(password: str, estimate_base) -> List[Match]:
+    matches = []
+    greedy = re.compile(r"(.+)\1+")
+    lazy = re.compile(r"(.+?)\1+")
+    position = 0
+    while position < len(password):
+        greedy_match = greedy.search(password, position)
+        if greedy_match is None:
+            break
+        lazy_match = lazy.search(password, position)
+        if len(greedy_match.group(0)) > len(lazy_match.group(0)):
+            found = greedy_match
+            base = re.fullmatch(r"(.+?)\1+", found.group(0)).group(1)
+        else:
+            found = lazy_match
+            base = found.group(1)
+        token = found.group(0)
+        repeat_count = len(token) // len(base)
+        guesses = 10 ** estimate_base(base) * repeat_count
+        matches.append(Match("repeat", found.start(), found.end() - 1, token, guesses))
+        position = found.end()
+    return matches
+
+
+def _year_guesses(year: int) -> int:
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _to_year(value: int, digits: int) -> Optional[int]:
+    if digits == 4:
+        return value if 1000 <= value <= 2050 else None
+    if digits <= 2:
+        return value + (1900 if value > 50 else 2000)
+    return None
+
+
+def _is_date(parts: Tuple[Tuple[int, int], ...]) -> Optional[int]:
+    """Retorna o ano se (valor, dígitos) x3 formam dia/mês/ano em alguma ordem"""
+    for year_index, (day_index, month_index) in ((2, (0, 1)), (2, (1, 0)), (0, (2, 1)), (0, (1, 2))):
+        year = _to_year(*parts[year_index])
+        day = parts[day_index][0]
+        month = parts[month_index][0]
+        if year is not None and 1 <= day <= 31 and 1 <= month <= 12:
+            return year
+    return None
+
+
+def _date_matches(password: str) -> List[Match]:
+    matches = []
+    n = len(password)
+    for i in range(n):
+        for length in range(4, 9):
+            j = i + length - 1
+            if j >= n:
+                break
+            token = password[i:j + 1]
+            if not token.isdigit():
+                break
+            for first, second in DATE_SPLITS[length]:
+                pieces = (token[:first], token[first:second], token[second:])
+                year = _is_date(tuple((int(piece), len(piece)) for piece in pieces))
+                if year is not None:
+                    matches.append(Match("date", i, j, token, _year_guesses(year) * 365))
+                    break
+    for found in DATE_SEPARATED.finditer(password):
+        pieces = (found.group(1), found.group(3), found.group(4))
+        year = _is_date(tuple((int(piece), len(piece)) for piece in pieces))
+        if year is not None:
+            matches.append(Match("date", found.start(), found.end() - 1, found.group(0), _year_guesses(year) * 365 * 4))
+    for found in YEAR.finditer(password):
+        matches.append(Match("date", found.start(), found.end() - 1, found.group(0), _year_guesses(int(found.group(0)))))
+    return matches
+
+
+# ===== SEQUÊNCIA ÓTIMA =====
+
+def _sequence_cost(length: int, guesses_log10: float) -> float:
+    """log10(l! * produto + 10000^(l - 1)): penaliza sequências com muitos trechos"""
+    a = math.lgamma(length + 1) / math.log(10) + guesses_log10
+    b = (length - 1) * math.log10(MIN_GUESSES_BEFORE_GROWING_SEQUENCE)
+    high, low = max(a, b), min(a, b)
+    return high + math.log10(1 + 10 ** (low - high))
+
+
+def _most_guessable(password: str, matches: List[Match]) -> Tuple[float, List[Match]]:
+    n = len(password)
+    if n == 0:
+        return 0.0, []
+
+    by_end: List[List[Match]] = [[] for _ in range(n)]
+    for match in matches:
+        by_end[match.j].append(match)
+    bruteforce_log10 = math.log10(BRUTEFORCE_CARDINALITY)
+
+    # best[k] = {l: (soma de log10 das tentativas, início do último trecho, trecho ou None p/ força bruta)}
+    # cobrindo password[:k + 1] com l trechos
+    best: List[Dict[int, Tuple[float, int, Optional[Match]]]] = []
+    # Força bruta só começa no início ou logo após um padrão (dois trechos de
+    # força bruta seguidos nunca são melhores que um só)
+    bruteforce_starts = [0]
+    for k in range(n):
+        slot: Dict[int, Tuple[float, int, Optional[Match]]] = {}
+        candidates = [(match.i, match.guesses_log10, match) for match in by_end[k]]
+        candidates.extend((start, (k - start + 1) * bruteforce_log10, None) for start in bruteforce_starts)
+        for start, guesses_log10, match in candidates:
+            if start == 0:
+                options = ((1, guesses_log10),)
+            else:
+                options = ((length + 1, entry[0] + guesses_log10) for length, entry in best[start - 1].items())
+            for length, total in options:
+                current = slot.get(length)
+                if current is None or total < current[0]:
+                    slot[length] = (total, start, match)
+
+        # Descarta (l, total) dominados por uma sequência mais curta e com menos tentativas
+        pruned = {}
+        lowest = math.inf
+        for length in sorted(slot):
+            if slot[length][0] < lowest:
+                lowest = slot[length][0]
+                pruned[length] = slot[length]
+        best.append(pruned)
+
+        if by_end[k] and k + 1 < n:
+            bruteforce_starts.append(k + 1)
+
+    length, (total, _, _) = min(
+        best[n - 1].items(), key=lambda item: _sequence_cost(item[0], item[1][0])
+    )
+    guesses_log10 = _sequence_cost(length, total)
+
+    sequence = []
+    k = n - 1
+    while k >= 0:
+        _, start, match = best[k][length]
+        if match is None:
+            token = password[start:k + 1]
+            match = Match("bruteforce", start, k, token, BRUTEFORCE_CARDINALITY ** len(token))
+        sequence.append(match)
+        k = start - 1
+        length -= 1
+    sequence.reverse()
+    return guesses_log10, sequence
+
+
+def _continuation_log10(password: str, start: int) -> Optional[float]:
+    """
+    log10 das tentativas a mais se password[start:] só continua a sequência
+    ou a repetição que termina em start
+
+    Como nos matchers, uma sequência custa base * tamanho e uma repetição
+    custa base * repetições: o resto só multiplica o tamanho do trecho.
+
+    Returns:
+        log10 do crescimento, ou None se o resto não continua o padrão
+    """
+    n = len(password)
+    delta = ord(password[start - 1]) - ord(password[start - 2])
+    if 0 < abs(delta) <= 5 and all(
+        ord(password[k]) - ord(password[k - 1]) == delta for k in range(start, n)
+    ):
+        j = start - 2
+        while j > 0 and ord(password[j]) - ord(password[j - 1]) == delta:
+            j -= 1
+        run = start - j
+        if run >= 3:
+            return math.log10((run + n - start) / run)
+
+    for period in range(1, MAX_ANALYZED_LENGTH // 2 + 1):
+        if password[start:] == password[start - period:n - period]:
+            j = start - 1
+            while j >= period and password[j] == password[j - period]:
+                j -= 1
+            run = start - j - 1 + period
+            if run >= 2 * period:
+                return math.log10((run + n - start) / run)
+    return None
+
+
+def _analyze(password: str, dictionary: _RankedDictionary) -> Tuple[float, List[Match]]:
+    matches = (
+        _dictionary_matches(password, dictionary)
+        + _spatial_matches(password)
+        + _sequence_matches(password)
+        + _repeat_matches(password, lambda base: _estimate_log10(base, dictionary)[0])
+        + _date_matches(password)
+    )
+    return _most_guessable(password, matches)
+
+
+def _estimate_log10(password: str, dictionary: _RankedDictionary) -> Tuple[float, List[Match]]:
+    guesses_log10, sequence = _analyze(password[:MAX_ANALYZED_LENGTH], dictionary)
+    for start in range(MAX_ANALYZED_LENGTH, len(password), MAX_ANALYZED_LENGTH):
+        extra = _continuation_log10(password, start)
+        if extra is not None:
+            guesses_log10 += extra
+            break
+        block_log10, block_sequence = _analyze(password[start:start + MAX_ANALYZED_LENGTH], dictionary)
+        for match in block_sequence:
+            match.i += start
+            match.j += start
+        guesses_log10 += block_log10
+        sequence.extend(block_sequence)
+    return guesses_log10, sequence
+
+
+def estimate(password: str) -> StrengthResult:
+    """
+    Estima a força de uma senha
+
+    Args:
+        password: Senha em texto puro
+
+    Returns:
+        StrengthResult com log10 das tentativas, entropia equivalente em
+        bits, nota de 0 a 4 e os padrões encontrados
+    """
+    return StrengthResult(*_estimate_log10(password, _get_dictionary()))
+
+
+def estimate_batch(passwords: Iterable[str]) -> List[StrengthResult]:
+    """
+    Estima a força de várias senhas (por exemplo, um vault inteiro)
+
+    O dicionário é carregado uma vez e senhas repetidas são avaliadas uma
+    única vez.
+
+    Args:
+        passwords: Senhas em texto puro
+
+    Returns:
+        Um StrengthResult por senha, na mesma ordem
+    """
+    dictionary = _get_dictionary()
+    cache: Dict[str, StrengthResult] = {}
+    results = []
+    for password in passwords:
+        result = cache.get(password)
+        if result is None:
+            result = cache[password] = StrengthResult(*_estimate_log10(password, dictionary))
+        results.append(result)
+    return results
+
+
+def main():
+    if len(sys.argv) < 4 or sys.argv[1] != "build":
+        print("Uso: python strength.py build <lista1.txt> [lista2.txt ...] <strength_dict.bin>")
+        sys.exit(1)
+    sources = [open(path, "r", encoding="utf-8") for path in sys.argv[2:-1]]
+    try:
+        count = build_dictionary(sources, sys.argv[-1])
+    finally:
+        for source in sources:
+            source.close()
+    print(f"{count} palavras gravadas em {sys.argv[-1]}")
+
+
+if __name__ == "__main__":
+    main()
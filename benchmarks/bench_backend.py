@@ -0,0 +1,271 @@
+"""
+Benchmark dos caminhos críticos do backend
+
+Popula um passwords.db sintético e mede, em processo e através da
+aplicação FastAPI (cliente ASGI), login, validação de sessão, listagem,
+criação de senhas e import/export de wallet.
+
+Exemplo:
+    python benchmarks/bench_backend.py --users 20 --entries-per-user 500 \\
+        --output results.json --baseline previous.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import base64
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from common import (
+    add_backend_to_path, compare_results, measure, print_table, write_results
+)
+
+add_backend_to_path()
+
+BENCH_PASSWORD = "benchmark-password"
+
+
+def seed_database(db_path: str, users: int, entries_per_user: int, seed: int, bcrypt_cost: int,
+                  reset: bool = False):
+    """
+    Cria usuários e entradas sintéticas diretamente no SQLite
+
+    Todos os usuários compartilham a mesma senha (um único hash bcrypt),
+    então o seed não paga o custo do bcrypt por usuário.
+
+    Args:
+        reset: Apaga o banco se ele já existe (senão o seed se recusa)
+
+    Returns:
+        Lista de (user_id, username)
+
+    Raises:
+        FileExistsError: Se db_path já existe e reset é False
+    """
+    import bcrypt
+    from database import DatabaseManager
+    from password_generator import PasswordGenerator
+
+    if os.path.exists(db_path):
+        if not reset:
+            raise FileExistsError(f"{db_path} já existe; use --reset-db para apagá-lo")
+        os.remove(db_path)
+    DatabaseManager(db_path)  # cria o schema
+
+    rng = random.Random(seed)
+    password_hash = bcrypt.hashpw(
+        BENCH_PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=bcrypt_cost)
+    ).decode("utf-8")
+    now = datetime(2024, 1, 1)
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    created = []
+    for i in range(users):
+        username = f"bench_user_{i}"
+        cursor.execute(
+            "INSERT INTO users (username, email, password_hash, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (username, f"{username}@example.com", password_hash, now.isoformat(), now.isoformat()),
+        )
+        user_id = cursor.lastrowid
+        created.append((user_id, username))
+
+        rows = []
+        for j in range(entries_per_user):
+            length = rng.choice((12, 16, 20, 32))
+            flags = [rng.random() < 0.9 for _ in range(4)]
+            flags[1] = True
+            stamp = now + timedelta(minutes=j)
+            entropy = PasswordGenerator.calculate_entropy(length, *flags)
+            rows.append((
+                user_id, f"Entrada {j}", f"site{j}.example.com",
+                rng.randbytes(44 + length), length,
+                *(1 if flag else 0 for flag in flags),
+                entropy, None, stamp.isoformat(), stamp.isoformat(),
+                PasswordGenerator.get_entropy_level(entropy),
+            ))
+        cursor.executemany("""
+            INSERT INTO password_entries
+            (user_id, title, site, password_encrypted, length, use_uppercase, use_lowercase,
+             use_digits, use_special, entropy, expiration_date, created_at, updated_at, entropy_level)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    conn.commit()
+    conn.close()
+    return created
+
+
+def _check(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"{response.request.method} {response.request.url}: {response.status_code} {response.text}")
+    return response
+
+
+def run_in_process(args, db_path: str, users) -> dict:
+    """Mede as operações chamando as classes do backend diretamente"""
+    import api
+    from auth import AuthManager
+    from database import DatabaseManager
+    from models import PasswordEntry
+    from password_manager import PasswordManager
+
+    results = {}
+    user_id, username = users[0]
+    import_user_id, _ = users[-1]
+
+    auth = AuthManager(db_path=db_path)
+    results["inproc.auth_login"] = measure(
+        lambda: auth.login(username, BENCH_PASSWORD), args.login_iterations
+    )
+    token, _, _ = auth.login(username, BENCH_PASSWORD)
+    results["inproc.validate_session"] = measure(
+        lambda: auth.validate_session(token), args.iterations * 100
+    )
+
+    db = DatabaseManager(db_path)
+    results["inproc.get_all_entries_for_user"] = measure(
+        lambda: db.get_all_entries_for_user(user_id), args.iterations
+    )
+
+    blob = os.urandom(60)
+
+    def create_entry():
+        now = datetime.now()
+        entry = PasswordEntry(
+            id=None, user_id=import_user_id, title="Nova", site="novo.example.com",
+            password=b"", length=16, use_uppercase=True, use_lowercase=True,
+            use_digits=True, use_special=True, entropy=103.4,
+            expiration_date=None, created_at=now, updated_at=now,
+        )
+        db.create_entry(entry, blob)
+
+    results["inproc.create_entry"] = measure(create_entry, args.iterations)
+
+    pm = PasswordManager(db_path)
+    loop = asyncio.new_event_loop()
+    try:
+        results["inproc.wallet_export"] = measure(
+            lambda: loop.run_until_complete(api.wallet_export((pm, user_id))),
+            args.iterations, ops_per_call=args.entries_per_user,
+        )
+        exported = loop.run_until_complete(api.wallet_export((pm, user_id)))
+        payload = {"entries": exported["entries"][:args.import_size]}
+        results["inproc.wallet_import"] = measure(
+            lambda: loop.run_until_complete(api.wallet_import(payload, (pm, import_user_id))),
+            args.iterations, ops_per_call=len(payload["entries"]),
+        )
+    finally:
+        loop.close()
+    return results
+
+
+def run_asgi(args, users) -> dict:
+    """Mede as mesmas operações através da aplicação FastAPI"""
+    from fastapi.testclient import TestClient
+    import api
+
+    results = {}
+    _, username = users[0]
+    _, import_username = users[-1]
+    client = TestClient(api.app)
+    credentials = {"username": username, "password": BENCH_PASSWORD}
+
+    results["asgi.auth_login"] = measure(
+        lambda: _check(client.post("/api/auth/login", json=credentials)), args.login_iterations
+    )
+    token = _check(client.post("/api/auth/login", json=credentials)).json()["token"]
+    headers = {"X-Session-Token": token}
+    import_token = _check(client.post(
+        "/api/auth/login", json={"username": import_username, "password": BENCH_PASSWORD}
+    )).json()["token"]
+    import_headers = {"X-Session-Token": import_token}
+
+    results["asgi.list_passwords"] = measure(
+        lambda: _check(client.get("/api/passwords", headers=headers)), args.iterations
+    )
+
+    create_body = {
+        "title": "Nova", "site": "novo.example.com", "length": 16,
+        "encrypted_password": base64.b64encode(os.urandom(60)).decode("utf-8"),
+    }
+    results["asgi.create_password"] = measure(
+        lambda: _check(client.post("/api/passwords", json=create_body, headers=import_headers)),
+        args.iterations,
+    )
+
+    results["asgi.wallet_export"] = measure(
+        lambda: _check(client.get("/api/wallet/export", headers=headers)),
+        args.iterations, ops_per_call=args.entries_per_user,
+    )
+    exported = _check(client.get("/api/wallet/export", headers=headers)).json()
+    payload = {"entries": exported["entries"][:args.import_size]}
+    results["asgi.wallet_import"] = measure(
+        lambda: _check(client.post("/api/wallet/import", json=payload, headers=import_headers)),
+        args.iterations, ops_per_call=len(payload["entries"]),
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos caminhos críticos do backend")
+    parser.add_argument("--users", type=int, default=10, help="usuários sintéticos")
+    parser.add_argument("--entries-per-user", type=int, default=500, help="entradas por usuário")
+    parser.add_argument("--iterations", type=int, default=50, help="repetições por benchmark")
+    parser.add_argument("--login-iterations", type=int, default=5, help="repetições de login (bcrypt)")
+    parser.add_argument("--import-size", type=int, default=100, help="entradas por import de wallet")
+    parser.add_argument("--bcrypt-cost", type=int, default=12, help="custo bcrypt dos usuários seed")
+    parser.add_argument("--seed", type=int, default=1234, help="semente do gerador sintético")
+    parser.add_argument("--workdir", help="diretório do passwords.db (padrão: temporário)")
+    parser.add_argument("--reset-db", action="store_true",
+                        help="apaga um passwords.db existente no --workdir antes do seed")
+    parser.add_argument("--skip-asgi", action="store_true", help="pula os benchmarks via ASGI")
+    parser.add_argument("--output", default="bench_backend.json", help="arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="piora relativa tolerada no p50 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    # O backend abre "passwords.db" relativo ao diretório atual
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="pm-bench-"))
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    db_path = os.path.join(workdir, "passwords.db")
+
+    print(f"Populando {db_path}: {args.users} usuários x {args.entries_per_user} entradas...")
+    try:
+        # Só o diretório temporário do próprio benchmark é apagado sem pedir
+        users = seed_database(
+            db_path, args.users + 1, args.entries_per_user, args.seed, args.bcrypt_cost,
+            reset=args.reset_db or not args.workdir,
+        )
+    except FileExistsError as e:
+        print(f"Erro: {e}")
+        sys.exit(2)
+
+    results = run_in_process(args, db_path, users)
+    if not args.skip_asgi:
+        results.update(run_asgi(args, users))
+
+    print_table(results)
+    write_results(output, results, config=vars(args))
+    print(f"\nResultados gravados em {output}")
+
+    if baseline:
+        regressions = compare_results(baseline, results, args.max_regression)
+        if regressions:
+            print("\nRegressões acima do limite:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nSem regressões acima do limite.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark do modo batch do wallet local (JSONPasswordManager.batch)
+
+Aplica K alterações em um vault de N entradas de três formas:
+- snapshot por alteração: regrava o vault inteiro a cada uma (referência)
+- uma gravação por alteração: um append no journal cada
+- batch: todas as alterações em um único append
+
+Exemplo:
+    python benchmarks/bench_batch.py --entries 5000 --changes 1000 --output batch.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from password_manager import JSONPasswordManager  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do modo batch do wallet local")
+    parser.add_argument("--entries", type=int, default=5000, help="entradas no vault")
+    parser.add_argument("--changes", type=int, default=1000, help="alterações por rodada")
+    parser.add_argument("--iterations", type=int, default=5, help="rodadas medidas")
+    parser.add_argument("--output", default="bench_batch.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_batch_")
+    path = os.path.join(workdir, "passwords.json")
+    # Sem compactação durante a medição
+    JSONPasswordManager.JOURNAL_COMPACT_BYTES = 1 << 62
+    try:
+        pm = JSONPasswordManager(MASTER_PASSWORD, path)
+        template = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "template.json"))
+        with template.batch():
+            for i in range(args.entries):
+                template.create_password(f"Entrada {i}", f"site{i}.example.com", length=20)
+        pm.import_entries(template.get_all_passwords())
+        template.close()
+        counter = iter(range(10 ** 9))
+
+        def apply_changes(after_each=None):
+            for i in range(args.changes):
+                pm.update_password(1 + i % args.entries, title=f"Título {next(counter)}")
+                if after_each is not None:
+                    after_each()
+
+        def batched():
+            with pm.batch():
+                apply_changes()
+
+        snapshot_changes = max(args.changes // 50, 5)
+        snapshot_per_change = measure(pm.compact, snapshot_changes)
+        results = {
+            "journal_per_change": measure(apply_changes, args.iterations, ops_per_call=args.changes),
+            "batch": measure(batched, args.iterations, ops_per_call=args.changes),
+        }
+        results["snapshot_per_change"] = snapshot_per_change
+        pm.close()
+
+        print_table(results)
+        per_change = {
+            name: result["p50_ms"] / (1 if name == "snapshot_per_change" else args.changes)
+            for name, result in results.items()
+        }
+        for name, value in per_change.items():
+            print(f"{name}: {value:.4f} ms por alteração")
+        write_results(args.output, results, config=vars(args), extra={"ms_per_change": per_change})
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark do índice local de vazamentos (breach_index.py)
+
+Gera uma lista sintética de hashes SHA-1 no formato do HIBP, mede o tempo
+de build_index() e a latência de consulta: senha vazada, senha não vazada,
+range() por prefixo de 5 dígitos e auditoria em lote de um vault.
+
+Exemplo:
+    python benchmarks/bench_breach.py --hashes 1000000 --output breach.json
+"""
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from common import add_backend_to_path, measure, print_table, write_results
+
+add_backend_to_path()
+
+from breach_index import BreachIndex, build_index, password_digest  # noqa: E402
+
+
+def synthetic_lines(count: int, rng: random.Random):
+    """Linhas "SHA1:CONTAGEM" das senhas "vazada-0" ... "vazada-(count-1)", fora de ordem"""
+    order = list(range(count))
+    rng.shuffle(order)
+    for i in order:
+        digest = hashlib.sha1(f"vazada-{i}".encode("utf-8")).hexdigest().upper()
+        yield f"{digest}:{rng.randint(1, 100000)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de vazamentos")
+    parser.add_argument("--hashes", type=int, default=1000000, help="hashes na lista sintética")
+    parser.add_argument("--iterations", type=int, default=5000, help="consultas medidas")
+    parser.add_argument("--vault-size", type=int, default=1000, help="senhas no vault auditado")
+    parser.add_argument("--dir", help="diretório do índice (padrão: temporário)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="bench_breach.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workdir = args.dir or tempfile.mkdtemp(prefix="bench_breach_")
+    try:
+        started = time.perf_counter()
+        manifest = build_index(synthetic_lines(args.hashes, rng), workdir, source="sintético")
+        build_seconds = time.perf_counter() - started
+        index_bytes = sum(
+            os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir)
+        )
+        print(f"Índice com {manifest['records']} hashes gerado em {build_seconds:.2f}s "
+              f"({index_bytes / 1024 / 1024:.1f} MiB)")
+
+        index = BreachIndex(workdir)
+        hits = [f"vazada-{rng.randrange(args.hashes)}" for _ in range(args.iterations)]
+        misses = [f"segura-{i}" for i in range(args.iterations)]
+        prefixes = [password_digest(p).hex()[:5] for p in hits]
+        assert all(index.is_breached(p) for p in hits[:100])
+        assert not any(index.is_breached(p) for p in misses[:100])
+
+        hit_iter = iter(hits * 2)
+        miss_iter = iter(misses * 2)
+        prefix_iter = iter(prefixes * 2)
+        vault = [
+            f"vazada-{rng.randrange(args.hashes)}" if rng.random() < 0.1 else f"segura-{i}"
+            for i in range(args.vault_size)
+        ]
+        digests = [password_digest(p) for p in vault]
+
+        results = {
+            "lookup_hit": measure(lambda: index.count(next(hit_iter)), args.iterations),
+            "lookup_miss": measure(lambda: index.count(next(miss_iter)), args.iterations),
+            "range_prefix5": measure(lambda: index.range(next(prefix_iter)), args.iterations),
+            "audit_vault_batch": measure(
+                lambda: index.count_many(digests), max(args.iterations // 100, 3), ops_per_call=len(vault)
+            ),
+            "audit_vault_one_by_one": measure(
+                lambda: [index.count_digest(d) for d in digests],
+                max(args.iterations // 100, 3), ops_per_call=len(vault)
+            ),
+        }
+        index.close()
+
+        print_table(results)
+        write_results(args.output, results, config=vars(args), extra={
+            "build_seconds": round(build_seconds, 3),
+            "index_bytes": index_bytes,
+            "records": manifest["records"],
+        })
+        print(f"\nResultados gravados em {args.output}")
+    finally:
+        if not args.dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
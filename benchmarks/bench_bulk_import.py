@@ -0,0 +1,97 @@
+"""
+Benchmark da importação de vários wallets (local/bulk_import.py)
+
+Gera F arquivos exportados com N entradas cada e mede a importação de
+todos para um wallet local vazio:
+- sequencial: import_from_json e import_entries arquivo por arquivo,
+  como antes (um PBKDF2 e um snapshot por arquivo, tudo no processo)
+- bulk_1: import_wallets lendo no próprio processo (um único snapshot)
+- bulk_W: import_wallets com W processos de leitura
+
+O ganho do paralelismo depende dos núcleos livres (os_cpu_count vai nos
+resultados). Cada rodada importa para um wallet novo, já criado antes da
+medição.
+
+Exemplo:
+    python benchmarks/bench_bulk_import.py --files 24 --entries-per-file 200 --output bulk_import.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from bulk_import import import_wallets  # noqa: E402
+from password_manager import JSONPasswordManager  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+EXPORT_PASSWORD = "senha-da-equipe"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da importação de vários wallets")
+    parser.add_argument("--files", type=int, default=24, help="arquivos a importar")
+    parser.add_argument("--entries-per-file", type=int, default=200, help="entradas por arquivo")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processos de leitura")
+    parser.add_argument("--iterations", type=int, default=3, help="importações medidas")
+    parser.add_argument("--output", default="bench_bulk_import.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_bulk_import_")
+    try:
+        import_files = []
+        for i in range(args.files):
+            path = os.path.join(workdir, f"export_{i}.json")
+            pm = JSONPasswordManager(EXPORT_PASSWORD, path)
+            with pm.batch():
+                for j in range(args.entries_per_file):
+                    pm.create_password(f"Arquivo {i} entrada {j}", f"site{j % 50}.example.com", length=20)
+            pm.close()
+            import_files.append(path)
+
+        targets = []
+
+        def new_targets(name: str):
+            """Wallets de destino vazios, um por rodada (warmup incluído)"""
+            targets.clear()
+            for run in range(args.iterations + 1):
+                pm = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, f"{name}_{run}.json"))
+                targets.append(pm)
+
+        def sequential():
+            pm = targets.pop()
+            for import_file in import_files:
+                pm.import_entries(JSONPasswordManager.import_from_json(import_file, EXPORT_PASSWORD))
+            pm.close()
+
+        def bulk(workers: int):
+            pm = targets.pop()
+            result = import_wallets(pm, import_files, EXPORT_PASSWORD, workers=workers)
+            pm.close()
+            assert not result.errors, result.errors
+
+        total_entries = args.files * args.entries_per_file
+        results = {}
+        new_targets("sequential")
+        results["sequential"] = measure(sequential, args.iterations, ops_per_call=total_entries)
+        for workers in sorted({1, args.workers}):
+            new_targets(f"bulk_{workers}")
+            results[f"bulk_{workers}"] = measure(lambda: bulk(workers), args.iterations, ops_per_call=total_entries)
+
+        print_table(results)
+        print()
+        for name, stats in results.items():
+            if name != "sequential":
+                print(f"{name}: {results['sequential']['p50_ms'] / stats['p50_ms']:.2f}x em relação ao sequencial")
+        write_results(args.output, results, config=vars(args), extra={"os_cpu_count": os.cpu_count()})
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
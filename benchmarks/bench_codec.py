@@ -0,0 +1,98 @@
+"""
+Benchmark da serialização binária do wallet local (local/wallet_codec.py)
+
+Compara, para N entradas, o formato binário com o JSON usado pelos
+formatos json e records:
+- serialização: entradas -> payload (o que _save faz antes de cifrar)
+- leitura: payload -> PasswordEntry (o que a abertura faz depois de decifrar)
+- ponta a ponta: snapshot completo e abertura de um wallet em cada formato
+
+Exemplo:
+    python benchmarks/bench_codec.py --entries 50000 --output codec.json
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+import wallet_codec  # noqa: E402
+from password_manager import JSONPasswordManager, PasswordEntry  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da serialização binária do wallet local")
+    parser.add_argument("--entries", type=int, default=50000, help="entradas no wallet")
+    parser.add_argument("--iterations", type=int, default=5, help="rodadas medidas")
+    parser.add_argument("--compression", default=None, help="compressão dos wallets de ponta a ponta (zlib, zstd)")
+    parser.add_argument("--output", default="bench_codec.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_codec_")
+    try:
+        template = JSONPasswordManager(
+            MASTER_PASSWORD, os.path.join(workdir, "template.json"), wallet_format="json"
+        )
+        with template.batch():
+            for i in range(args.entries):
+                template.create_password(f"Entrada {i}", f"site{i % 500}.example.com", length=20)
+        entries = template.get_all_passwords()
+
+        def json_encode():
+            entries_data = {"entries": [JSONPasswordManager._entry_to_dict(entry) for entry in entries]}
+            return json.dumps(entries_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        def json_decode(payload):
+            return [JSONPasswordManager._entry_from_dict(data) for data in json.loads(payload)["entries"]]
+
+        json_payload = json_encode()
+        binary_payload = wallet_codec.encode_entries(entries)
+        n = args.entries
+        results = {
+            "encode_json": measure(json_encode, args.iterations, ops_per_call=n),
+            "encode_binary": measure(lambda: wallet_codec.encode_entries(entries), args.iterations, ops_per_call=n),
+            "decode_json": measure(lambda: json_decode(json_payload), args.iterations, ops_per_call=n),
+            "decode_binary": measure(
+                lambda: wallet_codec.decode_entries(binary_payload, PasswordEntry), args.iterations, ops_per_call=n
+            ),
+        }
+
+        sizes = {"payload_json": len(json_payload), "payload_binary": len(binary_payload)}
+        for wallet_format in ("json", "binary"):
+            path = os.path.join(workdir, f"{wallet_format}.json")
+            pm = JSONPasswordManager(
+                MASTER_PASSWORD, path, wallet_format=wallet_format, compression=args.compression
+            )
+            pm.import_entries(entries, skip_duplicates=False)
+            results[f"save_{wallet_format}"] = measure(pm.compact, args.iterations)
+            pm.close()
+            sizes[f"file_{wallet_format}"] = os.path.getsize(path)
+
+            def open_wallet():
+                opened = JSONPasswordManager(MASTER_PASSWORD, path, compression=args.compression)
+                opened.close()
+
+            results[f"open_{wallet_format}"] = measure(open_wallet, args.iterations)
+        template.close()
+
+        print_table(results)
+        print()
+        for step in ("encode", "decode", "save", "open"):
+            ratio = results[f"{step}_json"]["p50_ms"] / results[f"{step}_binary"]["p50_ms"]
+            print(f"{step}: {ratio:.2f}x em relação ao JSON")
+        print(f"payload: {sizes['payload_binary'] / sizes['payload_json']:.0%} do tamanho do JSON compacto")
+        write_results(args.output, results, config=vars(args), extra={"bytes": sizes})
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
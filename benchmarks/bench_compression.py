@@ -0,0 +1,77 @@
+"""
+Benchmark da compressão do payload do wallet local (local/wallet_compression.py)
+
+Para um wallet de N entradas (10 mil por padrão) em cada formato (json e
+records) e compressão (nenhuma, zlib e zstd quando instalado), mede o
+tamanho do arquivo, o snapshot completo (serializar, comprimir, cifrar e
+gravar) e a abertura de ponta a ponta (ler, decifrar, descomprimir e
+montar as entradas).
+
+Exemplo:
+    python benchmarks/bench_compression.py --entries 10000 --output compression.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from password_manager import JSONPasswordManager  # noqa: E402
+from wallet_compression import available_methods  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da compressão do wallet local")
+    parser.add_argument("--entries", type=int, default=10000, help="entradas no wallet")
+    parser.add_argument("--iterations", type=int, default=5, help="gravações e aberturas medidas")
+    parser.add_argument("--output", default="bench_compression.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_compression_")
+    try:
+        template = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "template.json"))
+        with template.batch():
+            for i in range(args.entries):
+                template.create_password(f"Entrada {i}", f"site{i % 500}.example.com", length=20)
+        entries = template.get_all_passwords()
+
+        results = {}
+        sizes = {}
+        for wallet_format in ("json", "records"):
+            for compression in [None] + available_methods():
+                name = f"{wallet_format}_{compression or 'none'}"
+                path = os.path.join(workdir, f"{name}.json")
+                pm = JSONPasswordManager(
+                    MASTER_PASSWORD, path, wallet_format=wallet_format, compression=compression
+                )
+                pm.import_entries(entries, skip_duplicates=False)
+                results[f"save_{name}"] = measure(pm.compact, args.iterations)
+                pm.close()
+                sizes[name] = os.path.getsize(path)
+
+                def open_wallet():
+                    opened = JSONPasswordManager(MASTER_PASSWORD, path, compression=compression)
+                    opened.close()
+
+                results[f"open_{name}"] = measure(open_wallet, args.iterations)
+        template.close()
+
+        print_table(results)
+        print()
+        for name, size in sizes.items():
+            base = sizes[name.rsplit("_", 1)[0] + "_none"]
+            print(f"{name}: {size / 1024:.0f} KiB ({size / base:.0%} do tamanho sem compressão)")
+        write_results(args.output, results, config=vars(args), extra={"file_bytes": sizes})
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
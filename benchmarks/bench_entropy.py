@@ -0,0 +1,106 @@
+"""
+Microbenchmark de entropia em listagens grandes
+
+Simula a montagem de uma listagem com 100k linhas de três formas:
+- legado: recalcula entropia (log2 por linha) e nível para cada linha
+- tabela: calculate_entropy (tabela) e get_entropy_level atuais
+- gravado: lê o entropy_level guardado na entrada (caminho de leitura atual)
+
+Exemplo:
+    python benchmarks/bench_entropy.py --rows 100000 --output entropy.json
+"""
+import argparse
+import math
+import random
+
+from common import add_backend_to_path, measure, print_table, write_results
+
+add_backend_to_path()
+
+from models import PasswordEntry  # noqa: E402
+from password_generator import PasswordGenerator  # noqa: E402
+
+
+def legacy_entropy(length, use_uppercase, use_lowercase, use_digits, use_special) -> float:
+    """Implementação anterior de calculate_entropy, só para referência"""
+    charset_size = 0
+    if use_uppercase:
+        charset_size += len(PasswordGenerator.UPPERCASE)
+    if use_lowercase:
+        charset_size += len(PasswordGenerator.LOWERCASE)
+    if use_digits:
+        charset_size += len(PasswordGenerator.DIGITS)
+    if use_special:
+        charset_size += len(PasswordGenerator.SPECIAL)
+    if charset_size == 0:
+        return 0.0
+    return round(length * math.log2(charset_size), 2)
+
+
+def legacy_level(entropy: float) -> str:
+    """Implementação anterior de get_entropy_level, só para referência"""
+    if entropy < 28:
+        return "Fraco"
+    elif entropy < 36:
+        return "Médio"
+    elif entropy < 60:
+        return "Forte"
+    return "Muito Forte"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entropia em listagens grandes")
+    parser.add_argument("--rows", type=int, default=100000, help="linhas da listagem")
+    parser.add_argument("--iterations", type=int, default=10, help="listagens medidas")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="bench_entropy.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = []
+    for i in range(args.rows):
+        length = rng.randint(8, 128)
+        flags = [rng.random() < 0.85 for _ in range(4)]
+        entropy = PasswordGenerator.calculate_entropy(length, *flags)
+        rows.append(PasswordEntry(
+            id=i, user_id=1, title=f"Entrada {i}", site="site.example.com", password=b"",
+            length=length, use_uppercase=flags[0], use_lowercase=flags[1],
+            use_digits=flags[2], use_special=flags[3], entropy=entropy,
+            expiration_date=None, created_at=None, updated_at=None,
+            entropy_level=PasswordGenerator.get_entropy_level(entropy),
+        ))
+
+    def legacy():
+        return [
+            legacy_level(legacy_entropy(e.length, e.use_uppercase, e.use_lowercase, e.use_digits, e.use_special))
+            for e in rows
+        ]
+
+    def table():
+        return [
+            PasswordGenerator.get_entropy_level(PasswordGenerator.calculate_entropy(
+                e.length, e.use_uppercase, e.use_lowercase, e.use_digits, e.use_special
+            ))
+            for e in rows
+        ]
+
+    def stored():
+        return [e.entropy_level for e in rows]
+
+    assert legacy() == table() == stored()
+    results = {
+        "listing_legacy_recompute": measure(legacy, args.iterations, ops_per_call=args.rows),
+        "listing_lookup_table": measure(table, args.iterations, ops_per_call=args.rows),
+        "listing_stored_level": measure(stored, args.iterations, ops_per_call=args.rows),
+    }
+
+    print_table(results)
+    base = results["listing_legacy_recompute"]["p50_ms"]
+    for name, item in results.items():
+        print(f"{name}: {base / item['p50_ms']:.1f}x em relação ao legado")
+    write_results(args.output, results, config=vars(args))
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark de throughput do PasswordGenerator
+
+Mede senhas por segundo para tamanhos de 16 a 128 caracteres com
+generate() (uma senha por chamada), generate_batch() e o caminho
+vetorizado com NumPy (quando instalado), comparando com a implementação
+anterior baseada em random.choice por caractere.
+
+Exemplo:
+    python benchmarks/bench_generator.py --batch-size 10000 --output gen.json
+"""
+import argparse
+import random
+import time
+
+from common import add_backend_to_path, write_results
+
+add_backend_to_path()
+
+from password_generator import PasswordGenerator  # noqa: E402
+import numpy_generator  # noqa: E402
+
+
+def legacy_generate(length: int) -> str:
+    """Implementação anterior (random.choice por caractere), só para referência"""
+    charset = (PasswordGenerator.UPPERCASE + PasswordGenerator.LOWERCASE
+               + PasswordGenerator.DIGITS + PasswordGenerator.SPECIAL)
+    chars = [
+        random.choice(PasswordGenerator.UPPERCASE),
+        random.choice(PasswordGenerator.LOWERCASE),
+        random.choice(PasswordGenerator.DIGITS),
+        random.choice(PasswordGenerator.SPECIAL),
+    ]
+    while len(chars) < length:
+        chars.append(random.choice(charset))
+    random.shuffle(chars)
+    return "".join(chars[:length])
+
+
+def passwords_per_second(func, total: int, repeat: int) -> float:
+    """Melhor throughput entre repeat execuções que geram total senhas"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return total / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput do gerador de senhas")
+    parser.add_argument("--lengths", default="16,32,64,128", help="tamanhos separados por vírgula")
+    parser.add_argument("--batch-size", type=int, default=10000, help="senhas por execução")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções por medição (usa a melhor)")
+    parser.add_argument("--output", default="bench_generator.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    n = args.batch_size
+    results = {}
+    print(f"{'Tamanho':>8} {'legado/s':>14} {'generate/s':>14} {'batch/s':>14} {'numpy/s':>14} {'ganho':>8}")
+    print("-" * 77)
+    for length in (int(value) for value in args.lengths.split(",")):
+        legacy = passwords_per_second(lambda: [legacy_generate(length) for _ in range(n)], n, args.repeat)
+        single = passwords_per_second(lambda: [PasswordGenerator.generate(length) for _ in range(n)], n, args.repeat)
+        batch = passwords_per_second(lambda: PasswordGenerator.generate_batch(n, length), n, args.repeat)
+        vectorized = None
+        if numpy_generator.NUMPY_AVAILABLE:
+            vectorized = passwords_per_second(lambda: numpy_generator.generate_batch(n, length), n, args.repeat)
+        results[f"length_{length}"] = {
+            "legacy_per_sec": round(legacy, 1),
+            "generate_per_sec": round(single, 1),
+            "generate_batch_per_sec": round(batch, 1),
+            "numpy_per_sec": round(vectorized, 1) if vectorized else None,
+        }
+        best = max(batch, vectorized or 0)
+        numpy_column = f"{vectorized:>14.0f}" if vectorized else f"{'n/d':>14}"
+        print(f"{length:>8} {legacy:>14.0f} {single:>14.0f} {batch:>14.0f} {numpy_column} {best / legacy:>7.1f}x")
+
+    write_results(args.output, results, config=vars(args))
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
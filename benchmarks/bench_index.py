@@ -0,0 +1,116 @@
+"""
+Benchmark dos índices do wallet local (local/password_manager.py)
+
+Em um vault de N entradas (100 mil por padrão), compara as buscas pelos
+índices por id e site com a varredura linear da lista de
+entradas (comportamento anterior), e mede get/update/delete e a
+deduplicação de um import.
+
+Exemplo:
+    python benchmarks/bench_index.py --entries 100000 --output index.json
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+from datetime import datetime
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from password_manager import JSONPasswordManager, PasswordEntry  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def make_entries(count: int, site_count: int):
+    now = datetime.now()
+    return [
+        PasswordEntry(
+            id=0, title=f"Entrada {i}", site=f"site{i % site_count}.example.com",
+            password=f"senha-{i:08d}", length=14, use_uppercase=False, use_lowercase=True,
+            use_digits=True, use_special=True, entropy=80.0, expiration_date=None,
+            created_at=now, updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def linear_get(entries, entry_id):
+    for entry in entries:
+        if entry.id == entry_id:
+            return entry
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos índices do wallet local")
+    parser.add_argument("--entries", type=int, default=100000, help="entradas no vault")
+    parser.add_argument("--sites", type=int, default=20000, help="sites distintos")
+    parser.add_argument("--iterations", type=int, default=2000, help="operações medidas")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_index.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="bench_index_")
+    # Sem compactação durante a medição
+    JSONPasswordManager.JOURNAL_COMPACT_BYTES = 1 << 62
+    try:
+        pm = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "passwords.json"), wallet_format="json")
+        pm.import_entries(make_entries(args.entries, args.sites), skip_duplicates=False)
+        entries = pm.get_all_passwords()
+        entry_ids = [entry.id for entry in entries]
+        random_id = lambda: rng.choice(entry_ids)  # noqa: E731
+        random_site = lambda: f"site{rng.randrange(args.sites)}.example.com"  # noqa: E731
+        linear_iterations = max(args.iterations // 20, 20)
+
+        def linear_find_site():
+            site = random_site()
+            return [entry for entry in entries if entry.site == site]
+
+        results = {
+            "get_by_id_linear_scan": measure(lambda: linear_get(entries, random_id()), linear_iterations),
+            "get_by_id_index": measure(lambda: pm.get_password(random_id()), args.iterations),
+            "find_by_site_linear_scan": measure(linear_find_site, linear_iterations),
+            "find_by_site_index": measure(lambda: pm.find_by_site(random_site()), args.iterations),
+            "update_title_index": measure(
+                lambda: pm.update_password(random_id(), title=f"Título {rng.random()}"), args.iterations
+            ),
+        }
+
+        deletable = iter(rng.sample(entry_ids, args.iterations))
+        results["delete_index"] = measure(lambda: pm.delete_password(next(deletable)), args.iterations - 1)
+
+        # Import de 1.000 entradas, metade já presente no vault
+        existing = pm.get_all_passwords()[:500]
+        batch = make_entries(500, args.sites)
+        for entry, original in zip(batch, existing):
+            entry.title, entry.site, entry.password = original.title, original.site, original.password
+        batch += make_entries(500, args.sites)
+        for i, entry in enumerate(batch[500:]):
+            entry.title = f"Nova {i}"
+
+        def dedup_only():
+            return sum(1 for entry in batch if pm.find_duplicate(entry) is not None)
+
+        results["find_duplicate_1000"] = measure(dedup_only, 20, ops_per_call=len(batch))
+        duplicates = dedup_only()
+        pm.close()
+
+        print_table(results)
+        for name in ("get_by_id", "find_by_site"):
+            ratio = results[f"{name}_linear_scan"]["p50_ms"] / results[f"{name}_index"]["p50_ms"]
+            print(f"{name}: {ratio:.0f}x mais rápido pelo índice ({args.entries} entradas)")
+        print(f"Import: {duplicates} de {len(batch)} entradas reconhecidas como duplicadas")
+        write_results(args.output, results, config=vars(args), extra={"import_duplicates": duplicates})
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
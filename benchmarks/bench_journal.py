@@ -0,0 +1,83 @@
+"""
+Benchmark do journal do wallet local (local/journal.py)
+
+Compara o custo de uma alteração em um vault de N entradas:
+- snapshot: regrava e recifra o vault inteiro (comportamento anterior de _save)
+- journal: um append cifrado do tamanho da entrada
+
+e mede a abertura do wallet com um journal de K registros a reaplicar.
+
+Exemplo:
+    python benchmarks/bench_journal.py --entries 5000 --output journal.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from password_manager import JSONPasswordManager  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do journal do wallet local")
+    parser.add_argument("--entries", type=int, default=5000, help="entradas no vault")
+    parser.add_argument("--journal-records", type=int, default=1000, help="registros no journal ao abrir")
+    parser.add_argument("--iterations", type=int, default=50, help="alterações medidas")
+    parser.add_argument("--output", default="bench_journal.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_journal_")
+    path = os.path.join(workdir, "passwords.json")
+    # Sem compactação durante a medição
+    JSONPasswordManager.JOURNAL_COMPACT_BYTES = 1 << 62
+    try:
+        pm = JSONPasswordManager(MASTER_PASSWORD, path)
+        template = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "template.json"))
+        for i in range(args.entries):
+            template.create_password(f"Entrada {i}", f"site{i}.example.com", length=20)
+        pm.import_entries(template.get_all_passwords())
+        counter = iter(range(10 ** 9))
+
+        results = {
+            "mutation_full_snapshot": measure(pm.compact, max(args.iterations // 5, 3)),
+            "mutation_journal_append": measure(
+                lambda: pm.update_password(1, title=f"Título {next(counter)}"), args.iterations
+            ),
+            "create_journal_append": measure(
+                lambda: pm.create_password("Nova", "nova.example.com"), args.iterations
+            ),
+        }
+
+        pm.compact()
+        for i in range(args.journal_records):
+            pm.update_password(1 + i % args.entries, title=f"Título {i}")
+        journal_bytes = os.path.getsize(path + ".journal")
+
+        def open_wallet():
+            opened = JSONPasswordManager(MASTER_PASSWORD, path)
+            opened.close()
+
+        results["open_with_journal_replay"] = measure(open_wallet, 3)
+        pm.compact()
+        results["open_snapshot_only"] = measure(open_wallet, 3)
+        pm.close()
+        template.close()
+
+        print_table(results)
+        ratio = results["mutation_full_snapshot"]["p50_ms"] / results["mutation_journal_append"]["p50_ms"]
+        print(f"\nAlteração: {ratio:.0f}x mais rápida com o journal ({args.entries} entradas)")
+        write_results(args.output, results, config=vars(args), extra={"journal_bytes": journal_bytes})
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
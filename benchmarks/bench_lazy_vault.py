@@ -0,0 +1,86 @@
+"""
+Benchmark da decifragem sob demanda do wallet local (formato records)
+
+Compara os dois formatos do arquivo local (local/password_manager.py):
+- json: um único blob com todas as entradas, senhas incluídas
+- records: metadados em um blob e cada senha em um registro próprio
+
+Mede o tempo até a primeira listagem (abrir o wallet e listar títulos),
+a leitura de uma senha e quantas senhas ficam em texto claro na memória
+depois de listar.
+
+Exemplo:
+    python benchmarks/bench_lazy_vault.py --entries 5000 --output lazy_vault.json
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from password_manager import JSONPasswordManager, WALLET_FORMATS  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do formato records do wallet local")
+    parser.add_argument("--entries", type=int, default=5000, help="entradas no wallet")
+    parser.add_argument("--iterations", type=int, default=5, help="aberturas medidas")
+    parser.add_argument("--output", default="bench_lazy_vault.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_lazy_vault_")
+    try:
+        template = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "template.json"))
+        for i in range(args.entries):
+            template.create_password(f"Entrada {i}", f"site{i}.example.com", length=20)
+
+        results = {}
+        resident = {}
+        file_sizes = {}
+        for wallet_format in WALLET_FORMATS:
+            path = os.path.join(workdir, f"{wallet_format}.json")
+            pm = JSONPasswordManager(MASTER_PASSWORD, path, wallet_format=wallet_format)
+            pm.import_entries(template.get_all_passwords())
+            pm.close()
+            file_sizes[wallet_format] = os.path.getsize(path)
+
+            def first_list():
+                opened = JSONPasswordManager(MASTER_PASSWORD, path)
+                titles = [entry.title for entry in opened.get_all_passwords()]
+                opened.close()
+                return titles
+
+            results[f"open_and_list_{wallet_format}"] = measure(first_list, args.iterations)
+
+            pm = JSONPasswordManager(MASTER_PASSWORD, path)
+            resident[wallet_format] = sum(1 for entry in pm.entries if entry._password is not None)
+            entry_ids = [entry.id for entry in pm.entries]
+            counter = iter(range(10 ** 9))
+            results[f"get_password_{wallet_format}"] = measure(
+                lambda: pm.get_password(entry_ids[next(counter) % len(entry_ids)]), 1000
+            )
+            pm.close()
+        template.close()
+
+        print_table(results)
+        ratio = results["open_and_list_json"]["p50_ms"] / results["open_and_list_records"]["p50_ms"]
+        print(f"\nPrimeira listagem: {ratio:.2f}x em relação ao formato json ({args.entries} entradas)")
+        for wallet_format, count in resident.items():
+            print(f"{wallet_format}: {count} senhas em texto claro depois de abrir")
+        write_results(
+            args.output, results, config=vars(args),
+            extra={"resident_plaintext": resident, "file_bytes": file_sizes},
+        )
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
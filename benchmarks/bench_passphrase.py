@@ -0,0 +1,137 @@
+"""
+Benchmark da wordlist de passphrases
+
+Compara o cold start (processo novo abrindo a wordlist e sorteando uma
+passphrase) da wordlist binária mapeada em memória com a leitura da lista
+texto para uma lista Python, e mede o throughput de generate_passphrase.
+
+Sem --source, gera uma lista sintética com --words palavras.
+
+Exemplo:
+    python benchmarks/bench_passphrase.py --words 1000000 --output passphrase.json
+    python benchmarks/bench_passphrase.py --source eff_large_wordlist.txt
+"""
+import argparse
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+
+from common import BACKEND_DIR, add_backend_to_path, measure, print_table, write_results
+
+add_backend_to_path()
+
+from passphrase import Wordlist, build_wordlist  # noqa: E402
+from password_generator import PasswordGenerator  # noqa: E402
+
+
+# Pico de RSS do processo atual em KB (VmHWM; ru_maxrss é herdado através do exec)
+PEAK_RSS = """
+def peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+    except (OSError, StopIteration):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+"""
+
+# Executados em um processo novo; imprimem (segundos, pico de RSS em KB)
+COLD_START_MMAP = PEAK_RSS + """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, {backend!r})
+from passphrase import Wordlist
+from password_generator import PasswordGenerator
+PasswordGenerator.generate_passphrase(6, wordlist=Wordlist({path!r}))
+print(time.perf_counter() - started, peak_rss())
+"""
+
+COLD_START_TEXT = PEAK_RSS + """
+import secrets, time
+started = time.perf_counter()
+with open({path!r}, encoding="utf-8") as f:
+    words = [line.split()[-1] for line in f if line.strip()]
+"-".join(secrets.choice(words) for _ in range(6))
+print(time.perf_counter() - started, peak_rss())
+"""
+
+
+def synthetic_wordlist(path: str, count: int, seed: int):
+    """Grava count palavras únicas (uma por linha)"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(words)))
+
+
+def cold_start(script: str, runs: int) -> dict:
+    """Executa o script em processos novos e resume tempo e memória"""
+    samples, rss = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, check=True
+        ).stdout.split()
+        samples.append(float(output[0]))
+        rss.append(int(output[1]))
+    ordered = sorted(samples)
+    return {
+        "ops_per_sec": round(runs / sum(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[int((len(ordered) - 1) * 0.95)] * 1000, 3),
+        "p99_ms": round(ordered[-1] * 1000, 3),
+        "max_rss_kb": max(rss),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da wordlist de passphrases")
+    parser.add_argument("--source", help="lista texto (uma palavra por linha ou formato EFF)")
+    parser.add_argument("--words", type=int, default=1000000, help="tamanho da lista sintética")
+    parser.add_argument("--runs", type=int, default=5, help="processos por medição de cold start")
+    parser.add_argument("--iterations", type=int, default=2000, help="passphrases na medição de throughput")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="bench_passphrase.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_passphrase_")
+    source = args.source
+    if not source:
+        source = os.path.join(workdir, "words.txt")
+        synthetic_wordlist(source, args.words, args.seed)
+    binary = os.path.join(workdir, "wordlist.bin")
+    with open(source, "r", encoding="utf-8") as f:
+        count = build_wordlist(f, binary)
+    print(f"{count} palavras; texto {os.path.getsize(source)} bytes, binário {os.path.getsize(binary)} bytes")
+
+    results = {
+        "cold_start_mmap": cold_start(COLD_START_MMAP.format(backend=BACKEND_DIR, path=binary), args.runs),
+        "cold_start_text_list": cold_start(COLD_START_TEXT.format(path=source), args.runs),
+    }
+    with Wordlist(binary) as wordlist:
+        results["generate_passphrase_6_words"] = measure(
+            lambda: PasswordGenerator.generate_passphrase(6, wordlist=wordlist), args.iterations
+        )
+        results["generate_passphrase_random_case_digit"] = measure(
+            lambda: PasswordGenerator.generate_passphrase(
+                6, capitalization="random", include_digit=True, wordlist=wordlist
+            ),
+            args.iterations
+        )
+        entropy = PasswordGenerator.calculate_passphrase_entropy(6, len(wordlist))
+
+    print_table(results)
+    for name in ("cold_start_mmap", "cold_start_text_list"):
+        print(f"{name}: pico de RSS {results[name]['max_rss_kb']} KB")
+    print(f"Entropia (6 palavras, minúsculas): {entropy} bits")
+
+    write_results(args.output, results, config=vars(args), extra={"wordlist_size": count})
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark do gerador por política (password_policy.py)
+
+Mede o throughput de CompiledPolicy.generate_batch() para políticas
+típicas e, como referência, o custo de atender as mesmas regras por
+tentativa e erro (gerar com PasswordGenerator e descartar até passar no
+verificador).
+
+Exemplo:
+    python benchmarks/bench_policy.py --batch 1000 --output policy.json
+"""
+import argparse
+
+from common import add_backend_to_path, measure, print_table, write_results
+
+add_backend_to_path()
+
+from password_generator import PasswordGenerator  # noqa: E402
+from password_policy import PasswordPolicy, compile_policy  # noqa: E402
+
+
+POLICIES = {
+    "default_16": PasswordPolicy(),
+    "banco_8_sem_especiais": PasswordPolicy(length=8, use_special=False, min_digits=2),
+    "estrita_20": PasswordPolicy(
+        length=20, min_uppercase=3, min_digits=3, min_special=3,
+        banned_chars="0O1lI|", no_repeats=True
+    ),
+    "pronunciavel_14": PasswordPolicy(length=14, pronounceable=True, min_digits=2),
+    "pin_6": PasswordPolicy(length=6, use_uppercase=False, use_lowercase=False, use_special=False),
+}
+
+
+def trial_and_error(policy: PasswordPolicy, count: int):
+    """Gera com as opções simples e descarta até passar na política"""
+    compiled = compile_policy(policy)
+    passwords = []
+    attempts = 0
+    while len(passwords) < count:
+        for candidate in PasswordGenerator.generate_batch(count, policy.length, *policy.flags(), reject_breached=False):
+            attempts += 1
+            if compiled.check(candidate) and len(passwords) < count:
+                passwords.append(candidate)
+    return attempts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do gerador por política")
+    parser.add_argument("--batch", type=int, default=1000, help="senhas por chamada")
+    parser.add_argument("--iterations", type=int, default=30, help="lotes medidos por política")
+    parser.add_argument("--output", default="bench_policy.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    results = {}
+    attempts = {}
+    for name, policy in POLICIES.items():
+        compiled = compile_policy(policy)
+        assert all(compiled.check(p) for p in compiled.generate_batch(args.batch, reject_breached=False))
+        results[f"policy_{name}"] = measure(
+            lambda: compiled.generate_batch(args.batch, reject_breached=False),
+            args.iterations, ops_per_call=args.batch
+        )
+        if not policy.pronounceable:
+            results[f"trial_and_error_{name}"] = measure(
+                lambda: trial_and_error(policy, args.batch), max(args.iterations // 3, 3), ops_per_call=args.batch
+            )
+            attempts[name] = round(trial_and_error(policy, args.batch) / args.batch, 2)
+
+    results["compile_policy_uncached"] = measure(
+        lambda: compile_policy.__wrapped__(POLICIES["estrita_20"]), args.iterations * 10
+    )
+
+    print_table(results)
+    for name, ratio in attempts.items():
+        print(f"{name}: {ratio} candidatas por senha aceita na tentativa e erro")
+    write_results(args.output, results, config=vars(args), extra={"trial_and_error_attempts": attempts})
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark do estimador de força (strength.py)
+
+Mede a latência por senha de estimate() em senhas típicas (palavras de
+dicionário, l33t, datas, caminhos no teclado, aleatórias) e o throughput de
+estimate_batch() em um vault sintético.
+
+Exemplo:
+    python benchmarks/bench_strength.py --dictionary backend/strength_dict.bin --output strength.json
+"""
+import argparse
+import random
+
+from common import add_backend_to_path, measure, print_table, write_results
+
+add_backend_to_path()
+
+import strength  # noqa: E402
+from password_generator import PasswordGenerator  # noqa: E402
+
+
+SAMPLES = {
+    "dictionary": "password",
+    "l33t_capitalized": "P@ssw0rd2019",
+    "date": "13/05/1990",
+    "keyboard_walk": "1qaz2wsx3edc",
+    "passphrase": "correcthorsebatterystaple",
+    "random_16": "x9$Kq!vB2#Lm_7Pz",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do estimador de força")
+    parser.add_argument("--dictionary", help="dicionário gerado por strength.py build (padrão: o configurado)")
+    parser.add_argument("--iterations", type=int, default=2000, help="estimativas por senha")
+    parser.add_argument("--vault-size", type=int, default=1000, help="senhas no vault sintético")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default="bench_strength.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    if args.dictionary:
+        strength.DEFAULT_DICTIONARY = args.dictionary
+    strength.estimate("")  # carrega o dicionário fora da medição
+
+    results = {}
+    for name, password in SAMPLES.items():
+        results[f"estimate_{name}"] = measure(lambda: strength.estimate(password), args.iterations)
+
+    rng = random.Random(args.seed)
+    vault = [
+        rng.choice(list(SAMPLES.values())) + str(rng.randrange(100)) if rng.random() < 0.5
+        else PasswordGenerator.generate(rng.choice((12, 16, 20)))
+        for _ in range(args.vault_size)
+    ]
+    results["estimate_batch_vault"] = measure(
+        lambda: strength.estimate_batch(vault), max(args.iterations // 200, 3), ops_per_call=len(vault)
+    )
+
+    print_table(results)
+    write_results(args.output, results, config=vars(args))
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Benchmark do pico de memória ao abrir o wallet local (local/wallet_reader.py)
+
+Para um wallet de N entradas em cada formato (json, records e binary),
+com e sem compressão, abre o arquivo em um processo novo e mede o pico
+de RSS acima do processo já com os módulos carregados e, em outro
+processo com tracemalloc, a memória transitória da leitura (pico menos o
+que continua alocado depois, ou seja, as próprias entradas):
+- legado: json.load do arquivo, b64decode do blob inteiro, decifragem em
+  outra cópia e json.loads do payload, como era antes do mmap
+- mapeado: o caminho atual, com o arquivo mapeado, base64 e AES-GCM por
+  partes e as entradas montadas enquanto o payload é lido
+- wallet: JSONPasswordManager completo (índices e journal incluídos; os
+  índices, descartados com o gerenciador, contam como transitórios)
+
+Os dois primeiros montam as mesmas entradas, então a diferença é só o
+que o caminho de leitura segura na memória; a transitória deve ser
+comparada ao tamanho do texto claro. O pico de RSS vem de VmHWM em /proc
+no Linux (o ru_maxrss do filho herda o pico do processo pai) e do módulo
+resource nos demais sistemas Unix.
+
+Exemplo:
+    python benchmarks/bench_wallet_memory.py --entries 100000 --output wallet_memory.json
+"""
+import argparse
+import base64
+import gc
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import add_local_to_path, write_results
+
+add_local_to_path()
+
+import wallet_codec  # noqa: E402
+import wallet_compression  # noqa: E402
+import wallet_reader  # noqa: E402
+from encryption import EncryptionManager  # noqa: E402
+from password_manager import METADATA_KEY, JSONPasswordManager, PasswordEntry  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+MODES = ("legacy", "mapped", "wallet")
+
+
+def legacy_open(path: str) -> list:
+    """Leitura como era antes do mmap, só para referência"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    meta = data["meta"]
+    encryption_manager = EncryptionManager(MASTER_PASSWORD, salt=meta["encryption"]["salt"])
+    compression = meta["serialization"].get("compression")
+    file_format = JSONPasswordManager._file_format(meta)
+    if file_format == "records":
+        payload = encryption_manager.unseal(
+            METADATA_KEY, base64.b64decode(data["data"]["metadata_encrypted"]),
+            aad=METADATA_KEY.encode("utf-8"),
+        )
+    else:
+        payload = encryption_manager.decrypt_bytes(base64.b64decode(data["data"]["entries_encrypted"]))
+    payload = wallet_compression.decompress(payload, compression)
+    if file_format == "binary":
+        return wallet_codec.decode_entries(payload, PasswordEntry)
+
+    entries_list = json.loads(payload)["entries"]
+    for entry_data in entries_list:
+        if file_format == "records":
+            entry_data["secret"] = data["data"]["passwords_encrypted"][str(entry_data["id"])]
+    return [JSONPasswordManager._entry_from_dict(entry_data) for entry_data in entries_list]
+
+
+def mapped_open(path: str) -> list:
+    """Mesmas etapas de _load_or_create, sem índices nem journal"""
+    with wallet_reader.open_wallet(path) as data:
+        meta = data["meta"]
+        encryption_manager = EncryptionManager(MASTER_PASSWORD, salt=meta["encryption"]["salt"])
+        compression = meta["serialization"].get("compression")
+        file_format = JSONPasswordManager._file_format(meta)
+        if file_format == "records":
+            return list(JSONPasswordManager._open_records(
+                encryption_manager, data["data"], compression=compression
+            ))
+        payload = encryption_manager.decrypt_stream(data["data"]["entries_encrypted"])
+        return list(JSONPasswordManager._payload_entries(payload, file_format, compression))
+
+
+def wallet_open(path: str) -> list:
+    pm = JSONPasswordManager(MASTER_PASSWORD, path)
+    entries = pm.get_all_passwords()
+    pm.close()
+    return entries
+
+
+def peak_rss_kib() -> int:
+    """Pico de RSS do processo (KiB)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes no macOS
+
+
+def child(mode: str, path: str, traced: bool):
+    """
+    Abre o wallet uma vez e imprime o pico de RSS acima do processo
+    carregado ou, com traced, o pico e o que sobrou alocado pelo tracemalloc (KiB)
+    """
+    opener = {"legacy": legacy_open, "mapped": mapped_open, "wallet": wallet_open}[mode]
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+        entries = opener(path)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        print(json.dumps({"entries": len(entries), "transient_kib": (peak - retained) // 1024}))
+        return
+
+    baseline = peak_rss_kib()
+    start = time.perf_counter()
+    entries = opener(path)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_kib()
+    print(json.dumps({"entries": len(entries), "peak_kib": peak - baseline, "seconds": elapsed}))
+
+
+def run_child(mode: str, path: str, traced: bool = False) -> dict:
+    command = [sys.executable, os.path.abspath(__file__), "--child", mode, path]
+    if traced:
+        command.append("--traced")
+    output = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output)
+
+
+def plaintext_size(path: str) -> int:
+    with wallet_reader.open_wallet(path) as data:
+        meta = data["meta"]
+        encryption_manager = EncryptionManager(MASTER_PASSWORD, salt=meta["encryption"]["salt"])
+        if JSONPasswordManager._file_format(meta) == "records":
+            payload = encryption_manager.unseal_stream(
+                METADATA_KEY, data["data"]["metadata_encrypted"], aad=METADATA_KEY.encode("utf-8")
+            )
+        else:
+            payload = encryption_manager.decrypt_stream(data["data"]["entries_encrypted"])
+    return sum(len(chunk) for chunk in wallet_compression.decompress_chunks(
+        payload, meta["serialization"].get("compression")
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pico de memória ao abrir o wallet local")
+    parser.add_argument("--entries", type=int, default=100000, help="entradas no wallet")
+    parser.add_argument("--repeat", type=int, default=3, help="aberturas (processos) por caso; vale o menor pico")
+    parser.add_argument("--formats", default="json,records,binary", help="formatos do wallet")
+    parser.add_argument("--output", default="bench_wallet_memory.json", help="arquivo JSON de resultados")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument("--traced", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.traced)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="bench_wallet_memory_")
+    try:
+        template = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "template.json"))
+        with template.batch():
+            for i in range(args.entries):
+                template.create_password(f"Entrada {i}", f"site{i % 500}.example.com", length=20)
+        entries = template.get_all_passwords()
+
+        results = {}
+        print("MiB; pico de RSS / memória transitória da leitura")
+        print(f"{'caso':<16} {'arquivo':>8} {'texto claro':>12} " + " ".join(f"{mode:>15}" for mode in MODES))
+        for wallet_format in args.formats.split(","):
+            for compression in (None, "zlib"):
+                name = f"{wallet_format}_{compression or 'none'}"
+                path = os.path.join(workdir, f"{name}.json")
+                pm = JSONPasswordManager(MASTER_PASSWORD, path, wallet_format=wallet_format, compression=compression)
+                pm.import_entries(entries, skip_duplicates=False)
+                pm.compact()
+                pm.close()
+
+                case = {"file_bytes": os.path.getsize(path), "plaintext_bytes": plaintext_size(path)}
+                for mode in MODES:
+                    runs = [run_child(mode, path) for _ in range(args.repeat)]
+                    case[mode] = min(runs, key=lambda run: run["peak_kib"])
+                    case[mode]["transient_kib"] = run_child(mode, path, traced=True)["transient_kib"]
+                results[name] = case
+                print(f"{name:<16} {case['file_bytes'] / 2 ** 20:>8.1f} {case['plaintext_bytes'] / 2 ** 20:>12.1f} "
+                      + " ".join(f"{case[mode]['peak_kib'] / 1024:>7.1f} / {case[mode]['transient_kib'] / 1024:>5.1f}"
+                                 for mode in MODES))
+        template.close()
+
+        write_results(args.output, {}, config=vars(args), extra={"cases": results})
+        print(f"\nResultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
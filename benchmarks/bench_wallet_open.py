@@ -0,0 +1,97 @@
+"""
+Benchmark de abertura do wallet local (local/password_manager.py)
+
+Mede a latência de abrir um wallet com N entradas:
+- legado: PBKDF2 no __init__ do EncryptionManager e de novo no decrypt
+- atual: chave derivada uma vez e reaproveitada pelo cache de chaves
+- import: import_from_json do mesmo arquivo, com e sem o gerenciador aberto
+
+Exemplo:
+    python benchmarks/bench_wallet_open.py --entries 500 --output wallet_open.json
+"""
+import argparse
+import base64
+import json
+import os
+import shutil
+import tempfile
+
+from common import add_local_to_path, measure, print_table, write_results
+
+add_local_to_path()
+
+from Crypto.Cipher import AES  # noqa: E402
+from Crypto.Hash import SHA256  # noqa: E402
+from Crypto.Protocol.KDF import PBKDF2  # noqa: E402
+from encryption import EncryptionManager  # noqa: E402
+from password_manager import JSONPasswordManager  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+
+
+def legacy_open(path: str) -> int:
+    """Abertura como era antes do cache, só para referência (dois PBKDF2)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    salt = base64.b64decode(data["meta"]["encryption"]["salt"])
+    blob = base64.b64decode(data["data"]["entries_encrypted"])
+
+    def derive(salt_bytes):
+        return PBKDF2(MASTER_PASSWORD.encode(), salt_bytes, dkLen=32,
+                      count=EncryptionManager.KDF_ITERATIONS, hmac_hash_module=SHA256)
+
+    derive(salt)  # EncryptionManager.__init__
+    key = derive(blob[:16])  # EncryptionManager.decrypt
+    nonce, tag, ciphertext = blob[16:28], blob[28:44], blob[44:]
+    plaintext = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=16).decrypt_and_verify(ciphertext, tag)
+    return len(json.loads(plaintext)["entries"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de abertura do wallet local")
+    parser.add_argument("--entries", type=int, default=500, help="entradas no wallet")
+    parser.add_argument("--iterations", type=int, default=5, help="aberturas medidas")
+    parser.add_argument("--output", default="bench_wallet_open.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_wallet_open_")
+    path = os.path.join(workdir, "passwords.json")
+    try:
+        pm = JSONPasswordManager(MASTER_PASSWORD, path)
+        template = JSONPasswordManager(MASTER_PASSWORD, os.path.join(workdir, "template.json"))
+        for i in range(args.entries):
+            template.create_password(f"Entrada {i}", f"site{i}.example.com", length=20)
+        pm.import_entries(template.get_all_passwords())
+
+        def open_wallet():
+            opened = JSONPasswordManager(MASTER_PASSWORD, path)
+            opened.close()
+            return opened
+
+        results = {
+            "open_wallet_legacy_double_kdf": measure(lambda: legacy_open(path), args.iterations),
+            "open_wallet_cached_key": measure(open_wallet, args.iterations),
+            "import_from_json_new_manager": measure(
+                lambda: JSONPasswordManager.import_from_json(path, MASTER_PASSWORD), args.iterations
+            ),
+            "import_from_json_open_manager": measure(
+                lambda: JSONPasswordManager.import_from_json(path, MASTER_PASSWORD, pm.encryption_manager),
+                args.iterations
+            ),
+            "save_wallet": measure(pm._save, args.iterations),
+        }
+        pm.close()
+        template.close()
+
+        print_table(results)
+        base = results["open_wallet_legacy_double_kdf"]["p50_ms"]
+        print(f"\nAbertura: {base / results['open_wallet_cached_key']['p50_ms']:.2f}x em relação ao legado")
+        write_results(args.output, results, config=vars(args))
+        print(f"Resultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Equivalente em Python das funções de frontend/js/crypto.js
+
+Gera blobs no mesmo formato do navegador para que os payloads usados em
+carga sejam realistas:
+- encryptWithMasterPassword: base64(salt[16] | nonce[12] | tag[16] | ciphertext)
+- encryptPayloadWithWalletPassword: base64(ciphertext | tag) + salt/nonce separados
+
+A derivação é PBKDF2-HMAC-SHA256 (como o WebCrypto) via hashlib, que
+libera o GIL e pode rodar em thread sem travar o event loop.
+"""
+import base64
+import hashlib
+import os
+from typing import Dict
+
+from Crypto.Cipher import AES
+
+
+SALT_SIZE = 16
+NONCE_SIZE = 12
+TAG_SIZE = 16
+KEY_SIZE = 32
+DEFAULT_ITERATIONS = 300000
+
+
+def derive_aes_key(master_password: str, salt: bytes, iterations: int = DEFAULT_ITERATIONS) -> bytes:
+    """Mesmo resultado de deriveAesKey() do frontend"""
+    return hashlib.pbkdf2_hmac("sha256", master_password.encode("utf-8"), salt, iterations, KEY_SIZE)
+
+
+def encrypt_with_key(plaintext: str, key: bytes, salt: bytes) -> str:
+    """Cifra com uma chave já derivada no formato de encryptWithMasterPassword"""
+    nonce = os.urandom(NONCE_SIZE)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+    ciphertext, tag = cipher.encrypt_and_digest(plaintext.encode("utf-8"))
+    return base64.b64encode(salt + nonce + tag + ciphertext).decode("utf-8")
+
+
+def encrypt_with_master_password(plaintext: str, master_password: str, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """Equivalente a encryptWithMasterPassword (salt novo a cada chamada)"""
+    salt = os.urandom(SALT_SIZE)
+    return encrypt_with_key(plaintext, derive_aes_key(master_password, salt, iterations), salt)
+
+
+def decrypt_with_master_password(blob_b64: str, master_password: str, iterations: int = DEFAULT_ITERATIONS) -> str:
+    """Equivalente a decryptWithMasterPassword"""
+    blob = base64.b64decode(blob_b64)
+    salt = blob[:SALT_SIZE]
+    nonce = blob[SALT_SIZE:SALT_SIZE + NONCE_SIZE]
+    tag = blob[SALT_SIZE + NONCE_SIZE:SALT_SIZE + NONCE_SIZE + TAG_SIZE]
+    ciphertext = blob[SALT_SIZE + NONCE_SIZE + TAG_SIZE:]
+    key = derive_aes_key(master_password, salt, iterations)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+    return cipher.decrypt_and_verify(ciphertext, tag).decode("utf-8")
+
+
+def encrypt_payload_with_wallet_password(
+    plaintext_json: str, wallet_password: str, iterations: int = DEFAULT_ITERATIONS
+) -> Dict[str, object]:
+    """Equivalente a encryptPayloadWithWalletPassword (WebCrypto devolve ciphertext | tag)"""
+    salt = os.urandom(SALT_SIZE)
+    nonce = os.urandom(NONCE_SIZE)
+    key = derive_aes_key(wallet_password, salt, iterations)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+    ciphertext, tag = cipher.encrypt_and_digest(plaintext_json.encode("utf-8"))
+    return {
+        "ciphertext_b64": base64.b64encode(ciphertext + tag).decode("utf-8"),
+        "salt_b64": base64.b64encode(salt).decode("utf-8"),
+        "nonce_b64": base64.b64encode(nonce).decode("utf-8"),
+        "kdf_iterations": iterations,
+    }
+
+
+class SessionCrypto:
+    """
+    Cifrador de um usuário virtual
+
+    O navegador deriva a chave a cada blob (salt novo). Para que o gerador
+    de carga não gaste a CPU dele em PBKDF2, cada usuário virtual deriva
+    uma chave por salt e a reutiliza; o formato do blob é idêntico.
+    """
+
+    def __init__(self, master_password: str, iterations: int = DEFAULT_ITERATIONS):
+        self.master_password = master_password
+        self.iterations = iterations
+        self.salt = os.urandom(SALT_SIZE)
+        self.key = b""
+        self._keys: Dict[bytes, bytes] = {}
+
+    def prepare(self):
+        """Deriva a chave da sessão (chamar via asyncio.to_thread)"""
+        self.key = derive_aes_key(self.master_password, self.salt, self.iterations)
+        self._keys[self.salt] = self.key
+
+    def encrypt(self, plaintext: str) -> str:
+        return encrypt_with_key(plaintext, self.key, self.salt)
+
+    def decrypt(self, blob_b64: str) -> str:
+        blob = base64.b64decode(blob_b64)
+        salt, rest = blob[:SALT_SIZE], blob[SALT_SIZE:]
+        key = self._keys.get(salt)
+        if key is None:
+            key = self._keys[salt] = derive_aes_key(self.master_password, salt, self.iterations)
+        nonce, tag, ciphertext = rest[:NONCE_SIZE], rest[NONCE_SIZE:NONCE_SIZE + TAG_SIZE], rest[NONCE_SIZE + TAG_SIZE:]
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+        return cipher.decrypt_and_verify(ciphertext, tag).decode("utf-8")
+
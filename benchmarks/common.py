@@ -0,0 +1,153 @@
+"""
+Utilitários compartilhados pelos benchmarks: medição, percentis,
+gravação dos resultados em JSON e comparação com uma execução anterior
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+LOCAL_DIR = os.path.join(ROOT_DIR, "local")
+
+
+def add_backend_to_path():
+    """Permite importar os módulos do backend (que usam imports planos)"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+def add_local_to_path():
+    """Permite importar os módulos da versão local"""
+    if LOCAL_DIR not in sys.path:
+        sys.path.insert(0, LOCAL_DIR)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil por interpolação linear de uma lista já ordenada"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def summarize(samples: List[float], ops_per_sample: int = 1) -> Dict[str, float]:
+    """
+    Resume uma lista de durações (segundos)
+
+    Args:
+        samples: Duração de cada amostra
+        ops_per_sample: Operações feitas em cada amostra (para throughput)
+
+    Returns:
+        Dicionário com throughput (ops/s) e latências em milissegundos
+    """
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "samples": len(ordered),
+        "ops_per_sec": round(len(ordered) * ops_per_sample / total, 3) if total else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 4),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 4),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 4),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def measure(
+    func: Callable[[], object],
+    iterations: int,
+    warmup: int = 1,
+    ops_per_call: int = 1,
+) -> Dict[str, float]:
+    """
+    Executa func várias vezes e resume as durações
+
+    Args:
+        func: Função sem argumentos a medir
+        iterations: Número de execuções medidas
+        warmup: Execuções descartadas antes da medição
+        ops_per_call: Operações feitas por chamada (para throughput)
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples, ops_per_call)
+
+
+def write_results(
+    path: str,
+    results: Dict[str, dict],
+    config: Optional[dict] = None,
+    extra: Optional[dict] = None,
+):
+    """Grava os resultados com metadados da execução (extra: seções adicionais)"""
+    document = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config or {},
+        },
+        "results": results,
+    }
+    document.update(extra or {})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False, indent=2)
+
+
+def compare_results(
+    baseline_path: str,
+    results: Dict[str, dict],
+    max_regression: float,
+    metric: str = "p50_ms",
+) -> List[str]:
+    """
+    Compara com uma execução anterior
+
+    Args:
+        baseline_path: JSON gravado por write_results
+        results: Resultados atuais
+        max_regression: Piora relativa tolerada (0.2 = 20%)
+        metric: Métrica de latência usada na comparação
+
+    Returns:
+        Lista de mensagens descrevendo as regressões (vazia se nenhuma)
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous.get(metric):
+            continue
+        change = (current[metric] - previous[metric]) / previous[metric]
+        if change > max_regression:
+            regressions.append(
+                f"{name}: {metric} {previous[metric]:.3f} -> {current[metric]:.3f} (+{change * 100:.1f}%)"
+            )
+    return regressions
+
+
+def print_table(results: Dict[str, dict]):
+    """Imprime os resultados em formato de tabela"""
+    print(f"\n{'Benchmark':<36} {'ops/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+    print("-" * 82)
+    for name, stats in results.items():
+        print(f"{name:<36} {stats['ops_per_sec']:>12.1f} {stats['p50_ms']:>10.3f} "
+              f"{stats['p95_ms']:>10.3f} {stats['p99_ms']:>10.3f}")
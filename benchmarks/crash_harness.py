@@ -0,0 +1,247 @@
+"""
+Harness de injeção de falhas do wallet local (local/atomic_io.py e journal)
+
+Roda um processo filho que altera o wallet sem parar (criações,
+atualizações, remoções e batches, com compactação frequente) e o mata
+em pontos aleatórios:
+- kill: SIGKILL do processo pai depois de um intervalo aleatório
+- inject: o próprio filho sai com os._exit na N-ésima operação de disco
+  (write, fsync ou rename), gravando só parte dos dados quando é um write
+
+Depois de cada queda o pai reabre o wallet e verifica que ele abre, que
+todas as senhas decifram e que o conteúdo é o de todas as alterações
+confirmadas (mais, no máximo, a alteração que estava em andamento).
+
+Exemplo:
+    python benchmarks/crash_harness.py --trials 100 --output crash.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import add_local_to_path, write_results
+
+add_local_to_path()
+
+import atomic_io  # noqa: E402
+from password_manager import JSONPasswordManager  # noqa: E402
+
+
+MASTER_PASSWORD = "senha-mestra-benchmark"
+CRASH_EXIT_CODE = 137
+
+
+class _CrashPoints:
+    """Conta as operações de disco do filho e sai na escolhida"""
+
+    def __init__(self, crash_at: int, rng: random.Random):
+        self.crash_at = crash_at
+        self.rng = rng
+        self.count = 0
+
+    def hit(self) -> bool:
+        self.count += 1
+        return self.count == self.crash_at
+
+    def crash(self):
+        sys.stdout.flush()
+        os._exit(CRASH_EXIT_CODE)
+
+    def install(self):
+        real_fsync, real_replace = os.fsync, os.replace
+        real_write, real_append = atomic_io.atomic_write, atomic_io.append
+
+        def fsync(fd):
+            if self.hit():
+                self.crash()
+            real_fsync(fd)
+
+        def replace(src, dst):
+            if self.hit():
+                self.crash()
+            real_replace(src, dst)
+
+        def atomic_write(path, data, durable=atomic_io.DURABLE):
+            if self.hit():
+                if isinstance(data, str):
+                    data = data.encode("utf-8")
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data[:self.rng.randrange(len(data) + 1)])
+                self.crash()
+            real_write(path, data, durable)
+
+        def append(path, data, durable=atomic_io.DURABLE):
+            if self.hit():
+                with open(path, "ab") as f:
+                    f.write(data[:self.rng.randrange(len(data) + 1)])
+                self.crash()
+            real_append(path, data, durable)
+
+        os.fsync, os.replace = fsync, replace
+        atomic_io.atomic_write, atomic_io.append = atomic_write, append
+
+
+def random_ops(pm: JSONPasswordManager, rng: random.Random, next_id: int):
+    """Sorteia uma alteração (ou um batch delas) sobre o estado atual"""
+    ids = list(pm._entries)
+    ops = []
+    for _ in range(rng.choice((1, 1, 1, 1, rng.randint(2, 20)))):
+        roll = rng.random()
+        if roll < 0.55 or not ids:
+            ops.append({"op": "create", "id": next_id, "title": f"Entrada {next_id}",
+                        "password": f"senha-{next_id}-{rng.random()}"})
+            ids.append(next_id)
+            next_id += 1
+        elif roll < 0.85:
+            entry_id = rng.choice(ids)
+            ops.append({"op": "update", "id": entry_id, "title": f"Título {rng.random()}",
+                        "password": f"nova-{rng.random()}"})
+        else:
+            entry_id = rng.choice(ids)
+            ops.append({"op": "delete", "id": entry_id})
+            ids.remove(entry_id)
+    return ops
+
+
+def apply_ops(pm: JSONPasswordManager, ops):
+    for op in ops:
+        if op["op"] == "create":
+            pm.create_password(op["title"], "crash.example.com", custom_password=op["password"])
+        elif op["op"] == "update":
+            pm.update_password(op["id"], title=op["title"], regenerate=True, custom_password=op["password"])
+        else:
+            pm.delete_password(op["id"])
+
+
+def apply_to_state(state: dict, ops):
+    for op in ops:
+        if op["op"] == "delete":
+            state.pop(op["id"], None)
+        else:
+            state[op["id"]] = [op["title"], op["password"]]
+
+
+def child(args):
+    rng = random.Random(args.seed)
+    if args.crash_at:
+        _CrashPoints(args.crash_at, rng).install()
+    JSONPasswordManager.JOURNAL_COMPACT_BYTES = args.compact_bytes
+    pm = JSONPasswordManager(MASTER_PASSWORD, args.wallet, background_writes=rng.random() < 0.5)
+    for _ in range(args.ops):
+        ops = random_ops(pm, rng, pm.next_id)
+        print(json.dumps({"begin": ops}), flush=True)
+        if len(ops) > 1:
+            with pm.batch():
+                apply_ops(pm, ops)
+        else:
+            apply_ops(pm, ops)
+        print(json.dumps({"ack": True}), flush=True)
+    pm.close()
+
+
+def run_trial(args, wallet: str, state: dict, rng: random.Random, mode: str) -> dict:
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", wallet,
+        "--seed", str(rng.randrange(2 ** 32)), "--ops", str(args.ops),
+        "--compact-bytes", str(args.compact_bytes),
+    ]
+    if mode == "inject":
+        command += ["--crash-at", str(rng.randint(1, args.ops * 4))]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    if mode == "kill":
+        time.sleep(rng.uniform(0.1, args.max_kill_delay))
+        process.send_signal(signal.SIGKILL)
+    output, _ = process.communicate()
+
+    in_flight = None
+    for line in output.splitlines():
+        message = json.loads(line)
+        if "begin" in message:
+            in_flight = message["begin"]
+        else:
+            apply_to_state(state, in_flight)
+            in_flight = None
+
+    try:
+        reopened = JSONPasswordManager(MASTER_PASSWORD, wallet)
+        actual = {
+            entry.id: [entry.title, reopened.get_password(entry.id)[1]]
+            for entry in reopened.get_all_passwords()
+        }
+        reopened.close()
+    except Exception as e:
+        return {"ok": False, "returncode": process.returncode, "error": str(e)}
+
+    accepted = [dict(state)]
+    if in_flight is not None:
+        with_in_flight = dict(state)
+        apply_to_state(with_in_flight, in_flight)
+        accepted.append(with_in_flight)
+    ok = actual in accepted
+    if ok:
+        state.clear()
+        state.update(actual)
+    return {"ok": ok, "returncode": process.returncode, "entries": len(actual),
+            "in_flight_applied": in_flight is not None and actual == accepted[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Injeção de falhas no wallet local")
+    parser.add_argument("--trials", type=int, default=100, help="quedas por modo")
+    parser.add_argument("--modes", default="inject,kill", help="modos (inject, kill)")
+    parser.add_argument("--ops", type=int, default=200, help="alterações por processo filho")
+    parser.add_argument("--compact-bytes", type=int, default=4096, help="tamanho do journal que dispara compactação")
+    parser.add_argument("--max-kill-delay", type=float, default=1.5, help="atraso máximo do SIGKILL (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="crash_harness.json", help="arquivo JSON de resultados")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--crash-at", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.wallet = args.child
+        child(args)
+        return
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="crash_harness_")
+    wallet = os.path.join(workdir, "passwords.json")
+    summary = {}
+    failures = []
+    try:
+        JSONPasswordManager(MASTER_PASSWORD, wallet).close()
+        state = {}
+        for mode in args.modes.split(","):
+            crashed = in_flight_applied = 0
+            for trial in range(args.trials):
+                result = run_trial(args, wallet, state, rng, mode)
+                crashed += result["returncode"] != 0
+                if not result["ok"]:
+                    failures.append({"mode": mode, "trial": trial, **result})
+                    print(f"FALHA: modo {mode}, queda {trial}: "
+                          f"{result.get('error', 'conteúdo diferente do confirmado')}")
+                    state = None
+                    break
+                in_flight_applied += result["in_flight_applied"]
+            summary[mode] = {"trials": args.trials, "crashed": crashed, "in_flight_applied": in_flight_applied}
+            print(f"{mode}: {crashed} quedas, {in_flight_applied} com a alteração em andamento gravada, "
+                  f"{len(state or {})} entradas no vault")
+            if state is None:
+                break
+
+        write_results(args.output, {}, config=vars(args), extra={"modes": summary, "failures": failures})
+        print(f"\nResultados gravados em {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Gerador de carga em malha fechada para a API
+
+Cada usuário virtual (VU) se registra, faz login e repete operações
+sorteadas segundo um mix configurável, com think time exponencial entre
+elas. As senhas são cifradas como no navegador (ver client_crypto.py).
+A operação register cria um usuário novo a cada vez (bcrypt no
+servidor), sem trocar a sessão do VU.
+
+Exemplo (com a API rodando em outro terminal: uvicorn api:app --port 8000):
+    python benchmarks/loadgen.py --base-url http://127.0.0.1:8000 --users 50 \\
+        --duration 60 --mix list=40,get=20,create=10,update=10,delete=5,export=5,import=5,login=5
+"""
+import argparse
+import asyncio
+import random
+import secrets
+import string
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from common import percentile, write_results
+from client_crypto import DEFAULT_ITERATIONS, SessionCrypto
+
+
+DEFAULT_MIX = "list=40,get=20,create=10,update=10,delete=5,export=5,import=3,login=7"
+OPERATIONS = ("register", "login", "list", "get", "create", "update", "delete", "export", "import")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Converte "list=40,get=20" em pesos por operação"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Operação desconhecida no mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def random_password(length: int = 16) -> str:
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    return "".join(secrets.choice(alphabet) for _ in range(length))
+
+
+class Stats:
+    """Latências por operação, acumuladas no total e por intervalo"""
+
+    def __init__(self):
+        self.total: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.interval: List[float] = []
+        self.interval_errors = 0
+        self.timeline: List[dict] = []
+
+    def record(self, operation: str, latency: float, ok: bool):
+        self.total[operation].append(latency)
+        self.interval.append(latency)
+        if not ok:
+            self.errors[operation] += 1
+            self.interval_errors += 1
+
+    def roll_interval(self, elapsed: float, length: float, active_users: int) -> dict:
+        """Fecha o intervalo corrente e devolve o resumo dele"""
+        latencies = sorted(self.interval)
+        point = {
+            "t": round(elapsed, 1),
+            "active_users": active_users,
+            "rps": round(len(latencies) / length, 2),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "error_rate": round(self.interval_errors / len(latencies), 4) if latencies else 0.0,
+        }
+        self.timeline.append(point)
+        self.interval = []
+        self.interval_errors = 0
+        return point
+
+    def summary(self, duration: float) -> Dict[str, dict]:
+        result = {}
+        for operation, latencies in sorted(self.total.items()):
+            ordered = sorted(latencies)
+            result[operation] = {
+                "requests": len(ordered),
+                "ops_per_sec": round(len(ordered) / duration, 3),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+                "error_rate": round(self.errors[operation] / len(ordered), 4),
+            }
+        return result
+
+
+class VirtualUser:
+    """Um usuário virtual com sua sessão e as entradas que criou"""
+
+    def __init__(self, index: int, client: httpx.AsyncClient, stats: Stats, args, rng: random.Random):
+        self.index = index
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.rng = rng
+        self.username = f"load_{args.run_id}_{index}"
+        self.password = f"senha-{args.run_id}-{index}"
+        self.crypto = SessionCrypto(self.password, args.kdf_iterations)
+        self.token: Optional[str] = None
+        self.entry_ids: List[int] = []
+        self.registered = 0
+
+    @property
+    def headers(self) -> dict:
+        return {"X-Session-Token": self.token or ""}
+
+    async def _request(self, operation: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.stats.record(operation, time.perf_counter() - started, ok)
+        return response if ok else None
+
+    def _entry_body(self) -> dict:
+        length = self.rng.choice((12, 16, 20, 32))
+        return {
+            "title": f"Conta {self.rng.randrange(10**6)}",
+            "site": f"site{self.rng.randrange(1000)}.example.com",
+            "length": length,
+            "encrypted_password": self.crypto.encrypt(random_password(length)),
+        }
+
+    async def _register(self, username: str, password: str) -> Optional[httpx.Response]:
+        return await self._request("register", "POST", "/api/auth/register", json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": password,
+        })
+
+    async def setup(self):
+        await asyncio.to_thread(self.crypto.prepare)
+        await self._register(self.username, self.password)
+        await self.login()
+        for _ in range(self.args.initial_entries):
+            await self.create()
+
+    async def register(self):
+        """Registra um usuário novo (a sessão do VU continua a mesma)"""
+        self.registered += 1
+        await self._register(f"{self.username}_r{self.registered}", f"{self.password}-r{self.registered}")
+
+    async def login(self):
+        response = await self._request("login", "POST", "/api/auth/login", json={
+            "username": self.username, "password": self.password,
+        })
+        if response is not None:
+            self.token = response.json()["token"]
+
+    async def list(self):
+        response = await self._request("list", "GET", "/api/passwords", headers=self.headers)
+        if response is not None:
+            self.entry_ids = [item["id"] for item in response.json()]
+
+    async def get(self):
+        if not self.entry_ids:
+            return await self.list()
+        entry_id = self.rng.choice(self.entry_ids)
+        response = await self._request("get", "GET", f"/api/passwords/{entry_id}", headers=self.headers)
+        if response is not None and self.args.verify:
+            self.crypto.decrypt(response.json()["encrypted_password"])
+
+    async def create(self):
+        response = await self._request("create", "POST", "/api/passwords", json=self._entry_body(), headers=self.headers)
+        if response is not None:
+            self.entry_ids.append(response.json()["id"])
+
+    async def update(self):
+        if not self.entry_ids:
+            return await self.create()
+        entry_id = self.rng.choice(self.entry_ids)
+        body = self._entry_body()
+        body.pop("length")
+        await self._request("update", "PUT", f"/api/passwords/{entry_id}", json=body, headers=self.headers)
+
+    async def delete(self):
+        if not self.entry_ids:
+            return await self.create()
+        entry_id = self.entry_ids.pop(self.rng.randrange(len(self.entry_ids)))
+        await self._request("delete", "DELETE", f"/api/passwords/{entry_id}", headers=self.headers)
+
+    async def export(self):
+        response = await self._request("export", "GET", "/api/wallet/export", headers=self.headers)
+        if response is not None and self.args.verify:
+            for entry in response.json()["entries"][:5]:
+                self.crypto.decrypt(entry["encrypted_password"])
+
+    async def import_(self):
+        entries = []
+        for _ in range(self.args.import_size):
+            body = self._entry_body()
+            body.update({
+                "use_uppercase": True, "use_lowercase": True, "use_digits": True,
+                "use_special": True, "expiration_date": None,
+            })
+            entries.append(body)
+        await self._request("import", "POST", "/api/wallet/import", json={"entries": entries}, headers=self.headers)
+
+    async def run(self, mix: Dict[str, float], deadline: float):
+        operations = list(mix)
+        weights = [mix[name] for name in operations]
+        actions = {
+            "register": self.register, "login": self.login, "list": self.list, "get": self.get,
+            "create": self.create, "update": self.update, "delete": self.delete, "export": self.export,
+            "import": self.import_,
+        }
+        while time.monotonic() < deadline:
+            operation = self.rng.choices(operations, weights)[0]
+            await actions[operation]()
+            if self.args.think_time > 0:
+                await asyncio.sleep(self.rng.expovariate(1000.0 / self.args.think_time))
+
+
+async def reporter(stats: Stats, started: float, deadline: float, interval: float, active: List[int]):
+    while time.monotonic() < deadline:
+        await asyncio.sleep(interval)
+        point = stats.roll_interval(time.monotonic() - started, interval, active[0])
+        print(f"t={point['t']:>6.1f}s vus={point['active_users']:<5} rps={point['rps']:>8.1f} "
+              f"p50={point['p50_ms']:>8.2f}ms p95={point['p95_ms']:>8.2f}ms "
+              f"p99={point['p99_ms']:>8.2f}ms erros={point['error_rate'] * 100:.2f}%")
+
+
+async def run(args) -> dict:
+    mix = parse_mix(args.mix)
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        users = [VirtualUser(i, client, stats, args, random.Random(args.seed + i)) for i in range(args.users)]
+
+        print(f"Preparando {len(users)} usuários virtuais...")
+        await asyncio.gather(*(user.setup() for user in users))
+        stats.total.clear()
+        stats.errors.clear()
+        stats.interval = []
+        stats.interval_errors = 0
+
+        started = time.monotonic()
+        deadline = started + args.duration
+        active = [0]
+
+        async def start_user(user: VirtualUser, delay: float):
+            await asyncio.sleep(delay)
+            active[0] += 1
+            try:
+                await user.run(mix, deadline)
+            finally:
+                active[0] -= 1
+
+        ramp_step = args.ramp_up / len(users) if users else 0
+        await asyncio.gather(
+            reporter(stats, started, deadline, args.report_interval, active),
+            *(start_user(user, i * ramp_step) for i, user in enumerate(users)),
+        )
+        elapsed = time.monotonic() - started
+
+    return {"operations": stats.summary(elapsed), "timeline": stats.timeline}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga em malha fechada para a API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=20, help="usuários virtuais simultâneos")
+    parser.add_argument("--duration", type=float, default=30, help="duração da fase medida (s)")
+    parser.add_argument("--ramp-up", type=float, default=5, help="tempo para iniciar todos os VUs (s)")
+    parser.add_argument("--think-time", type=float, default=200, help="think time médio (ms)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="pesos das operações")
+    parser.add_argument("--initial-entries", type=int, default=10, help="senhas criadas por VU no setup")
+    parser.add_argument("--import-size", type=int, default=20, help="entradas por import de wallet")
+    parser.add_argument("--kdf-iterations", type=int, default=DEFAULT_ITERATIONS,
+                        help="iterações PBKDF2 do cliente (padrão igual ao frontend)")
+    parser.add_argument("--verify", action="store_true", help="descriptografa blobs recebidos")
+    parser.add_argument("--report-interval", type=float, default=5, help="intervalo do relatório (s)")
+    parser.add_argument("--timeout", type=float, default=30, help="timeout por requisição (s)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--run-id", default=secrets.token_hex(3), help="sufixo dos usuários criados")
+    parser.add_argument("--output", default="loadgen.json", help="arquivo JSON de resultados")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    print(f"\n{'Operação':<10} {'req':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>8}")
+    print("-" * 68)
+    for operation, item in report["operations"].items():
+        print(f"{operation:<10} {item['requests']:>8} {item['ops_per_sec']:>9.1f} {item['p50_ms']:>9.2f} "
+              f"{item['p95_ms']:>9.2f} {item['p99_ms']:>9.2f} {item['error_rate'] * 100:>7.2f}%")
+
+    write_results(args.output, report["operations"], config=vars(args), extra={"timeline": report["timeline"]})
+    print(f"\nResultados gravados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -120,6 +120,7 @@ async function decryptWithMasterPassword(base64Blob, masterPassword) {
   return new TextDecoder().decode(plainBuffer);
 }
 
+// plaintextJson pode ser texto ou bytes (payload já comprimido)
 async function encryptPayloadWithWalletPassword(plaintextJson, walletPassword, iterations = 300000) {
   const encoder = new TextEncoder();
   const SALT_SIZE = 16;
@@ -132,7 +133,7 @@ async function encryptPayloadWithWalletPassword(plaintextJson, walletPassword, i
   const cipherBuf = await crypto.subtle.encrypt(
     { name: 'AES-GCM', iv: nonce, tagLength: 128 },
     key,
-    encoder.encode(plaintextJson)
+    typeof plaintextJson === 'string' ? encoder.encode(plaintextJson) : plaintextJson
   );
 
   const cipherBytes = new Uint8Array(cipherBuf);
@@ -146,6 +147,10 @@ async function encryptPayloadWithWalletPassword(plaintextJson, walletPassword, i
 
 async function decryptPayloadWithWalletPassword(ciphertext_b64, walletPassword, salt_b64, nonce_b64, iterations = 300000) {
   const decoder = new TextDecoder();
+  return decoder.decode(await decryptPayloadBytesWithWalletPassword(ciphertext_b64, walletPassword, salt_b64, nonce_b64, iterations));
+}
+
+async function decryptPayloadBytesWithWalletPassword(ciphertext_b64, walletPassword, salt_b64, nonce_b64, iterations = 300000) {
   const salt = base64ToBytes(salt_b64);
   const nonce = base64ToBytes(nonce_b64);
   const cipherBytes = base64ToBytes(ciphertext_b64);
@@ -158,5 +163,5 @@ async function decryptPayloadWithWalletPassword(ciphertext_b64, walletPassword,
     cipherBytes
   );
 
-  return decoder.decode(plainBuf);
+  return new Uint8Array(plainBuf);
 }
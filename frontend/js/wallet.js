@@ -1,4 +1,22 @@
 // Wallet export / import handlers
+
+// Payload comprimido antes da cifragem (wallet_format_version 1.1); "deflate"
+// do CompressionStream é o formato zlib lido pela versão local
+const WALLET_COMPRESSION = typeof CompressionStream !== 'undefined' ? 'zlib' : null;
+
+async function compressWalletPayload(bytes) {
+  const stream = new Blob([bytes]).stream().pipeThrough(new CompressionStream('deflate'));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+}
+
+async function decompressWalletPayload(bytes, method) {
+  if (!method) return bytes;
+  if (method !== 'zlib' || typeof DecompressionStream === 'undefined') {
+    throw new Error(`Compressão não suportada neste navegador: ${method}`);
+  }
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+}
 btnWalletExport.addEventListener('click', async () => {
   if (!masterPasswordPlain) {
     setStatus("Você precisa estar logado para exportar a wallet.", "error");
@@ -30,7 +48,7 @@ btnWalletExport.addEventListener('click', async () => {
   }
 
   const payload = { version: "1.0", entries: decryptedEntries };
-  const payloadJson = JSON.stringify(payload, null, 2);
+  const payloadJson = WALLET_COMPRESSION ? JSON.stringify(payload) : JSON.stringify(payload, null, 2);
 
   const walletPassword = await showWalletPasswordModal({ title: 'Escolha uma senha para o arquivo wallet', confirm: true });
   if (!walletPassword) {
@@ -39,10 +57,13 @@ btnWalletExport.addEventListener('click', async () => {
   }
 
   setStatus('Criptografando payload do wallet...');
-  const encResult = await encryptPayloadWithWalletPassword(payloadJson, walletPassword, 300000);
+  const payloadData = WALLET_COMPRESSION
+    ? await compressWalletPayload(new TextEncoder().encode(payloadJson))
+    : payloadJson;
+  const encResult = await encryptPayloadWithWalletPassword(payloadData, walletPassword, 300000);
 
   const meta = {
-    wallet_format_version: "1.0",
+    wallet_format_version: WALLET_COMPRESSION ? "1.1" : "1.0",
     app: { name: "password-managment", version: "1.0" },
     exported_at: new Date().toISOString(),
     encryption: {
@@ -54,7 +75,9 @@ btnWalletExport.addEventListener('click', async () => {
       nonce: encResult.nonce_b64,
       tag_bytes: 16,
     },
-    serialization: { format: "json", encoding: "utf-8", indent: 2 }
+    serialization: WALLET_COMPRESSION
+      ? { format: "json", encoding: "utf-8", compression: WALLET_COMPRESSION }
+      : { format: "json", encoding: "utf-8", indent: 2 }
   };
 
   const walletFile = {
@@ -64,7 +87,8 @@ btnWalletExport.addEventListener('click', async () => {
     }
   };
 
-  const blob = new Blob([JSON.stringify(walletFile, null, 2)], { type: "application/json" });
+  const walletJson = WALLET_COMPRESSION ? JSON.stringify(walletFile) : JSON.stringify(walletFile, null, 2);
+  const blob = new Blob([walletJson], { type: "application/json" });
   const a = document.createElement("a");
   a.href = URL.createObjectURL(blob);
   a.download = "wallet.json";
@@ -103,7 +127,9 @@ walletFileInput.addEventListener('change', async (event) => {
         return;
       }
 
-      const plaintext = await decryptPayloadWithWalletPassword(json.data.entries_encrypted, walletPassword, salt_b64, nonce_b64, iterations);
+      const compression = json.meta.serialization ? json.meta.serialization.compression : null;
+      const plainBytes = await decryptPayloadBytesWithWalletPassword(json.data.entries_encrypted, walletPassword, salt_b64, nonce_b64, iterations);
+      const plaintext = new TextDecoder().decode(await decompressWalletPayload(plainBytes, compression));
       const parsed = JSON.parse(plaintext);
       if (!parsed || !Array.isArray(parsed.entries)) {
         setStatus('Arquivo de wallet descriptografado mas formato inválido.', 'error');
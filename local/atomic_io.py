@@ -0,0 +1,78 @@
+"""
+Escrita atômica e durável dos arquivos do wallet local
+
+Um arquivo nunca é regravado no lugar: o conteúdo novo vai para um
+arquivo temporário no mesmo diretório, que recebe fsync e depois
+substitui o original com os.replace (atômico no mesmo sistema de
+arquivos); por fim o diretório recebe fsync, para o rename sobreviver a
+uma queda de energia. Quem lê o arquivo vê sempre a versão anterior
+inteira ou a nova inteira.
+
+Com LOCAL_WALLET_FSYNC=0 os fsyncs são pulados (o rename continua
+atômico, mas uma queda de energia pode perder as últimas gravações).
+"""
+import os
+from typing import Union
+
+
+DURABLE = os.getenv("LOCAL_WALLET_FSYNC", "1") != "0"
+
+
+def fsync_directory(directory: str):
+    """fsync do diretório (grava as entradas criadas ou renomeadas nele)"""
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        # Windows não permite abrir diretórios; lá o rename já é durável
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: str, data: Union[bytes, str], durable: bool = DURABLE):
+    """
+    Substitui o arquivo inteiro de forma atômica
+
+    Args:
+        path: Arquivo de destino
+        data: Conteúdo (str é gravado em UTF-8)
+        durable: Faz fsync do arquivo e do diretório antes de retornar
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if durable:
+        fsync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def atomic_rename(src: str, dst: str, durable: bool = DURABLE):
+    """Renomeia src para dst (substituindo dst) e grava o rename no diretório"""
+    os.replace(src, dst)
+    if durable:
+        fsync_directory(os.path.dirname(os.path.abspath(dst)))
+
+
+def append(path: str, data: bytes, durable: bool = DURABLE):
+    """Grava data no fim do arquivo com uma única escrita (e fsync)"""
+    with open(path, "ab") as f:
+        f.write(data)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
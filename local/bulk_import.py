@@ -0,0 +1,190 @@
+"""
+Importação de vários wallets de uma vez para o wallet local
+
+Cada arquivo custa um PBKDF2 de 300.000 iterações mais a decifragem, e o
+PBKDF2 do pycryptodome segura o GIL: os arquivos são lidos em paralelo
+por um ProcessPoolExecutor, um processo por núcleo. As entradas de todos
+os arquivos são incorporadas ao vault de uma vez, com um único snapshot;
+um arquivo com erro (senha errada, formato inválido) não impede os
+demais.
+
+Uso:
+    python bulk_import.py passwords.json equipe/*.json
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class BulkImportResult:
+    """Resultado de import_wallets"""
+    added: int = 0
+    # Entradas lidas de cada arquivo importado com sucesso
+    files: Dict[str, int] = field(default_factory=dict)
+    # Mensagem de erro de cada arquivo que falhou
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def imported(self) -> int:
+        return sum(self.files.values())
+
+
+def _local_password_manager():
+    """
+    Módulo local/password_manager.py
+
+    Carregado pelo caminho, como em main.py e gui.py: backend/ tem outro
+    password_manager.py e entra antes no sys.path.
+    """
+    module = sys.modules.get("local_password_manager")
+    if module is None:
+        spec = importlib.util.spec_from_file_location(
+            "local_password_manager",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "password_manager.py"),
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["local_password_manager"] = module
+    return module
+
+
+def _read_wallet(import_file: str, master_password: str) -> List[dict]:
+    """Lê e decifra um arquivo (roda nos processos do pool)"""
+    JSONPasswordManager = _local_password_manager().JSONPasswordManager
+
+    return [
+        JSONPasswordManager._entry_to_dict(entry)
+        for entry in JSONPasswordManager.import_from_json(import_file, master_password)
+    ]
+
+
+def import_wallets(
+    pm,
+    import_files: List[str],
+    master_password: str,
+    workers: Optional[int] = None,
+    skip_duplicates: bool = True,
+    progress: Optional[Callable[[int, int, str, int, Optional[str]], None]] = None,
+) -> BulkImportResult:
+    """
+    Importa vários arquivos de wallet para o gerenciador aberto
+
+    Os arquivos são lidos em paralelo e as entradas são adicionadas na
+    ordem de import_files, com um único snapshot no fim.
+
+    Args:
+        pm: JSONPasswordManager de destino
+        import_files: Arquivos a importar (repetidos são lidos uma vez)
+        master_password: Senha mestra dos arquivos importados
+        workers: Processos de leitura (padrão: um por núcleo; 1 lê no
+            próprio processo)
+        skip_duplicates: Ignora entradas que já estão no vault (ver
+            JSONPasswordManager.import_entries)
+        progress: Chamada a cada arquivo lido com (lidos, total, arquivo,
+            entradas lidas, erro ou None)
+
+    Returns:
+        BulkImportResult com as entradas adicionadas e os erros por arquivo
+    """
+    import_files = list(dict.fromkeys(import_files))
+    workers = min(workers or os.cpu_count() or 1, len(import_files) or 1)
+    result = BulkImportResult()
+    entries_by_file: Dict[str, List[dict]] = {}
+
+    def finished(import_file: str, entries_data: Optional[List[dict]], error: Optional[str]):
+        if error is None:
+            entries_by_file[import_file] = entries_data
+            result.files[import_file] = len(entries_data)
+        else:
+            result.errors[import_file] = error
+        if progress is not None:
+            progress(
+                len(result.files) + len(result.errors), len(import_files),
+                import_file, result.files.get(import_file, 0), error,
+            )
+
+    if workers <= 1:
+        for import_file in import_files:
+            try:
+                finished(import_file, _read_wallet(import_file, master_password), None)
+            except Exception as e:
+                finished(import_file, None, str(e))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_read_wallet, import_file, master_password): import_file
+                for import_file in import_files
+            }
+            for future in as_completed(futures):
+                try:
+                    finished(futures[future], future.result(), None)
+                except Exception as e:
+                    finished(futures[future], None, str(e))
+
+    imported_entries = [
+        type(pm)._entry_from_dict(entry_data, default_id=0)
+        for import_file in import_files
+        for entry_data in entries_by_file.get(import_file, [])
+    ]
+    if imported_entries:
+        result.added = pm.import_entries(imported_entries, skip_duplicates=skip_duplicates)
+    return result
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Importa vários wallets para o wallet local")
+    parser.add_argument("wallet", help="wallet local de destino (criado se não existir)")
+    parser.add_argument("files", nargs="+", help="arquivos a importar (aceita padrões como equipe/*.json)")
+    parser.add_argument("--workers", type=int, default=None, help="processos de leitura (padrão: um por núcleo)")
+    parser.add_argument("--keep-duplicates", action="store_true", help="importa também entradas já existentes")
+    args = parser.parse_args(argv[1:])
+
+    import_files = []
+    for pattern in args.files:
+        import_files.extend(sorted(glob.glob(pattern)) or [pattern])
+    import_files = [path for path in import_files if os.path.abspath(path) != os.path.abspath(args.wallet)]
+
+    import getpass
+
+    JSONPasswordManager = _local_password_manager().JSONPasswordManager
+
+    master_password = getpass.getpass("Senha mestra do wallet local: ")
+    import_password = getpass.getpass("Senha mestra dos arquivos importados (Enter: a mesma): ") or master_password
+
+    def report(done: int, total: int, import_file: str, entries: int, error: Optional[str]):
+        status = f"✗ {error}" if error else f"✓ {entries} senha(s)"
+        print(f"[{done}/{total}] {import_file}: {status}")
+
+    try:
+        pm = JSONPasswordManager(master_password, args.wallet)
+    except Exception as e:
+        print(f"Erro ao abrir o wallet local: {e}")
+        return 1
+    try:
+        result = import_wallets(
+            pm, import_files, import_password, workers=args.workers,
+            skip_duplicates=not args.keep_duplicates, progress=report,
+        )
+    except Exception as e:
+        print(f"Erro ao gravar o wallet local: {e}")
+        return 1
+    finally:
+        pm.close()
+
+    print(f"\n✓ {result.added} senha(s) adicionada(s) de {len(result.files)} arquivo(s)")
+    if result.added < result.imported:
+        print(f"  {result.imported - result.added} senha(s) já existiam e foram ignoradas")
+    if result.errors:
+        print(f"✗ {len(result.errors)} arquivo(s) com erro")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
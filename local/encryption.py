@@ -1,9 +1,17 @@
 from Crypto.Cipher import AES
 from Crypto.Protocol.KDF import PBKDF2, HKDF
-from Crypto.Hash import SHA256
+from Crypto.Hash import SHA256, SHA512
+from collections import OrderedDict
+import atexit
 import os
 import base64
-from typing import Union
+import threading
+import weakref
+from typing import Iterable, Optional, Union
+
+
+# Gerenciadores vivos, para apagar as chaves derivadas ao sair
+_live_managers = weakref.WeakSet()
 
 
 class EncryptionManager:
@@ -13,6 +21,11 @@ class EncryptionManager:
     SALT_SIZE = 16
     KDF_ITERATIONS = 300000
 
+    # Chaves derivadas mantidas em memória (0 desliga o cache)
+    MAX_CACHED_KEYS = 8
+
+    KDF_HASHES = {"SHA256": SHA256, "SHA-256": SHA256, "SHA512": SHA512, "SHA-512": SHA512}
+
     def __init__(self, master_password: str, salt: Union[bytes, str, None] = None):
         self.master_password = master_password
         if salt is None:
@@ -22,16 +35,136 @@ class EncryptionManager:
         else:
             self.salt = salt
 
-        self.key = PBKDF2(
+        # (salt, iterações, hash) -> chave; bytearray para poder ser zerada
+        self._keys: "OrderedDict[tuple, bytearray]" = OrderedDict()
+        self._keys_lock = threading.Lock()
+        _live_managers.add(self)
+
+    @property
+    def key(self) -> bytearray:
+        """Chave do salt do wallet (derivada na primeira vez que é usada)"""
+        return self.derive_key(self.salt)
+
+    def derive_key(
+        self,
+        salt: bytes,
+        iterations: int = KDF_ITERATIONS,
+        hash_name: str = "SHA256"
+    ) -> bytearray:
+        """
+        Deriva (ou reaproveita do cache) a chave PBKDF2 da senha mestra
+
+        O PBKDF2 com 300.000 iterações é a parte cara de abrir um wallet; a
+        chave de cada (salt, iterações, hash) é derivada uma vez e guardada
+        em um cache LRU limitado a MAX_CACHED_KEYS, zerado por clear().
+
+        Args:
+            salt: Salt do blob
+            iterations: Iterações do PBKDF2
+            hash_name: Hash do HMAC ("SHA256" ou "SHA512")
+
+        Returns:
+            Chave de KEY_SIZE bytes
+        """
+        hash_module = self.KDF_HASHES.get(hash_name)
+        if hash_module is None:
+            raise ValueError(f"Hash de KDF não suportado: {hash_name}")
+        cache_key = (bytes(salt), iterations, hash_module.__name__)
+
+        with self._keys_lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                return key
+
+        key = bytearray(PBKDF2(
             self.master_password.encode(),
-            self.salt,
+            salt,
             dkLen=self.KEY_SIZE,
-            count=self.KDF_ITERATIONS,
-            hmac_hash_module=SHA256
+            count=iterations,
+            hmac_hash_module=hash_module
+        ))
+        self._store_key(cache_key, key)
+        return key
+
+    def _store_key(self, cache_key: tuple, key: bytearray):
+        """
+        Guarda a chave no cache, descartando a menos usada se passar do limite
+
+        A descartada não é zerada: derive_key() e subkey() devolvem o próprio
+        bytearray do cache, que outra thread (journal, compactação) pode
+        estar usando. Só clear() zera as chaves.
+        """
+        if self.MAX_CACHED_KEYS <= 0:
+            return
+        with self._keys_lock:
+            self._keys[cache_key] = key
+            self._keys.move_to_end(cache_key)
+            while len(self._keys) > self.MAX_CACHED_KEYS:
+                self._keys.popitem(last=False)
+
+    def subkey(self, purpose: str, salt: Optional[bytes] = None) -> bytearray:
+        """
+        Subchave HKDF-SHA256 da chave do wallet para um uso específico
+
+        Derivada uma vez por sessão e guardada no mesmo cache das chaves
+        PBKDF2 (zerada por clear()).
+
+        Args:
+            purpose: Uso da chave (por exemplo "metadata" ou "password")
+            salt: Salt da chave mestra (padrão: o do wallet)
+        """
+        salt = self.salt if salt is None else salt
+        cache_key = ("HKDF", bytes(salt), purpose)
+        with self._keys_lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+                return key
+
+        key = bytearray(HKDF(
+            bytes(self.derive_key(salt)), self.KEY_SIZE, b"", SHA256,
+            context=b"password-managment/" + purpose.encode("utf-8")
+        ))
+        self._store_key(cache_key, key)
+        return key
+
+    def seal(self, purpose: str, plaintext: bytes, aad: bytes = b"", salt: Optional[bytes] = None) -> bytes:
+        """Cifra um registro com a subchave do uso (nonce + tag + ciphertext)"""
+        nonce = os.urandom(self.NONCE_SIZE)
+        cipher = AES.new(self.subkey(purpose, salt), AES.MODE_GCM, nonce=nonce, mac_len=self.TAG_SIZE)
+        cipher.update(aad)
+        ciphertext, tag = cipher.encrypt_and_digest(plaintext)
+        return nonce + tag + ciphertext
+
+    def unseal(self, purpose: str, blob: bytes, aad: bytes = b"", salt: Optional[bytes] = None) -> bytes:
+        """Decifra e verifica um registro gerado por seal()"""
+        nonce = blob[:self.NONCE_SIZE]
+        tag = blob[self.NONCE_SIZE:self.NONCE_SIZE + self.TAG_SIZE]
+        cipher = AES.new(self.subkey(purpose, salt), AES.MODE_GCM, nonce=nonce, mac_len=self.TAG_SIZE)
+        cipher.update(aad)
+        return cipher.decrypt_and_verify(blob[self.NONCE_SIZE + self.TAG_SIZE:], tag)
+
+    def unseal_stream(self, purpose: str, blob, aad: bytes = b"", salt: Optional[bytes] = None) -> bytearray:
+        """Como unseal(), lendo o blob por partes (Base64Value de wallet_reader.py)"""
+        header = self.NONCE_SIZE + self.TAG_SIZE
+        if len(blob) < header:
+            raise ValueError("Registro cifrado truncado")
+        head = blob.read(0, header)
+        return self.decrypt_chunks(
+            self.subkey(purpose, salt), head[:self.NONCE_SIZE], head[self.NONCE_SIZE:],
+            blob.chunks(header), len(blob) - header, aad,
         )
 
-    def encrypt(self, plaintext: str) -> bytes:
-        plaintext_bytes = plaintext.encode("utf-8")
+    def clear(self):
+        """Zera e descarta as chaves derivadas (ao bloquear o wallet ou sair)"""
+        with self._keys_lock:
+            for key in self._keys.values():
+                key[:] = bytes(len(key))
+            self._keys.clear()
+
+    def encrypt(self, plaintext: Union[str, bytes]) -> bytes:
+        plaintext_bytes = plaintext.encode("utf-8") if isinstance(plaintext, str) else plaintext
 
         nonce = os.urandom(self.NONCE_SIZE)
         cipher = AES.new(self.key, AES.MODE_GCM, nonce=nonce, mac_len=self.TAG_SIZE)
@@ -41,6 +174,10 @@ class EncryptionManager:
         return self.salt + nonce + tag + ciphertext
 
     def decrypt(self, blob: bytes) -> str:
+        return self.decrypt_bytes(blob).decode("utf-8")
+
+    def decrypt_bytes(self, blob: bytes) -> bytes:
+        """Como decrypt(), sem decodificar o texto (payloads comprimidos)"""
         offset = 0
         salt = blob[offset:offset+self.SALT_SIZE]
         offset += self.SALT_SIZE
@@ -53,18 +190,65 @@ class EncryptionManager:
 
         ciphertext = blob[offset:]
 
-        key = PBKDF2(
-            self.master_password.encode(),
-            salt,
-            dkLen=self.KEY_SIZE,
-            count=self.KDF_ITERATIONS,
-            hmac_hash_module=SHA256
-        )
+        key = self.derive_key(salt)
 
         cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=self.TAG_SIZE)
-        plaintext = cipher.decrypt_and_verify(ciphertext, tag)
+        return cipher.decrypt_and_verify(ciphertext, tag)
+
+    def decrypt_stream(self, blob) -> bytearray:
+        """
+        Como decrypt_bytes(), lendo o blob por partes (Base64Value de wallet_reader.py)
 
-        return plaintext.decode("utf-8")
+        Só o texto claro fica inteiro na memória; o blob é decodificado e
+        decifrado em partes.
+        """
+        header = self.SALT_SIZE + self.NONCE_SIZE + self.TAG_SIZE
+        if len(blob) < header:
+            raise ValueError("Blob cifrado truncado")
+        head = blob.read(0, header)
+        nonce_end = self.SALT_SIZE + self.NONCE_SIZE
+        return self.decrypt_chunks(
+            self.derive_key(head[:self.SALT_SIZE]), head[self.SALT_SIZE:nonce_end], head[nonce_end:],
+            blob.chunks(header), len(blob) - header,
+        )
+
+    def decrypt_chunks(
+        self,
+        key: bytes,
+        nonce: bytes,
+        tag: bytes,
+        chunks: Iterable[bytes],
+        size: int,
+        aad: bytes = b"",
+    ) -> bytearray:
+        """
+        Decifra um ciphertext AES-GCM recebido em partes
+
+        As partes são decifradas direto em um único bytearray de size
+        bytes. A tag só pode ser verificada no fim: se ela não confere, o
+        buffer é zerado antes do erro e nada do texto claro é devolvido.
+
+        Raises:
+            ValueError: Se a tag não confere ou o ciphertext não tem size bytes
+        """
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=self.TAG_SIZE)
+        cipher.update(aad)
+        plaintext = bytearray(size)
+        with memoryview(plaintext) as output:
+            offset = 0
+            for chunk in chunks:
+                if offset + len(chunk) > size:
+                    raise ValueError("Ciphertext maior que o esperado")
+                cipher.decrypt(chunk, output=output[offset:offset + len(chunk)])
+                offset += len(chunk)
+        try:
+            if offset != size:
+                raise ValueError("Ciphertext truncado")
+            cipher.verify(tag)
+        except ValueError:
+            plaintext[:] = bytes(size)
+            raise
+        return plaintext
 
 
     def get_metadata(self):
@@ -76,3 +260,9 @@ class EncryptionManager:
             "salt": base64.b64encode(self.salt).decode("utf-8"),
             "key_size": self.KEY_SIZE * 8,
         }
+
+
+@atexit.register
+def _clear_all_keys():
+    for manager in list(_live_managers):
+        manager.clear()
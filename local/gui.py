@@ -4,6 +4,7 @@ Interface gráfica usando Tkinter
 """
 import sys
 import os
+import atexit
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 from datetime import datetime
@@ -14,10 +15,15 @@ import importlib.util
 backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
 sys.path.insert(0, backend_dir)
 from password_generator import PasswordGenerator
+from password_pool import PasswordPool
 
 
 sys.path.remove(backend_dir)
 
+# Senhas de teste pré-geradas; o pool é zerado ao sair
+password_pool = PasswordPool()
+atexit.register(password_pool.close)
+
 
 local_dir = os.path.dirname(os.path.abspath(__file__))
 local_password_manager_path = os.path.join(local_dir, 'password_manager.py')
@@ -148,10 +154,10 @@ class PasswordManagerGUI:
             if imported_entries:
                 # Cria o gerenciador com a senha do import
                 self.pm = JSONPasswordManager(password)
-                self.pm.import_entries(imported_entries)
+                added = self.pm.import_entries(imported_entries)
                 messagebox.showinfo(
                     "Sucesso",
-                    f"{len(imported_entries)} senha(s) importada(s) com sucesso!"
+                    f"{added} senha(s) importada(s) com sucesso!"
                 )
                 self.show_main_screen()
             else:
@@ -282,7 +288,7 @@ class PasswordManagerGUI:
         
         # Adiciona à árvore
         for entry in self.current_entries:
-            entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+            entropy_level = entry.entropy_level
             expiration = entry.expiration_date.strftime("%Y-%m-%d") if entry.expiration_date else "N/A"
             
             self.tree.insert(
@@ -445,7 +451,7 @@ class PasswordManagerGUI:
             return
         
         entry_obj, password = result
-        entropy_level = PasswordGenerator.get_entropy_level(entry_obj.entropy)
+        entropy_level = entry_obj.entropy_level
         
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Senha: {entry_obj.title}")
@@ -663,7 +669,7 @@ Atualizado em: {entry_obj.updated_at.strftime('%Y-%m-%d %H:%M:%S')}
         def generate():
             try:
                 length = int(length_var.get())
-                password = PasswordGenerator.generate(
+                password = password_pool.take(
                     length,
                     use_uppercase.get(),
                     use_lowercase.get(),
@@ -705,6 +711,8 @@ Atualizado em: {entry_obj.updated_at.strftime('%Y-%m-%d %H:%M:%S')}
     
     def logout(self):
         """Faz logout e volta para a tela de login"""
+        if self.pm:
+            self.pm.close()
         self.pm = None
         self.current_entries = []
         self.show_login_screen()
@@ -0,0 +1,179 @@
+"""
+Journal append-only do wallet local
+
+O arquivo do wallet (passwords.json) passa a ser um snapshot; cada
+alteração posterior é gravada como um registro cifrado individualmente no
+fim de passwords.json.journal, então criar, alterar ou remover uma senha
+custa um append do tamanho da entrada, não do vault inteiro.
+
+Formato (little-endian):
+    cabeçalho  magic "PWJL" | versão u16 | reservado u16 | geração (16 bytes)
+    registros  tamanho u32 | nonce (12) | tag (16) | ciphertext
+
+Cada registro é um JSON compacto ({"op": "put", "entry": {...}},
+{"op": "delete", "id": n} ou {"op": "batch", "records": [...]} com as
+alterações de um batch) cifrado com AES-GCM; o AAD é magic + geração +
+número de sequência, então registros de outro journal, reordenados ou
+removidos do meio não passam na verificação. A geração é gravada também no
+snapshot: um journal cuja geração não bate com a do snapshot já foi
+incorporado a ele e é descartado. Um registro incompleto no fim (queda no
+meio de um append) é ignorado e truncado.
+"""
+import json
+import os
+import struct
+from typing import Callable, Iterable, Iterator, Optional
+
+from Crypto.Cipher import AES
+
+import atomic_io
+
+
+MAGIC = b"PWJL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHH16s")
+LENGTH = struct.Struct("<I")
+SEQUENCE = struct.Struct("<Q")
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
+
+class JournalError(Exception):
+    """Journal corrompido ou cifrado com outra chave"""
+
+
+class WalletJournal:
+    """Journal de alterações de um snapshot do wallet"""
+
+    def __init__(self, path: str, key_source: Callable[[], bytes], durable: bool = atomic_io.DURABLE):
+        """
+        Args:
+            path: Caminho do arquivo do journal
+            key_source: Devolve a chave AES do wallet (consultada a cada uso,
+                para nunca guardar uma cópia da chave aqui)
+            durable: fsync a cada append (a alteração está em disco quando
+                append retorna)
+        """
+        self.path = path
+        self._key_source = key_source
+        self.durable = durable
+        self.generation: Optional[bytes] = None
+        self._sequence = 0
+        self.size = 0
+
+    def _aad(self, sequence: int) -> bytes:
+        return MAGIC + self.generation + SEQUENCE.pack(sequence)
+
+    def read_generation(self) -> Optional[bytes]:
+        """Geração gravada no cabeçalho (None se o arquivo não existe ou está vazio)"""
+        try:
+            with open(self.path, "rb") as f:
+                header = f.read(HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < HEADER.size:
+            return None
+        magic, version, _, generation = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise JournalError(f"Journal inválido: {self.path}")
+        return generation
+
+    def start(self, generation: bytes):
+        """Cria um journal vazio para a geração (substitui o arquivo atual)"""
+        atomic_io.atomic_write(self.path, HEADER.pack(MAGIC, FORMAT_VERSION, 0, generation), self.durable)
+        self.generation = generation
+        self._sequence = 0
+        self.size = HEADER.size
+
+    def replay(self, repair: bool = True) -> Iterator[dict]:
+        """
+        Lê os registros em ordem, um por vez
+
+        Depois da leitura o journal fica pronto para novos appends na
+        mesma geração.
+
+        Args:
+            repair: Trunca um registro incompleto no fim (queda no meio de um append)
+
+        Raises:
+            JournalError: Se um registro completo não passa na verificação
+        """
+        generation = self.read_generation()
+        if generation is None:
+            return
+        self.generation = generation
+        self._sequence = 0
+        valid_end = HEADER.size
+        with open(self.path, "rb") as f:
+            f.seek(HEADER.size)
+            while True:
+                prefix = f.read(LENGTH.size)
+                if len(prefix) < LENGTH.size:
+                    break
+                (length,) = LENGTH.unpack(prefix)
+                body = f.read(length)
+                if length < NONCE_SIZE + TAG_SIZE or len(body) < length:
+                    break
+                nonce, tag, ciphertext = body[:NONCE_SIZE], body[NONCE_SIZE:NONCE_SIZE + TAG_SIZE], body[NONCE_SIZE + TAG_SIZE:]
+                cipher = AES.new(self._key_source(), AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+                cipher.update(self._aad(self._sequence))
+                try:
+                    plaintext = cipher.decrypt_and_verify(ciphertext, tag)
+                except ValueError:
+                    raise JournalError(
+                        f"Registro {self._sequence} do journal não pôde ser verificado"
+                    )
+                self._sequence += 1
+                valid_end = f.tell()
+                yield json.loads(plaintext)
+
+        if repair and os.path.getsize(self.path) > valid_end:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_end)
+        self.size = valid_end
+
+    def append(self, records: Iterable[dict]) -> int:
+        """
+        Cifra e grava registros no fim do journal com uma única escrita
+
+        Returns:
+            Tamanho do journal depois do append
+        """
+        if self.generation is None:
+            raise JournalError("Journal não iniciado")
+        key = self._key_source()
+        start_size, start_sequence = self.size, self._sequence
+        try:
+            chunks = []
+            for record in records:
+                nonce = os.urandom(NONCE_SIZE)
+                cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+                cipher.update(self._aad(self._sequence))
+                ciphertext, tag = cipher.encrypt_and_digest(
+                    json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                )
+                chunks.append(LENGTH.pack(NONCE_SIZE + TAG_SIZE + len(ciphertext)) + nonce + tag + ciphertext)
+                self._sequence += 1
+            data = b"".join(chunks)
+            atomic_io.append(self.path, data, self.durable)
+        except Exception:
+            # Desfaz um append parcial, para os próximos continuarem válidos
+            self._sequence = start_sequence
+            try:
+                if os.path.getsize(self.path) > start_size:
+                    with open(self.path, "r+b") as f:
+                        f.truncate(start_size)
+            except OSError:
+                pass
+            raise
+        self.size += len(data)
+        return self.size
+
+    def remove(self):
+        """Apaga o arquivo do journal"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            return
+        if self.durable:
+            atomic_io.fsync_directory(os.path.dirname(os.path.abspath(self.path)))
@@ -1,5 +1,7 @@
 import sys
+import glob
 import json
+import atexit
 import os
 from datetime import datetime
 from getpass import getpass
@@ -9,9 +11,15 @@ import importlib.util
 backend_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
 sys.path.insert(0, backend_dir)
 from password_generator import PasswordGenerator
+from password_pool import PasswordPool
+from password_policy import PasswordPolicy, compile_policy
 
 sys.path.remove(backend_dir)
 
+# Senhas de teste pré-geradas; o pool é zerado ao sair
+password_pool = PasswordPool()
+atexit.register(password_pool.close)
+
 local_dir = os.path.dirname(os.path.abspath(__file__))
 local_password_manager_path = os.path.join(local_dir, 'password_manager.py')
 
@@ -22,6 +30,8 @@ spec.loader.exec_module(local_password_manager)
 JSONPasswordManager = local_password_manager.JSONPasswordManager
 PasswordEntry = local_password_manager.PasswordEntry
 
+from bulk_import import import_wallets
+
 
 def print_menu():
     """Imprime o menu principal"""
@@ -34,6 +44,9 @@ def print_menu():
     print("4. Atualizar senha")
     print("5. Deletar senha")
     print("6. Gerar senha de teste (sem salvar)")
+    print("7. Relatório de força das senhas")
+    print("8. Verificar senhas vazadas")
+    print("9. Importar vários wallets")
     print("0. Sair")
     print("="*50)
 
@@ -43,6 +56,33 @@ def get_master_password() -> str:
     return getpass("Digite sua senha mestra: ")
 
 
+def ask_policy(length: int, use_uppercase: bool, use_lowercase: bool,
+               use_digits: bool, use_special: bool) -> Optional[PasswordPolicy]:
+    """Pergunta as regras extras da política do site (None se não houver)"""
+    if input("Usar política do site (mínimos, proibidos, pronunciável)? (s/n, padrão: n): ").strip().lower() != 's':
+        return None
+    
+    def minimum(label: str, enabled: bool) -> int:
+        if not enabled:
+            return 0
+        return int(input(f"Mínimo de {label} (padrão: 1): ") or "1")
+    
+    return PasswordPolicy(
+        length=length,
+        use_uppercase=use_uppercase,
+        use_lowercase=use_lowercase,
+        use_digits=use_digits,
+        use_special=use_special,
+        min_uppercase=minimum("maiúsculas", use_uppercase),
+        min_lowercase=minimum("minúsculas", use_lowercase),
+        min_digits=minimum("dígitos", use_digits),
+        min_special=minimum("caracteres especiais", use_special),
+        banned_chars=input("Caracteres proibidos (Enter para nenhum): ").strip(),
+        no_repeats=input("Proibir caracteres repetidos em sequência? (s/n, padrão: n): ").strip().lower() == 's',
+        pronounceable=input("Senha pronunciável? (s/n, padrão: n): ").strip().lower() == 's',
+    )
+
+
 def create_password_interactive(pm: JSONPasswordManager):
     """Interface interativa para criar uma senha"""
     print("\n--- Criar Nova Senha ---")
@@ -65,6 +105,7 @@ def create_password_interactive(pm: JSONPasswordManager):
         use_lowercase = input("Usar letras minúsculas? (s/n, padrão: s): ").strip().lower() != 'n'
         use_digits = input("Usar dígitos? (s/n, padrão: s): ").strip().lower() != 'n'
         use_special = input("Usar caracteres especiais? (s/n, padrão: s): ").strip().lower() != 'n'
+        policy = ask_policy(length, use_uppercase, use_lowercase, use_digits, use_special)
         custom_password = None
     
     expiration = input("Data de expiração (YYYY-MM-DD, ou Enter para nenhuma): ").strip()
@@ -88,7 +129,7 @@ def create_password_interactive(pm: JSONPasswordManager):
                 title, site, length=length,
                 use_uppercase=use_uppercase, use_lowercase=use_lowercase,
                 use_digits=use_digits, use_special=use_special,
-                expiration_date=expiration_date
+                expiration_date=expiration_date, policy=policy
             )
         print(f"\n✓ Senha criada com sucesso! ID: {entry_id}")
     except Exception as e:
@@ -108,7 +149,7 @@ def list_passwords(pm: JSONPasswordManager):
     print("-" * 100)
     
     for entry in entries:
-        entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+        entropy_level = entry.entropy_level
         expiration = entry.expiration_date.strftime("%Y-%m-%d") if entry.expiration_date else "N/A"
         print(f"{entry.id:<5} {entry.title:<20} {entry.site:<25} {entry.length:<8} "
               f"{entry.entropy:<10.2f} {entropy_level:<15} {expiration:<12}")
@@ -126,7 +167,7 @@ def view_password(pm: JSONPasswordManager):
             return
         
         entry, password = result
-        entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
+        entropy_level = entry.entropy_level
         
         print(f"\nTítulo: {entry.title}")
         print(f"Site: {entry.site}")
@@ -247,9 +288,15 @@ def generate_test_password():
         use_lowercase = input("Usar letras minúsculas? (s/n, padrão: s): ").strip().lower() != 'n'
         use_digits = input("Usar dígitos? (s/n, padrão: s): ").strip().lower() != 'n'
         use_special = input("Usar caracteres especiais? (s/n, padrão: s): ").strip().lower() != 'n'
+        policy = ask_policy(length, use_uppercase, use_lowercase, use_digits, use_special)
         
-        password = PasswordGenerator.generate(length, use_uppercase, use_lowercase, use_digits, use_special)
-        entropy = PasswordGenerator.calculate_entropy(length, use_uppercase, use_lowercase, use_digits, use_special)
+        if policy is not None:
+            compiled = compile_policy(policy)
+            password = compiled.generate()
+            entropy = compiled.entropy
+        else:
+            password = password_pool.take(length, use_uppercase, use_lowercase, use_digits, use_special)
+            entropy = PasswordGenerator.calculate_entropy(length, use_uppercase, use_lowercase, use_digits, use_special)
         entropy_level = PasswordGenerator.get_entropy_level(entropy)
         
         print(f"\nSenha gerada: {password}")
@@ -259,6 +306,40 @@ def generate_test_password():
         print(f"Erro: {e}")
 
 
+def strength_report(pm: JSONPasswordManager):
+    """Mostra a força estimada de todas as senhas, da mais fraca para a mais forte"""
+    print("\n--- Relatório de Força ---")
+    report = pm.strength_report()
+    if not report:
+        print("Nenhuma senha cadastrada.")
+        return
+    
+    print(f"\n{'ID':<5} {'Título':<20} {'Site':<25} {'Entropia':<10} {'Nota':<6} {'Reutilizada'}")
+    print("-" * 80)
+    for item in report:
+        print(f"{item['id']:<5} {item['title'][:20]:<20} {item['site'][:25]:<25} "
+              f"{item['entropy']:<10.2f} {item['score']:<6} {'sim' if item['reused'] else ''}")
+
+
+def breach_report(pm: JSONPasswordManager):
+    """Mostra as senhas que aparecem no índice local de vazamentos"""
+    print("\n--- Senhas Vazadas ---")
+    try:
+        report = pm.audit_breaches()
+    except FileNotFoundError as e:
+        print(f"Erro: {e}")
+        return
+    if not report:
+        print("Nenhuma senha encontrada em vazamentos.")
+        return
+    
+    print(f"\n{'ID':<5} {'Título':<20} {'Site':<25} {'Ocorrências'}")
+    print("-" * 65)
+    for item in report:
+        print(f"{item['id']:<5} {item['title'][:20]:<20} {item['site'][:25]:<25} {item['count']}")
+    print("\nTroque essas senhas o quanto antes.")
+
+
 def import_passwords_interactive():
     """
     Interface interativa para importar senhas de um arquivo JSON.
@@ -292,6 +373,42 @@ def import_passwords_interactive():
         return None
 
 
+def bulk_import_interactive(pm: JSONPasswordManager):
+    """Importa todos os wallets de um diretório (ou padrão como equipe/*.json) de uma vez"""
+    print("\n--- Importar Vários Wallets ---")
+    pattern = input("Diretório ou padrão dos arquivos (ex.: equipe/*.json): ").strip()
+    if not pattern:
+        print("Caminho vazio. Operação cancelada.")
+        return
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.json")
+    # O próprio wallet pode estar no mesmo diretório
+    import_files = [
+        path for path in sorted(glob.glob(pattern))
+        if os.path.abspath(path) != os.path.abspath(pm.json_file)
+    ]
+    if not import_files:
+        print(f"Nenhum arquivo encontrado em: {pattern}")
+        return
+
+    master_password = getpass("Senha mestra dos arquivos (Enter: a mesma deste wallet): ") or pm.master_password
+
+    def report(done: int, total: int, import_file: str, entries: int, error: Optional[str]):
+        status = f"✗ {error}" if error else f"✓ {entries} senha(s)"
+        print(f"[{done}/{total}] {os.path.basename(import_file)}: {status}")
+
+    try:
+        result = import_wallets(pm, import_files, master_password, progress=report)
+    except Exception as e:
+        print(f"\n✗ Erro ao salvar as senhas importadas: {e}")
+        return
+    print(f"\n✓ {result.added} senha(s) adicionada(s) de {len(result.files)} arquivo(s)")
+    if result.added < result.imported:
+        print(f"  {result.imported - result.added} senha(s) já existiam e foram ignoradas")
+    if result.errors:
+        print(f"✗ {len(result.errors)} arquivo(s) não puderam ser importados")
+
+
 def main():
     """Função principal"""
     print("Bem-vindo ao Gerenciador de Senhas!")
@@ -337,8 +454,10 @@ def main():
             if imported_data:
                 # Se importou mas o arquivo já existia, adiciona as senhas
                 imported_entries, _ = imported_data
-                pm.import_entries(imported_entries)
-                print(f"\n✓ {len(imported_entries)} senha(s) adicionada(s) ao seu arquivo local!")
+                added = pm.import_entries(imported_entries)
+                print(f"\n✓ {added} senha(s) adicionada(s) ao seu arquivo local!")
+                if added < len(imported_entries):
+                    print(f"  {len(imported_entries) - added} senha(s) já existiam e foram ignoradas")
     except Exception as e:
         print(f"Erro ao inicializar: {e}")
         sys.exit(1)
@@ -348,6 +467,7 @@ def main():
         choice = input("\nEscolha uma opção: ").strip()
         
         if choice == '0':
+            pm.close()
             print("Até logo!")
             break
         elif choice == '1':
@@ -362,6 +482,12 @@ def main():
             delete_password_interactive(pm)
         elif choice == '6':
             generate_test_password()
+        elif choice == '7':
+            strength_report(pm)
+        elif choice == '8':
+            breach_report(pm)
+        elif choice == '9':
+            bulk_import_interactive(pm)
         else:
             print("Opção inválida!")
         
@@ -1,5 +1,7 @@
 from datetime import datetime
-from typing import List, Optional, Tuple
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 import sys
 import os
 
@@ -11,12 +13,52 @@ sys.path.insert(0, local_dir)
 sys.path.insert(0, os.path.join(local_dir, "..", "backend"))
 
 from password_generator import PasswordGenerator
+from password_policy import PasswordPolicy, compile_policy
+from strength import estimate, estimate_batch
+from breach_index import BreachIndex, default_index, password_digest
 from encryption import EncryptionManager
-from Crypto.Cipher import AES
-from Crypto.Protocol.KDF import PBKDF2
-from Crypto.Hash import SHA256
+from journal import JournalError, WalletJournal
+import atomic_io
+import wallet_codec
+import wallet_compression
+import wallet_reader
 import json
 import base64
+import threading
+
+
+# Journal de alterações, ao lado do snapshot (passwords.json.journal)
+JOURNAL_SUFFIX = ".journal"
+
+# Formatos do arquivo local (meta.serialization.format)
+# - json (1.0): todas as entradas, senhas incluídas, em um único blob cifrado
+# - records (2.0): metadados em um blob e cada senha em um registro próprio,
+#   decifrada só quando pedida
+# - binary (3.0): como json, com as entradas no formato binário de wallet_codec.py
+WALLET_FORMATS = {"json": "1.0", "records": "2.0", "binary": "3.0"}
+DEFAULT_WALLET_FORMAT = "records"
+
+# Mesmos formatos com o payload compacto e comprimido antes da cifragem
+# (meta.serialization.compression diz o método)
+COMPRESSED_WALLET_FORMATS = {"json": "1.1", "records": "2.1", "binary": "3.1"}
+
+# Usos das subchaves HKDF do formato records
+METADATA_KEY = "metadata"
+PASSWORD_KEY = "password"
+
+
+def _mutation(method):
+    """
+    Serializa o método com as demais alterações do vault e com flush()
+
+    O autosave grava pela thread do timer: sem isso ele cifraria uma senha
+    enquanto update_password a troca e o seal() trocaria a nova pela velha.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._mutation_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class PasswordEntry:
@@ -37,151 +79,753 @@ class PasswordEntry:
         expiration_date: Optional[datetime],
         created_at: datetime,
         updated_at: datetime,
+        entropy_level: Optional[str] = None,
+        sealed_password: Optional[bytes] = None,
+        unseal: Optional[Callable[[int, bytes], str]] = None,
     ):
         self.id = id
         self.title = title
         self.site = site
         self.password = password
+        # Wallet por registros: a senha fica cifrada e só é decifrada quando lida
+        self.sealed_password = sealed_password
+        self._unseal = unseal
         self.length = length
         self.use_uppercase = use_uppercase
         self.use_lowercase = use_lowercase
         self.use_digits = use_digits
         self.use_special = use_special
         self.entropy = entropy
+        # Gravado com a entrada; só é calculado para arquivos antigos
+        self.entropy_level = entropy_level or PasswordGenerator.get_entropy_level(entropy)
         self.expiration_date = expiration_date
         self.created_at = created_at
         self.updated_at = updated_at
 
+    @property
+    def password(self) -> Optional[str]:
+        if self._password is None and self.sealed_password is not None:
+            return self._unseal(self.id, self.sealed_password)
+        return self._password
+
+    @password.setter
+    def password(self, value: Optional[str]):
+        self._password = value
+        self.sealed_password = None
+
+    def seal(self, sealed_password: bytes, unseal: Callable[[int, bytes], str]):
+        """Troca a senha em texto claro pela versão cifrada"""
+        # Nesta ordem, quem lê password ao mesmo tempo vê uma das duas versões
+        self._unseal = unseal
+        self.sealed_password = sealed_password
+        self._password = None
+
 
 class JSONPasswordManager:
-    def __init__(self, master_password: str, json_file: str = "passwords.json"):
+    # Tamanho do journal a partir do qual ele é incorporado a um novo snapshot
+    JOURNAL_COMPACT_BYTES = int(os.getenv("LOCAL_JOURNAL_COMPACT_BYTES", str(64 * 1024)))
+
+    def __init__(
+        self,
+        master_password: str,
+        json_file: str = "passwords.json",
+        wallet_format: Optional[str] = None,
+        autosave_delay: float = 0,
+        background_writes: bool = False,
+        on_durable: Optional[Callable[[Optional[Exception]], None]] = None,
+        compression: Optional[str] = "auto",
+    ):
+        """
+        Args:
+            master_password: Senha mestra do wallet
+            json_file: Caminho do arquivo do wallet
+            wallet_format: "json" ou "records" (padrão: o formato do arquivo,
+                ou DEFAULT_WALLET_FORMAT para um wallet novo); um wallet em
+                outro formato é convertido ao abrir
+            autosave_delay: Segundos sem alterações até gravar as pendentes
+                de uma vez (0 grava cada alteração na hora)
+            background_writes: Snapshots completos (import, compact, autosave
+                com import) são cifrados e gravados na thread de compactação,
+                sem bloquear quem chamou
+            on_durable: Chamado pela thread de compactação quando um
+                snapshot está em disco (com None) ou falhou (com a exceção)
+            compression: Compressão dos snapshots ("zlib", "zstd" ou None;
+                "auto" usa wallet_compression.default_method())
+        """
+        if wallet_format is not None and wallet_format not in WALLET_FORMATS:
+            raise ValueError(f"Formato de wallet desconhecido: {wallet_format}")
+        if compression == "auto":
+            compression = wallet_compression.default_method()
+        if compression is not None and compression not in wallet_compression.available_methods():
+            raise ValueError(f"Compressão não suportada: {compression}")
+        self.compression = compression
         self.json_file = json_file
         self.master_password = master_password
+        self.wallet_format = wallet_format
         self.encryption_manager = None
-        self.entries: List[PasswordEntry] = []
         self.next_id = 1
 
+        # Entradas por id (na ordem do vault) e índices por site e título
+        self._entries: Dict[int, PasswordEntry] = {}
+        self._by_site: Dict[str, Dict[int, PasswordEntry]] = {}
+        self._by_title: Dict[str, Dict[int, PasswordEntry]] = {}
+
+        # Alterações vão para o journal; o snapshot é refeito em segundo plano
+        self.journal: Optional[WalletJournal] = None
+        self._journal_lock = threading.RLock()
+        # Alterações do vault e flush() (inclusive o do autosave); a thread
+        # de compactação não o usa, então flush() pode esperá-la
+        self._mutation_lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+
+        # Alterações ainda não gravadas (batch ou autosave): id -> entrada,
+        # ou None para uma remoção
+        self.autosave_delay = autosave_delay
+        self.background_writes = background_writes
+        self.on_durable = on_durable
+        self._pending: Dict[int, Optional[PasswordEntry]] = {}
+        self._pending_snapshot = False
+        self._autosave_timer: Optional[threading.Timer] = None
+        # Erro do último autosave, levantado na próxima alteração
+        self._autosave_error: Optional[Exception] = None
+        self._batch_depth = 0
+        self._batch_backup: Optional[Dict[int, dict]] = None
+
         self._load_or_create()
 
+    @property
+    def entries(self) -> List[PasswordEntry]:
+        """Entradas na ordem do vault"""
+        return list(self._entries.values())
+
+    @staticmethod
+    def _index_key(value: str) -> str:
+        """Chave dos índices de site e título (sem diferença de caixa e espaços nas pontas)"""
+        return value.strip().casefold()
+
+    def _index_entry(self, entry: PasswordEntry):
+        self._entries[entry.id] = entry
+        self._by_site.setdefault(self._index_key(entry.site), {})[entry.id] = entry
+        self._by_title.setdefault(self._index_key(entry.title), {})[entry.id] = entry
+
+    def _unindex_entry(self, entry: PasswordEntry):
+        """Remove a entrada dos índices de site e título (o índice por id fica)"""
+        for index, value in ((self._by_site, entry.site), (self._by_title, entry.title)):
+            key = self._index_key(value)
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(entry.id, None)
+                if not bucket:
+                    del index[key]
+
+    def _reset_entries(self, entries: List[PasswordEntry]):
+        self._entries = {}
+        self._by_site = {}
+        self._by_title = {}
+        for entry in entries:
+            self._index_entry(entry)
+            if entry.id >= self.next_id:
+                self.next_id = entry.id + 1
+
+    @staticmethod
+    def _entry_to_dict(entry: PasswordEntry, include_password: bool = True) -> dict:
+        entry_data = {
+            "id": entry.id,
+            "title": entry.title,
+            "site": entry.site,
+            "length": entry.length,
+            "use_uppercase": entry.use_uppercase,
+            "use_lowercase": entry.use_lowercase,
+            "use_digits": entry.use_digits,
+            "use_special": entry.use_special,
+            "entropy": entry.entropy,
+            "entropy_level": entry.entropy_level,
+            "expiration_date": (
+                entry.expiration_date.isoformat() if entry.expiration_date else None
+            ),
+            "created_at": entry.created_at.isoformat(),
+            "updated_at": entry.updated_at.isoformat(),
+        }
+        if include_password:
+            entry_data["password"] = entry.password
+        return entry_data
+
+    @staticmethod
+    def _entry_from_dict(
+        entry_data: Union[dict, PasswordEntry],
+        default_id: Optional[int] = None,
+        unseal: Optional[Callable[[int, bytes], str]] = None,
+    ) -> PasswordEntry:
+        """
+        Monta a entrada a partir do dicionário gravado
+
+        No formato records a senha vem cifrada em "secret" e fica assim até
+        ser lida (unseal decifra sob demanda). Entradas lidas do formato
+        binary já chegam prontas.
+        """
+        if isinstance(entry_data, PasswordEntry):
+            return entry_data
+        secret = entry_data.get("secret")
+        return PasswordEntry(
+            id=entry_data["id"] if default_id is None else entry_data.get("id", default_id),
+            title=entry_data["title"],
+            site=entry_data["site"],
+            password=entry_data.get("password") if secret is None else None,
+            sealed_password=base64.b64decode(secret) if secret is not None else None,
+            unseal=unseal,
+            length=entry_data["length"],
+            use_uppercase=entry_data["use_uppercase"],
+            use_lowercase=entry_data["use_lowercase"],
+            use_digits=entry_data["use_digits"],
+            use_special=entry_data["use_special"],
+            entropy=entry_data["entropy"],
+            entropy_level=entry_data.get("entropy_level"),
+            expiration_date=(
+                datetime.fromisoformat(entry_data["expiration_date"])
+                if entry_data.get("expiration_date")
+                else None
+            ),
+            created_at=datetime.fromisoformat(entry_data["created_at"]),
+            updated_at=datetime.fromisoformat(entry_data["updated_at"]),
+        )
+
+    @staticmethod
+    def _password_aad(entry_id: int) -> bytes:
+        # O id no AAD impede trocar a senha cifrada de uma entrada pela de outra
+        return f"{PASSWORD_KEY}:{entry_id}".encode("utf-8")
+
+    def _unseal_password(self, entry_id: int, sealed_password: bytes) -> str:
+        return self.encryption_manager.unseal(
+            PASSWORD_KEY, sealed_password, aad=self._password_aad(entry_id)
+        ).decode("utf-8")
+
+    def _seal_password(self, entry: PasswordEntry) -> bytes:
+        """Cifra a senha da entrada (uma vez) e descarta o texto claro da memória"""
+        if entry.sealed_password is None:
+            sealed_password = self.encryption_manager.seal(
+                PASSWORD_KEY, entry.password.encode("utf-8"), aad=self._password_aad(entry.id)
+            )
+            entry.seal(sealed_password, self._unseal_password)
+        return entry.sealed_password
+
+    def _entry_data(self, entry: PasswordEntry) -> dict:
+        """Entrada como é gravada no formato do wallet (snapshot e journal)"""
+        if self.wallet_format != "records":
+            return self._entry_to_dict(entry)
+        entry_data = self._entry_to_dict(entry, include_password=False)
+        entry_data["secret"] = base64.b64encode(self._seal_password(entry)).decode("utf-8")
+        return entry_data
+
+    @staticmethod
+    def _open_records(
+        encryption_manager: EncryptionManager,
+        data_section: dict,
+        salt: Optional[bytes] = None,
+        compression: Optional[str] = None,
+        unseal: Optional[Callable[[int, bytes], str]] = None,
+    ) -> Iterator[PasswordEntry]:
+        """
+        Decifra o blob de metadados de um wallet no formato records
+
+        As senhas não são decifradas: cada entrada recebe a sua, ainda
+        cifrada, e unseal a decifra quando for lida.
+
+        Args:
+            encryption_manager: Gerenciador com a senha mestra do wallet
+            data_section: Seção "data" do arquivo (de wallet_reader.open_wallet)
+            salt: Salt do wallet (padrão: o do gerenciador)
+            compression: Compressão do blob (meta.serialization.compression)
+            unseal: Decifra a senha de uma entrada
+
+        Returns:
+            Entradas, montadas uma a uma enquanto o blob é lido
+        """
+        metadata_encrypted = data_section.get("metadata_encrypted")
+        if not metadata_encrypted:
+            return
+        metadata_json = encryption_manager.unseal_stream(
+            METADATA_KEY, metadata_encrypted, aad=METADATA_KEY.encode("utf-8"), salt=salt,
+        )
+        secrets = data_section.get("passwords_encrypted", {})
+        for entry_data in wallet_reader.iter_json_entries(
+            wallet_compression.decompress_chunks(metadata_json, compression)
+        ):
+            entry_data["secret"] = secrets[str(entry_data["id"])]
+            yield JSONPasswordManager._entry_from_dict(entry_data, unseal=unseal)
+
+    @staticmethod
+    def _file_format(meta: dict) -> str:
+        """Formato de um arquivo pelo meta.serialization (json para arquivos antigos)"""
+        serialization_format = meta.get("serialization", {}).get("format", "json")
+        return serialization_format if serialization_format in WALLET_FORMATS else "json"
+
+    @staticmethod
+    def _payload_entries(
+        payload: bytearray,
+        file_format: str,
+        compression: Optional[str] = None,
+        default_id: Optional[int] = None,
+    ) -> Iterator[PasswordEntry]:
+        """
+        Entradas do payload decifrado de um snapshot json ou binary
+
+        O json é lido por partes (descomprimidas sob demanda) e cada entrada
+        é montada assim que lida, sem a árvore do json inteira na memória.
+        """
+        if file_format == "binary":
+            return iter(wallet_codec.decode_entries(
+                wallet_compression.decompress(payload, compression), PasswordEntry
+            ))
+        return (
+            JSONPasswordManager._entry_from_dict(entry_data, default_id=default_id)
+            for entry_data in wallet_reader.iter_json_entries(
+                wallet_compression.decompress_chunks(payload, compression)
+            )
+        )
+
+    @staticmethod
+    def _apply_record(entries: Dict[int, dict], record: dict):
+        """Aplica um registro do journal às entradas (dict id -> entrada, na ordem do vault)"""
+        if record["op"] == "put":
+            entries[record["entry"]["id"]] = record["entry"]
+        elif record["op"] == "delete":
+            entries.pop(record["id"], None)
+        elif record["op"] == "batch":
+            for batch_record in record["records"]:
+                JSONPasswordManager._apply_record(entries, batch_record)
+        else:
+            raise JournalError(f"Operação desconhecida no journal: {record['op']}")
+
+    @staticmethod
+    def _replay_journals(
+        json_file: str,
+        meta: dict,
+        key_source,
+        entries: Dict[int, dict],
+        repair: bool = True,
+    ) -> Tuple[bool, Optional[WalletJournal]]:
+        """
+        Reaplica sobre entries os journals do snapshot
+
+        Args:
+            json_file: Caminho do snapshot
+            meta: Metadados do snapshot (com a geração do journal)
+            key_source: Devolve a chave AES do wallet
+            entries: Entradas do snapshot por id (alteradas no lugar)
+            repair: Trunca um registro incompleto no fim do journal
+
+        Returns:
+            (True se o snapshot precisa ser refeito, journal da geração do
+            snapshot pronto para novos appends ou None)
+        """
+        generation_hex = meta.get("journal", {}).get("generation")
+        generation = bytes.fromhex(generation_hex) if generation_hex else None
+        needs_compaction = False
+        current = None
+
+        journal = WalletJournal(json_file + JOURNAL_SUFFIX, key_source)
+        journal_generation = journal.read_generation()
+        if journal_generation is not None:
+            if journal_generation == generation:
+                for record in journal.replay(repair):
+                    JSONPasswordManager._apply_record(entries, record)
+                current = journal
+            else:
+                # Já incorporado ao snapshot por uma compactação anterior
+                needs_compaction = True
+
+        # Compactação interrompida: alterações feitas depois da cópia do snapshot
+        pending = WalletJournal(json_file + JOURNAL_SUFFIX + ".next", key_source)
+        if pending.read_generation() is not None:
+            for record in pending.replay(repair):
+                JSONPasswordManager._apply_record(entries, record)
+            needs_compaction = True
+        return needs_compaction, current
+
     def _load_or_create(self):
-        """Carrega o arquivo JSON existente ou cria um novo"""
+        """Carrega o snapshot e o journal existentes ou cria um novo wallet"""
         try:
-            with open(self.json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            # Arquivo mapeado: os blobs são decifrados por partes, direto do disco
+            with wallet_reader.open_wallet(self.json_file) as data:
+                meta = data.get("meta", {})
+                encryption_info = meta.get("encryption", {})
+
+                salt_b64 = encryption_info.get("salt")
+                if salt_b64:
+                    self.encryption_manager = EncryptionManager(
+                        self.master_password, salt=salt_b64
+                    )
+                else:
+                    self.encryption_manager = EncryptionManager(self.master_password)
+
+                compression = meta.get("serialization", {}).get("compression")
+                file_format = self._file_format(meta)
+                if self.wallet_format is None:
+                    self.wallet_format = file_format
+
+                entries_by_id: Dict[int, Union[dict, PasswordEntry]] = {}
+                entries_encrypted = data.get("data", {}).get("entries_encrypted")
+                if file_format == "records":
+                    for entry in self._open_records(
+                        self.encryption_manager, data.get("data", {}),
+                        compression=compression, unseal=self._unseal_password,
+                    ):
+                        entries_by_id[entry.id] = entry
+                elif entries_encrypted:
+                    payload = self.encryption_manager.decrypt_stream(entries_encrypted)
+                    for entry in self._payload_entries(payload, file_format, compression):
+                        entries_by_id[entry.id] = entry
+                    del payload
+
+            needs_compaction, journal = self._replay_journals(
+                self.json_file, meta, lambda: self.encryption_manager.key, entries_by_id
+            )
 
-            meta = data.get("meta", {})
-            encryption_info = meta.get("encryption", {})
+            self._reset_entries([
+                self._entry_from_dict(entry_data, unseal=self._unseal_password)
+                for entry_data in entries_by_id.values()
+            ])
 
-            salt_b64 = encryption_info.get("salt")
-            if salt_b64:
-                self.encryption_manager = EncryptionManager(
-                    self.master_password, salt=salt_b64
-                )
+            # Wallet em outro formato: convertido no primeiro snapshot
+            if needs_compaction or journal is None or self.wallet_format != file_format:
+                self._save()
             else:
-                self.encryption_manager = EncryptionManager(self.master_password)
-
-            entries_encrypted = data.get("data", {}).get("entries_encrypted", "")
-            if entries_encrypted:
-                entries_blob = base64.b64decode(entries_encrypted)
-                entries_json = self.encryption_manager.decrypt(entries_blob)
-                entries_data = json.loads(entries_json)
-
-                self.entries = []
-                for entry_data in entries_data.get("entries", []):
-                    entry = PasswordEntry(
-                        id=entry_data["id"],
-                        title=entry_data["title"],
-                        site=entry_data["site"],
-                        password=entry_data["password"],
-                        length=entry_data["length"],
-                        use_uppercase=entry_data["use_uppercase"],
-                        use_lowercase=entry_data["use_lowercase"],
-                        use_digits=entry_data["use_digits"],
-                        use_special=entry_data["use_special"],
-                        entropy=entry_data["entropy"],
-                        expiration_date=(
-                            datetime.fromisoformat(entry_data["expiration_date"])
-                            if entry_data.get("expiration_date")
-                            else None
-                        ),
-                        created_at=datetime.fromisoformat(entry_data["created_at"]),
-                        updated_at=datetime.fromisoformat(entry_data["updated_at"]),
-                    )
-                    self.entries.append(entry)
-                    if entry.id >= self.next_id:
-                        self.next_id = entry.id + 1
+                self.journal = journal
         except FileNotFoundError:
 
             self.encryption_manager = EncryptionManager(self.master_password)
-            self.entries = []
+            self.wallet_format = self.wallet_format or DEFAULT_WALLET_FORMAT
+            self._reset_entries([])
             self._save()
         except Exception as e:
             raise Exception(f"Erro ao carregar arquivo: {e}")
 
-    def _save(self):
-        """Salva as entradas no arquivo JSON no formato especificado"""
-
-        entries_data = {"entries": []}
-
-        for entry in self.entries:
-            entry_dict = {
-                "id": entry.id,
-                "title": entry.title,
-                "site": entry.site,
-                "password": entry.password,
-                "length": entry.length,
-                "use_uppercase": entry.use_uppercase,
-                "use_lowercase": entry.use_lowercase,
-                "use_digits": entry.use_digits,
-                "use_special": entry.use_special,
-                "entropy": entry.entropy,
-                "expiration_date": (
-                    entry.expiration_date.isoformat() if entry.expiration_date else None
-                ),
-                "created_at": entry.created_at.isoformat(),
-                "updated_at": entry.updated_at.isoformat(),
-            }
-            entries_data["entries"].append(entry_dict)
+    def _serialize_entries(self) -> dict:
+        """
+        Copia as entradas para um snapshot (feito sob o lock do journal)
 
-        entries_json = json.dumps(entries_data, ensure_ascii=False, indent=2)
-        entries_blob = self.encryption_manager.encrypt(entries_json)
-        entries_encrypted = base64.b64encode(entries_blob).decode("utf-8")
+        No formato records as senhas já saem cifradas, uma por registro; o
+        blob de metadados é cifrado depois, por _write_snapshot.
+        """
+        if self.wallet_format == "records":
+            metadata = []
+            passwords = {}
+            for entry in self._entries.values():
+                entry_data = self._entry_data(entry)
+                passwords[str(entry.id)] = entry_data.pop("secret")
+                metadata.append(entry_data)
+            entries_json = json.dumps({"entries": metadata}, ensure_ascii=False, separators=(",", ":"))
+            return {"entries": entries_json, "passwords": passwords}
+
+        if self.wallet_format == "binary":
+            return {"entries": wallet_codec.encode_entries(self._entries.values()), "passwords": None}
+
+        entries_data = {"entries": [self._entry_to_dict(entry) for entry in self._entries.values()]}
+        if self.compression is None:
+            entries_json = json.dumps(entries_data, ensure_ascii=False, indent=2)
+        else:
+            entries_json = json.dumps(entries_data, ensure_ascii=False, separators=(",", ":"))
+        return {"entries": entries_json, "passwords": None}
 
+    def _write_snapshot(self, snapshot: dict, generation: bytes):
+        """Cifra e grava o snapshot (arquivo temporário + rename)"""
         metadata = self.encryption_manager.get_metadata()
 
         salt_b64 = metadata["salt"]
 
-        nonce_start = 16
-        nonce_end = nonce_start + 12
-        nonce_bytes = entries_blob[nonce_start:nonce_end]
-        nonce_b64 = base64.b64encode(nonce_bytes).decode("utf-8")
-
         kdf_hash = metadata.get("kdf_hash", "SHA256")
         if kdf_hash == "SHA256":
             kdf_hash = "SHA-256"
 
+        encryption = {
+            "algorithm": "AES-GCM",
+            "kdf": metadata.get("kdf", "PBKDF2"),
+            "kdf_hash": kdf_hash,
+            "kdf_iterations": metadata.get("kdf_iterations", 300000),
+            "salt": salt_b64,
+        }
+
+        payload = snapshot["entries"]
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        payload = wallet_compression.compress(payload, self.compression)
+        if self.wallet_format == "records":
+            metadata_blob = self.encryption_manager.seal(
+                METADATA_KEY, payload, aad=METADATA_KEY.encode("utf-8")
+            )
+            encryption["record_keys"] = "HKDF-SHA256"
+            encryption["tag_bytes"] = 16
+            serialization = {"format": "records", "encoding": "utf-8"}
+            data_section = {
+                "metadata_encrypted": base64.b64encode(metadata_blob).decode("utf-8"),
+                "passwords_encrypted": snapshot["passwords"],
+            }
+        else:
+            entries_blob = self.encryption_manager.encrypt(payload)
+            entries_encrypted = base64.b64encode(entries_blob).decode("utf-8")
+
+            nonce_start = 16
+            nonce_end = nonce_start + 12
+            nonce_bytes = entries_blob[nonce_start:nonce_end]
+            encryption["nonce"] = base64.b64encode(nonce_bytes).decode("utf-8")
+            encryption["tag_bytes"] = 16
+            if self.wallet_format == "binary":
+                serialization = {"format": "binary", "codec_version": wallet_codec.FORMAT_VERSION}
+            else:
+                serialization = {"format": "json", "encoding": "utf-8", "indent": 2}
+            data_section = {"entries_encrypted": entries_encrypted}
+
+        if self.compression is not None:
+            serialization.pop("indent", None)
+            serialization["compression"] = self.compression
+            format_version = COMPRESSED_WALLET_FORMATS[self.wallet_format]
+        else:
+            format_version = WALLET_FORMATS[self.wallet_format]
+
         wallet_data = {
             "meta": {
-                "wallet_format_version": "1.0",
+                "wallet_format_version": format_version,
                 "app": {"name": "password-managment", "version": "1.0"},
                 "exported_at": datetime.now().isoformat() + "Z",
-                "encryption": {
-                    "algorithm": "AES-GCM",
-                    "kdf": metadata.get("kdf", "PBKDF2"),
-                    "kdf_hash": kdf_hash,
-                    "kdf_iterations": metadata.get("kdf_iterations", 300000),
-                    "salt": salt_b64,
-                    "nonce": nonce_b64,
-                    "tag_bytes": 16,
+                "encryption": encryption,
+                "serialization": serialization,
+                "journal": {
+                    "file": os.path.basename(self.json_file) + JOURNAL_SUFFIX,
+                    "generation": generation.hex(),
                 },
-                "serialization": {"format": "json", "encoding": "utf-8", "indent": 2},
             },
-            "data": {"entries_encrypted": entries_encrypted},
+            "data": data_section,
         }
 
-        with open(self.json_file, "w", encoding="utf-8") as f:
-            json.dump(wallet_data, f, ensure_ascii=False, indent=2)
+        indent = 2 if self.compression is None else None
+        atomic_io.atomic_write(self.json_file, json.dumps(wallet_data, ensure_ascii=False, indent=indent))
+
+    def _save(self):
+        """
+        Grava um snapshot completo e começa um journal vazio
 
+        Com background_writes o snapshot é gravado pela thread de
+        compactação (o wallet já aberto continua com o journal .next).
+        """
+        self.wait_for_compaction()
+        if self.background_writes and self.journal is not None:
+            with self._journal_lock:
+                if self._compaction is None and self.journal.path == self.json_file + JOURNAL_SUFFIX:
+                    self._start_compaction()
+                    return
+        with self._journal_lock:
+            generation = os.urandom(16)
+            self._write_snapshot(self._serialize_entries(), generation)
+            self.journal = WalletJournal(
+                self.json_file + JOURNAL_SUFFIX, lambda: self.encryption_manager.key
+            )
+            self.journal.start(generation)
+            WalletJournal(self.json_file + JOURNAL_SUFFIX + ".next", None).remove()
+
+    def _record(self, records: List[dict]):
+        """Grava alterações no journal e dispara a compactação se ele cresceu demais"""
+        with self._journal_lock:
+            size = self.journal.append(records)
+            if self._compaction is not None:
+                return
+            if self.journal.path == self.json_file + JOURNAL_SUFFIX:
+                if size >= self.JOURNAL_COMPACT_BYTES:
+                    self._start_compaction()
+                return
+
+        # A compactação em segundo plano falhou (o journal .next continua
+        # válido); tenta de novo aqui, para o erro chegar ao chamador
+        self._save()
+
+    def _record_put(self, entry: PasswordEntry):
+        if not self._defer(entry.id, entry):
+            self._record([{"op": "put", "entry": self._entry_data(entry)}])
+
+    def _record_delete(self, entry_id: int):
+        if not self._defer(entry_id, None):
+            self._record([{"op": "delete", "id": entry_id}])
+
+    def _defer(self, entry_id: int, entry: Optional[PasswordEntry]) -> bool:
+        """
+        Guarda a alteração para a próxima gravação (batch ou autosave)
+
+        Várias alterações da mesma entrada viram um único registro.
+
+        Returns:
+            False se as alterações são gravadas na hora
+        """
+        if not self._batch_depth and not self.autosave_delay:
+            return False
+        with self._journal_lock:
+            self._pending[entry_id] = entry
+        self._schedule_autosave()
+        return True
+
+    def _backup_entry(self, entry: PasswordEntry):
+        """Guarda o estado da entrada antes da primeira alteração dentro de um batch"""
+        if self._batch_backup is not None and entry.id not in self._batch_backup:
+            self._batch_backup[entry.id] = dict(entry.__dict__)
+
+    def _schedule_autosave(self):
+        """Reinicia a contagem do autosave a cada alteração (fora de um batch)"""
+        if self._batch_depth or not self.autosave_delay:
+            return
+        with self._journal_lock:
+            if self._autosave_timer is not None:
+                self._autosave_timer.cancel()
+            self._autosave_timer = threading.Timer(self.autosave_delay, self._autosave)
+            self._autosave_timer.daemon = True
+            self._autosave_timer.start()
+
+    def _autosave(self):
+        try:
+            with self._mutation_lock:
+                # Um batch começou enquanto o timer esperava: ele grava na saída
+                if self._batch_depth:
+                    return
+                self.flush()
+        except Exception as e:
+            # As alterações continuam pendentes; o erro é levantado na
+            # próxima alteração e flush()/close() tentam gravar de novo
+            with self._journal_lock:
+                self._autosave_error = e
+
+    def _raise_autosave_error(self):
+        """Levanta o erro do último autosave (uma vez), antes de alterar o vault"""
+        with self._journal_lock:
+            error, self._autosave_error = self._autosave_error, None
+        if error is not None:
+            raise error
+
+    @_mutation
+    def flush(self):
+        """
+        Grava de uma vez as alterações pendentes (um append no journal ou um snapshot)
+
+        Se um autosave falhou, as alterações dele são gravadas aqui; se a
+        gravação falhar de novo, o erro é levantado.
+        """
+        with self._journal_lock:
+            self._autosave_error = None
+            if self._autosave_timer is not None:
+                self._autosave_timer.cancel()
+                self._autosave_timer = None
+            changes, self._pending = self._pending, {}
+            snapshot, self._pending_snapshot = self._pending_snapshot, False
+        try:
+            if snapshot:
+                self._save()
+            elif changes:
+                records = [
+                    {"op": "put", "entry": self._entry_data(entry)} if entry is not None
+                    else {"op": "delete", "id": entry_id}
+                    for entry_id, entry in changes.items()
+                ]
+                # Um único registro: cifrado de uma vez e reaplicado inteiro ou não
+                self._record(records if len(records) == 1 else [{"op": "batch", "records": records}])
+        except Exception:
+            with self._journal_lock:
+                changes.update(self._pending)
+                self._pending = changes
+                self._pending_snapshot = self._pending_snapshot or snapshot
+            raise
+
+    @contextmanager
+    def batch(self) -> Iterator["JSONPasswordManager"]:
+        """
+        Agrupa alterações em uma única gravação
+
+        As alterações feitas dentro do bloco são gravadas juntas na saída
+        (um append no journal, ou um snapshot se houve import_entries). Se
+        o bloco levanta uma exceção ou a gravação falha, as entradas em
+        memória voltam ao estado do início do batch e nada é gravado.
+
+            with pm.batch():
+                for entry_id in ids:
+                    pm.update_password(entry_id, site="novo.example.com")
+        """
+        if self._batch_depth:
+            # Batch dentro de batch: faz parte do externo
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        with self._mutation_lock:
+            self.flush()
+            saved_entries = dict(self._entries)
+            saved_next_id = self.next_id
+            self._batch_backup = {}
+            self._batch_depth = 1
+        try:
+            yield self
+            self._batch_depth = 0
+            self.flush()
+        except BaseException:
+            with self._mutation_lock:
+                for entry_id, state in self._batch_backup.items():
+                    if entry_id in saved_entries:
+                        saved_entries[entry_id].__dict__.update(state)
+                self._reset_entries(list(saved_entries.values()))
+                self.next_id = saved_next_id
+                with self._journal_lock:
+                    self._pending = {}
+                    self._pending_snapshot = False
+            raise
+        finally:
+            self._batch_depth = 0
+            self._batch_backup = None
+
+    def _start_compaction(self):
+        """
+        Incorpora o journal a um novo snapshot em segundo plano
+
+        A cópia das entradas é feita aqui, sob o lock; alterações feitas
+        durante a compactação vão para um journal ".next" da nova geração,
+        que passa a ser o journal principal quando o snapshot é gravado.
+        """
+        snapshot = self._serialize_entries()
+        generation = os.urandom(16)
+        next_journal = WalletJournal(
+            self.json_file + JOURNAL_SUFFIX + ".next", lambda: self.encryption_manager.key
+        )
+        next_journal.start(generation)
+        self.journal = next_journal
+
+        def compact():
+            error = None
+            try:
+                self._write_snapshot(snapshot, generation)
+                with self._journal_lock:
+                    atomic_io.atomic_rename(next_journal.path, self.json_file + JOURNAL_SUFFIX)
+                    next_journal.path = self.json_file + JOURNAL_SUFFIX
+            except Exception as e:
+                # O journal .next continua válido: é reaplicado ao abrir e a
+                # próxima alteração refaz o snapshot em primeiro plano
+                error = e
+            finally:
+                self._compaction = None
+            if self.on_durable is not None:
+                self.on_durable(error)
+
+        self._compaction = threading.Thread(target=compact, name="wallet-compaction", daemon=True)
+        self._compaction.start()
+
+    def wait_for_compaction(self):
+        """Espera a compactação em andamento (se houver) terminar"""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+
+    @_mutation
+    def compact(self):
+        """Incorpora o journal ao snapshot agora (por exemplo antes de copiar o arquivo)"""
+        self._save()
+        self.wait_for_compaction()
+
+    @_mutation
     def create_password(
         self,
         title: str,
@@ -193,18 +837,43 @@ class JSONPasswordManager:
         use_special: bool = True,
         expiration_date: Optional[datetime] = None,
         custom_password: Optional[str] = None,
+        policy: Optional[PasswordPolicy] = None,
     ) -> int:
-        """Cria uma nova senha"""
+        """
+        Cria uma nova senha
+
+        Com policy, a senha é gerada pela política (que define tamanho e
+        tipos); uma senha customizada precisa atender a política.
+        """
+        self._raise_autosave_error()
+        compiled = None
+        if policy is not None:
+            compiled = compile_policy(policy)
+            length = policy.length
+            use_uppercase, use_lowercase, use_digits, use_special = policy.flags()
+            if custom_password:
+                problems = compiled.violations(custom_password)
+                if problems:
+                    raise ValueError("; ".join(problems))
+
         if custom_password:
             password = custom_password
+        elif compiled is not None:
+            password = compiled.generate()
         else:
             password = PasswordGenerator.generate(
                 length, use_uppercase, use_lowercase, use_digits, use_special
             )
 
-        entropy = PasswordGenerator.calculate_entropy(
-            length, use_uppercase, use_lowercase, use_digits, use_special
-        )
+        if custom_password:
+            # Senha escolhida pelo usuário: estima pelos padrões, não pelo charset
+            entropy = estimate(custom_password).entropy
+        elif compiled is not None:
+            entropy = compiled.entropy
+        else:
+            entropy = PasswordGenerator.calculate_entropy(
+                length, use_uppercase, use_lowercase, use_digits, use_special
+            )
 
         now = datetime.now()
         entry = PasswordEntry(
@@ -218,14 +887,15 @@ class JSONPasswordManager:
             use_digits=use_digits,
             use_special=use_special,
             entropy=entropy,
+            entropy_level=PasswordGenerator.get_entropy_level(entropy),
             expiration_date=expiration_date,
             created_at=now,
             updated_at=now,
         )
 
-        self.entries.append(entry)
+        self._index_entry(entry)
         self.next_id += 1
-        self._save()
+        self._record_put(entry)
 
         return entry.id
 
@@ -235,11 +905,36 @@ class JSONPasswordManager:
 
     def get_password(self, entry_id: int) -> Optional[Tuple[PasswordEntry, str]]:
         """Retorna a entrada e a senha descriptografada"""
-        for entry in self.entries:
-            if entry.id == entry_id:
-                return (entry, entry.password)
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            return None
+        return (entry, entry.password)
+
+    def find_by_site(self, site: str) -> List[PasswordEntry]:
+        """Entradas de um site (sem diferença de maiúsculas e espaços nas pontas)"""
+        return list(self._by_site.get(self._index_key(site), {}).values())
+
+    def find_by_title(self, title: str) -> List[PasswordEntry]:
+        """Entradas com um título (sem diferença de maiúsculas e espaços nas pontas)"""
+        return list(self._by_title.get(self._index_key(title), {}).values())
+
+    def find_duplicate(self, entry: PasswordEntry) -> Optional[PasswordEntry]:
+        """
+        Procura no vault uma entrada igual (mesmo site, título e senha)
+
+        Só as entradas do mesmo site e título são comparadas, então no
+        máximo algumas senhas são decifradas.
+        """
+        same_site = self._by_site.get(self._index_key(entry.site), {})
+        same_title = self._by_title.get(self._index_key(entry.title), {})
+        if len(same_title) < len(same_site):
+            same_site, same_title = same_title, same_site
+        for candidate in same_site.values():
+            if candidate.id in same_title and candidate is not entry and candidate.password == entry.password:
+                return candidate
         return None
 
+    @_mutation
     def update_password(
         self,
         entry_id: int,
@@ -255,19 +950,19 @@ class JSONPasswordManager:
         custom_password: Optional[str] = None,
     ) -> bool:
         """Atualiza uma senha"""
-        entry = None
-        for e in self.entries:
-            if e.id == entry_id:
-                entry = e
-                break
-
-        if not entry:
+        self._raise_autosave_error()
+        entry = self._entries.get(entry_id)
+        if entry is None:
             return False
-
-        if title is not None:
-            entry.title = title
-        if site is not None:
-            entry.site = site
+        self._backup_entry(entry)
+
+        if title is not None or site is not None:
+            self._unindex_entry(entry)
+            if title is not None:
+                entry.title = title
+            if site is not None:
+                entry.site = site
+            self._index_entry(entry)
         if length is not None:
             entry.length = length
         if use_uppercase is not None:
@@ -293,38 +988,151 @@ class JSONPasswordManager:
                     entry.use_special,
                 )
 
-        entry.entropy = PasswordGenerator.calculate_entropy(
-            entry.length,
-            entry.use_uppercase,
-            entry.use_lowercase,
-            entry.use_digits,
-            entry.use_special,
-        )
+        # A entropia é da senha: só muda quando a senha muda
+        if regenerate and custom_password:
+            entry.entropy = estimate(custom_password).entropy
+        elif regenerate:
+            entry.entropy = PasswordGenerator.calculate_entropy(
+                entry.length,
+                entry.use_uppercase,
+                entry.use_lowercase,
+                entry.use_digits,
+                entry.use_special,
+            )
+        entry.entropy_level = PasswordGenerator.get_entropy_level(entry.entropy)
         entry.updated_at = datetime.now()
 
-        self._save()
+        self._record_put(entry)
         return True
 
+    def strength_report(self) -> List[dict]:
+        """
+        Avalia a força real de todas as senhas do vault
+
+        Returns:
+            Lista (da mais fraca para a mais forte) com id, title, site,
+            entropy estimada, score (0-4) e reused (senha usada em mais de
+            uma entrada)
+        """
+        entries = self.entries
+        passwords = [entry.password for entry in entries]
+        usage = {}
+        for password in passwords:
+            usage[password] = usage.get(password, 0) + 1
+
+        report = []
+        for entry, result in zip(entries, estimate_batch(passwords)):
+            report.append({
+                "id": entry.id,
+                "title": entry.title,
+                "site": entry.site,
+                "entropy": result.entropy,
+                "score": result.score,
+                "reused": usage[entry.password] > 1,
+            })
+        report.sort(key=lambda item: (item["score"], item["entropy"]))
+        return report
+
+    def audit_breaches(self, index: Optional[BreachIndex] = None) -> List[dict]:
+        """
+        Procura as senhas do vault no índice local de vazamentos
+
+        Nenhuma senha sai da máquina: os hashes são consultados de uma vez
+        no índice mapeado em memória (breach_index.py).
+
+        Args:
+            index: Índice a consultar (padrão: o configurado em BREACH_INDEX_DIR)
+
+        Returns:
+            Lista (da mais para a menos vazada) com id, title, site e count
+            das entradas cuja senha aparece em vazamentos
+        """
+        index = index if index is not None else default_index()
+        if index is None:
+            raise FileNotFoundError(
+                "Índice de vazamentos não encontrado; gere-o com breach_index.py build"
+            )
+
+        entries = self.entries
+        counts = index.count_many(password_digest(entry.password) for entry in entries)
+        report = [
+            {"id": entry.id, "title": entry.title, "site": entry.site, "count": count}
+            for entry, count in zip(entries, counts)
+            if count
+        ]
+        report.sort(key=lambda item: item["count"], reverse=True)
+        return report
+
+    @_mutation
     def delete_password(self, entry_id: int) -> bool:
         """Deleta uma senha"""
-        for i, entry in enumerate(self.entries):
-            if entry.id == entry_id:
-                self.entries.pop(i)
-                self._save()
-                return True
-        return False
+        self._raise_autosave_error()
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        self._unindex_entry(entry)
+        self._record_delete(entry_id)
+        return True
+
+    def close(self):
+        """Grava as alterações pendentes, termina a compactação e zera as chaves derivadas (ao bloquear o wallet ou sair)"""
+        try:
+            self.flush()
+            self.wait_for_compaction()
+        finally:
+            if self.encryption_manager is not None:
+                self.encryption_manager.clear()
+
+    @staticmethod
+    def _decrypt_import(
+        encryption_manager: EncryptionManager,
+        entries_blob: "wallet_reader.Base64Value",
+        nonce_b64: Optional[str],
+        salt_b64: str,
+        kdf_iterations: int,
+        kdf_hash: str,
+    ) -> bytearray:
+        """Descriptografa o blob de um arquivo importado nos dois formatos suportados"""
+        salt = base64.b64decode(salt_b64)
+        if not nonce_b64:
+            return encryption_manager.decrypt_stream(entries_blob)
+
+        nonce = base64.b64decode(nonce_b64)
+        if entries_blob.read(0, len(salt) + len(nonce)) == salt + nonce:
+            # Wallet salvo por esta versão local: salt+nonce+tag+ciphertext no blob
+            return encryption_manager.decrypt_stream(entries_blob)
+
+        TAG_SIZE = 16
+        if len(entries_blob) < TAG_SIZE:
+            raise Exception("Arquivo corrompido: dados insuficientes")
+
+        ciphertext_size = len(entries_blob) - TAG_SIZE
+        key = encryption_manager.derive_key(salt, kdf_iterations, kdf_hash)
+        return encryption_manager.decrypt_chunks(
+            key, nonce, entries_blob.read(ciphertext_size, len(entries_blob)),
+            entries_blob.chunks(0, ciphertext_size), ciphertext_size,
+        )
 
     @staticmethod
-    def import_from_json(import_file: str, master_password: str) -> List[PasswordEntry]:
+    def import_from_json(
+        import_file: str,
+        master_password: str,
+        encryption_manager: Optional[EncryptionManager] = None,
+    ) -> List[PasswordEntry]:
         """
         Importa senhas de um arquivo JSON externo.
         Suporta dois formatos:
         1. Formato do frontend: salt/nonce no metadata, ciphertext+tag em entries_encrypted
         2. Formato do backend: salt+nonce+tag+ciphertext tudo junto no blob
+        Também lê wallets locais no formato records e payloads comprimidos
+        (wallet_format_version 1.1/2.1, método em meta.serialization.compression).
+        O arquivo é mapeado em memória e decifrado por partes (wallet_reader.py).
 
         Args:
             import_file: Caminho para o arquivo JSON a ser importado
             master_password: Senha mestra para descriptografar o arquivo
+            encryption_manager: Gerenciador aberto com a mesma senha mestra,
+                cujo cache de chaves derivadas é reaproveitado
 
         Returns:
             Lista de PasswordEntry importadas
@@ -333,77 +1141,74 @@ class JSONPasswordManager:
             Exception: Se o arquivo não existir, formato inválido ou senha incorreta
         """
         try:
-            with open(import_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with wallet_reader.open_wallet(import_file) as data:
+                meta = data.get("meta", {})
+                encryption_info = meta.get("encryption", {})
 
-            meta = data.get("meta", {})
-            encryption_info = meta.get("encryption", {})
-
-            entries_encrypted = data.get("data", {}).get("entries_encrypted", "")
-            if not entries_encrypted:
-                return []
-
-            entries_blob = base64.b64decode(entries_encrypted)
-
-            nonce_b64 = encryption_info.get("nonce")
-            salt_b64 = encryption_info.get("salt")
-            kdf_iterations = encryption_info.get("kdf_iterations", 300000)
-
-            if nonce_b64 and salt_b64:
-
-                salt = base64.b64decode(salt_b64)
-                nonce = base64.b64decode(nonce_b64)
+                data_section = data.get("data", {})
+                file_format = JSONPasswordManager._file_format(meta)
+                is_records = file_format == "records"
+                compression = meta.get("serialization", {}).get("compression")
 
-                TAG_SIZE = 16
-                if len(entries_blob) < TAG_SIZE:
-                    raise Exception("Arquivo corrompido: dados insuficientes")
+                entries_encrypted = data_section.get("entries_encrypted")
+                if not entries_encrypted and not (is_records and data_section.get("metadata_encrypted")):
+                    return []
 
-                ciphertext = entries_blob[:-TAG_SIZE]
-                tag = entries_blob[-TAG_SIZE:]
-
-                key = PBKDF2(
-                    master_password.encode(),
-                    salt,
-                    dkLen=32,
-                    count=kdf_iterations,
-                    hmac_hash_module=SHA256,
-                )
-
-                cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
-                plaintext = cipher.decrypt_and_verify(ciphertext, tag)
-                entries_json = plaintext.decode("utf-8")
-            else:
+                nonce_b64 = encryption_info.get("nonce")
+                salt_b64 = encryption_info.get("salt")
+                kdf_iterations = encryption_info.get("kdf_iterations", 300000)
+                kdf_hash = encryption_info.get("kdf_hash", "SHA-256")
 
                 if not salt_b64:
                     raise Exception("Arquivo JSON inválido: salt não encontrado")
+                salt = base64.b64decode(salt_b64)
 
-                encryption_manager = EncryptionManager(master_password, salt=salt_b64)
-                entries_json = encryption_manager.decrypt(entries_blob)
-
-            entries_data = json.loads(entries_json)
-
-            imported_entries = []
-            for entry_data in entries_data.get("entries", []):
-                entry = PasswordEntry(
-                    id=entry_data.get("id", 0),
-                    title=entry_data["title"],
-                    site=entry_data["site"],
-                    password=entry_data["password"],
-                    length=entry_data["length"],
-                    use_uppercase=entry_data["use_uppercase"],
-                    use_lowercase=entry_data["use_lowercase"],
-                    use_digits=entry_data["use_digits"],
-                    use_special=entry_data["use_special"],
-                    entropy=entry_data["entropy"],
-                    expiration_date=(
-                        datetime.fromisoformat(entry_data["expiration_date"])
-                        if entry_data.get("expiration_date")
-                        else None
-                    ),
-                    created_at=datetime.fromisoformat(entry_data["created_at"]),
-                    updated_at=datetime.fromisoformat(entry_data["updated_at"]),
+                owns_manager = (
+                    encryption_manager is None
+                    or encryption_manager.master_password != master_password
                 )
-                imported_entries.append(entry)
+                if owns_manager:
+                    encryption_manager = EncryptionManager(master_password, salt=salt_b64)
+
+                def unseal(entry_id: int, sealed_password: bytes) -> str:
+                    return encryption_manager.unseal(
+                        PASSWORD_KEY, sealed_password,
+                        aad=JSONPasswordManager._password_aad(entry_id), salt=salt,
+                    ).decode("utf-8")
+
+                try:
+                    if is_records:
+                        entries_list = list(JSONPasswordManager._open_records(
+                            encryption_manager, data_section, salt, compression, unseal
+                        ))
+                    else:
+                        payload = JSONPasswordManager._decrypt_import(
+                            encryption_manager, entries_encrypted,
+                            nonce_b64, salt_b64, kdf_iterations, kdf_hash
+                        )
+                        entries_list = list(JSONPasswordManager._payload_entries(
+                            payload, file_format, compression, default_id=0
+                        ))
+                        del payload
+
+                    # Wallet local: alterações posteriores ao snapshot estão no journal
+                    if "journal" in meta:
+                        entries_by_id = {entry.id: entry for entry in entries_list}
+                        JSONPasswordManager._replay_journals(
+                            import_file, meta, lambda: encryption_manager.derive_key(salt), entries_by_id,
+                            repair=False,
+                        )
+                        entries_list = list(entries_by_id.values())
+
+                    imported_entries = []
+                    for entry_data in entries_list:
+                        entry = JSONPasswordManager._entry_from_dict(entry_data, default_id=0, unseal=unseal)
+                        # Decifra agora: a chave deste arquivo não fica disponível depois
+                        entry.password = entry.password
+                        imported_entries.append(entry)
+                finally:
+                    if owns_manager:
+                        encryption_manager.clear()
 
             return imported_entries
         except FileNotFoundError:
@@ -424,18 +1229,38 @@ class JSONPasswordManager:
                 raise Exception("Senha mestra incorreta ou arquivo corrompido")
             raise Exception(f"Erro ao importar arquivo: {e}")
 
-    def import_entries(self, imported_entries: List[PasswordEntry]):
+    @_mutation
+    def import_entries(self, imported_entries: List[PasswordEntry], skip_duplicates: bool = True) -> int:
         """
         Adiciona entradas importadas ao gerenciador atual.
         Reatribui IDs para evitar conflitos.
 
         Args:
             imported_entries: Lista de PasswordEntry a serem importadas
+            skip_duplicates: Ignora entradas que já estão no vault (mesmo
+                site, título e senha), inclusive repetidas no próprio import
+
+        Returns:
+            Quantidade de entradas adicionadas
         """
+        self._raise_autosave_error()
+        added = 0
         for entry in imported_entries:
+            # A senha cifrada está ligada ao id antigo (AAD): decifra antes de trocar
+            if entry.sealed_password is not None:
+                entry.password = entry.password
+
+            if skip_duplicates and self.find_duplicate(entry) is not None:
+                continue
 
             entry.id = self.next_id
             self.next_id += 1
-            self.entries.append(entry)
+            self._index_entry(entry)
+            added += 1
 
-        self._save()
+        if self._batch_depth or self.autosave_delay:
+            self._pending_snapshot = True
+            self._schedule_autosave()
+        else:
+            self._save()
+        return added
@@ -0,0 +1,187 @@
+"""
+Serialização binária das entradas do wallet local (formato "binary")
+
+Alternativa ao JSON para vaults grandes: cada entrada é um registro de
+tamanho fixo, sem chaves repetidas, aspas ou datas em texto, e as
+strings de todas as entradas ficam juntas em um bloco UTF-8 no fim. A
+leitura percorre os registros com memoryview sobre o payload decifrado,
+sem cópias intermediárias, e decodifica o bloco de strings de uma vez.
+
+Formato (little-endian):
+    cabeçalho  magic "PWBR" | versão u16 | reservado u16 | entradas u32
+    registros  id u32 | length u16 | flags u8 | nível u8 | entropy f64 |
+               created_at i64 | updated_at i64 | expiration_date i64 |
+               tamanhos de title, site e password (u32 cada, em caracteres)
+    strings    title, site e password de cada entrada, na ordem dos
+               registros, em UTF-8
+
+As datas são microssegundos desde 1970-01-01 (sem fuso, como as do
+wallet; com o bit FLAG_UTC são UTC). O nível de entropia é o índice em
+ENTROPY_LEVELS (NO_LEVEL faz o nível ser recalculado pela entropia).
+
+Conversão de um wallet existente:
+    python wallet_codec.py convert passwords.json binary
+"""
+import struct
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List
+
+
+MAGIC = b"PWBR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+RECORD = struct.Struct("<IHBBdqqqIII")
+
+FLAG_UPPERCASE = 1
+FLAG_LOWERCASE = 2
+FLAG_DIGITS = 4
+FLAG_SPECIAL = 8
+FLAG_EXPIRATION = 16
+FLAG_UTC = 32
+
+ENTROPY_LEVELS = ("Fraco", "Médio", "Forte", "Muito Forte")
+NO_LEVEL = 255
+_LEVEL_CODES = {level: code for code, level in enumerate(ENTROPY_LEVELS)}
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        return (value - _EPOCH_UTC) // _MICROSECOND
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def encode_entries(entries: Iterable) -> bytes:
+    """
+    Serializa as entradas (PasswordEntry) no formato binário
+
+    Raises:
+        ValueError: Se um campo não cabe no formato (id ou length fora do intervalo)
+    """
+    pack = RECORD.pack
+    records = [b""]
+    strings = []
+    for entry in entries:
+        title, site, password = entry.title, entry.site, entry.password
+        flags = (
+            (FLAG_UPPERCASE if entry.use_uppercase else 0)
+            | (FLAG_LOWERCASE if entry.use_lowercase else 0)
+            | (FLAG_DIGITS if entry.use_digits else 0)
+            | (FLAG_SPECIAL if entry.use_special else 0)
+        )
+        expiration = 0
+        if entry.expiration_date is not None:
+            flags |= FLAG_EXPIRATION
+            expiration = _to_micros(entry.expiration_date)
+        if entry.created_at.tzinfo is not None:
+            flags |= FLAG_UTC
+        try:
+            records.append(pack(
+                entry.id, entry.length, flags, _LEVEL_CODES.get(entry.entropy_level, NO_LEVEL),
+                entry.entropy, _to_micros(entry.created_at), _to_micros(entry.updated_at), expiration,
+                len(title), len(site), len(password),
+            ))
+        except struct.error as e:
+            raise ValueError(f"Entrada {entry.id} não cabe no formato binário: {e}")
+        strings.append(title)
+        strings.append(site)
+        strings.append(password)
+    records[0] = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(records) - 1)
+    records.append("".join(strings).encode("utf-8"))
+    return b"".join(records)
+
+
+def decode_entries(data, entry_factory) -> List:
+    """
+    Lê as entradas de um payload binário
+
+    Args:
+        data: Payload (bytes, bytearray ou memoryview)
+        entry_factory: Classe da entrada (PasswordEntry), chamada com os
+            campos por nome
+
+    Returns:
+        Lista de entradas, na ordem do payload
+
+    Raises:
+        ValueError: Se o payload não é do formato ou está truncado
+    """
+    view = memoryview(data)
+    if len(view) < HEADER.size:
+        raise ValueError("Payload binário truncado")
+    magic, version, _, count = HEADER.unpack_from(view, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Payload binário inválido")
+    strings_start = HEADER.size + count * RECORD.size
+    if len(view) < strings_start:
+        raise ValueError("Payload binário truncado")
+
+    text = str(view[strings_start:], "utf-8")
+    epoch, epoch_utc, microsecond = _EPOCH, _EPOCH_UTC, _MICROSECOND
+    position = 0
+    entries = []
+    for (entry_id, length, flags, level, entropy, created, updated, expiration,
+         title_len, site_len, password_len) in RECORD.iter_unpack(view[HEADER.size:strings_start]):
+        title_end = position + title_len
+        site_end = title_end + site_len
+        password_end = site_end + password_len
+        if password_end > len(text):
+            raise ValueError("Payload binário truncado")
+
+        base = epoch_utc if flags & FLAG_UTC else epoch
+        created_at = base + created * microsecond
+        entries.append(entry_factory(
+            id=entry_id,
+            title=text[position:title_end],
+            site=text[title_end:site_end],
+            password=text[site_end:password_end],
+            length=length,
+            use_uppercase=bool(flags & FLAG_UPPERCASE),
+            use_lowercase=bool(flags & FLAG_LOWERCASE),
+            use_digits=bool(flags & FLAG_DIGITS),
+            use_special=bool(flags & FLAG_SPECIAL),
+            entropy=entropy,
+            entropy_level=ENTROPY_LEVELS[level] if level < len(ENTROPY_LEVELS) else None,
+            expiration_date=base + expiration * microsecond if flags & FLAG_EXPIRATION else None,
+            created_at=created_at,
+            # Entradas nunca alteradas: o mesmo objeto (datetime é imutável)
+            updated_at=created_at if updated == created else base + updated * microsecond,
+        ))
+        position = password_end
+    return entries
+
+
+def convert_wallet(json_file: str, master_password: str, wallet_format: str):
+    """
+    Converte um wallet local para outro formato ("json", "records" ou "binary")
+
+    O journal pendente é incorporado ao snapshot convertido.
+    """
+    from password_manager import JSONPasswordManager
+
+    pm = JSONPasswordManager(master_password, json_file, wallet_format=wallet_format)
+    pm.compact()
+    pm.close()
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 4 or argv[1] != "convert":
+        print("Uso: python wallet_codec.py convert <wallet.json> <json|records|binary>")
+        return 2
+    import getpass
+
+    try:
+        convert_wallet(argv[2], getpass.getpass("Senha mestra: "), argv[3])
+    except Exception as e:
+        print(f"Erro ao converter wallet: {e}")
+        return 1
+    print(f"✓ {argv[2]} convertido para o formato {argv[3]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
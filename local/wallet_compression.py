@@ -0,0 +1,107 @@
+"""
+Compressão do payload do wallet local antes da cifragem
+
+O JSON das entradas é comprimido antes do AES-GCM (depois de cifrado
+ele não comprime mais). O método usado fica em
+meta.serialization.compression, para o arquivo ser lido por qualquer
+versão que conheça o método.
+"""
+import os
+import zlib
+from typing import Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstandard é opcional
+    zstandard = None
+
+
+METHODS = ("zlib", "zstd")
+CHUNK_SIZE = 1 << 18
+ZLIB_LEVEL = int(os.getenv("LOCAL_WALLET_ZLIB_LEVEL", "6"))
+ZSTD_LEVEL = int(os.getenv("LOCAL_WALLET_ZSTD_LEVEL", "3"))
+
+
+def available_methods():
+    """Métodos suportados nesta instalação"""
+    return [method for method in METHODS if method != "zstd" or zstandard is not None]
+
+
+def default_method() -> Optional[str]:
+    """
+    Método padrão para novos snapshots
+
+    LOCAL_WALLET_COMPRESSION escolhe o método ("none" desliga); sem a
+    variável, zstd quando instalado e zlib caso contrário.
+    """
+    method = os.getenv("LOCAL_WALLET_COMPRESSION")
+    if method is not None:
+        return None if method.lower() in ("", "none") else method.lower()
+    return "zstd" if zstandard is not None else "zlib"
+
+
+def compress(data: bytes, method: Optional[str]) -> bytes:
+    """
+    Comprime data com o método (None devolve data sem alteração)
+
+    Raises:
+        ValueError: Se o método não é suportado nesta instalação
+    """
+    if method is None:
+        return data
+    if method == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if method == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Compressão não suportada: {method}")
+
+
+def decompress(data: bytes, method: Optional[str]) -> bytes:
+    """
+    Descomprime data gravado com o método (None devolve data sem alteração)
+
+    Raises:
+        ValueError: Se o método não é suportado nesta instalação
+    """
+    if method is None:
+        return data
+    if method == "zlib":
+        return zlib.decompress(data)
+    if method == "zstd":
+        if zstandard is None:
+            raise ValueError("Wallet comprimido com zstd: instale o pacote zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Compressão não suportada: {method}")
+
+
+def decompress_chunks(data, method: Optional[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Como decompress(), devolvendo o resultado em partes
+
+    data é lido em partes de chunk_size bytes (sem método, as partes são
+    fatias de data, sem cópia), para o payload descomprimido inteiro não
+    precisar existir na memória.
+
+    Raises:
+        ValueError: Se o método não é suportado ou data está truncado
+    """
+    view = memoryview(data)
+    if method is None:
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset:offset + chunk_size]
+        return
+    if method == "zlib":
+        decompressor = zlib.decompressobj()
+    elif method == "zstd":
+        if zstandard is None:
+            raise ValueError("Wallet comprimido com zstd: instale o pacote zstandard")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        raise ValueError(f"Compressão não suportada: {method}")
+
+    for offset in range(0, len(view), chunk_size):
+        yield decompressor.decompress(view[offset:offset + chunk_size])
+    if method == "zlib":
+        yield decompressor.flush()
+    if not getattr(decompressor, "eof", True):
+        raise ValueError("Payload comprimido truncado")
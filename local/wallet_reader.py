@@ -0,0 +1,233 @@
+"""
+Leitura do arquivo do wallet local sem carregá-lo inteiro na memória
+
+O arquivo é mapeado com mmap e só a estrutura pequena (meta, chaves e as
+senhas cifradas do formato records) passa pelo json; os blobs grandes
+(entries_encrypted e metadata_encrypted) ficam no mapeamento como
+Base64Value e são decodificados por partes, direto para a decifragem.
+O payload decifrado é lido com iter_json_entries, uma entrada por vez.
+
+Com isso o pico de memória ao abrir um wallet fica perto de uma cópia do
+texto claro, em vez do arquivo, do base64 decodificado, do texto claro e
+da árvore do json ao mesmo tempo.
+"""
+import binascii
+import codecs
+import json
+import json.scanner
+import mmap
+import re
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+
+# Tamanho das partes decodificadas e decifradas (múltiplo de 3)
+CHUNK_SIZE = 3 << 18
+
+# Valores base64 grandes da seção "data", lidos do mapeamento
+MAPPED_VALUES = ("entries_encrypted", "metadata_encrypted")
+
+_MAPPED_VALUE = re.compile(rb'"(' + b"|".join(key.encode() for key in MAPPED_VALUES) + rb')"\s*:\s*"')
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class Base64Value:
+    """
+    Valor base64 de um arquivo mapeado, decodificado só no trecho pedido
+
+    Os offsets de read() e chunks() são dos bytes decodificados.
+    """
+
+    def __init__(self, buffer, start: int, end: int):
+        if (end - start) % 4:
+            raise ValueError("Base64 inválido: tamanho não é múltiplo de 4")
+        self._buffer = buffer
+        self._start = start
+        self._end = end
+        padding = 0
+        if end > start:
+            padding = (buffer[end - 1] == ord("=")) + (buffer[end - 2] == ord("="))
+        self._size = (end - start) // 4 * 3 - padding
+
+    def __len__(self) -> int:
+        return self._size
+
+    def read(self, start: int, end: int) -> bytes:
+        """Bytes decodificados de start até end"""
+        first_group = start // 3
+        last_group = -(-end // 3)
+        decoded = binascii.a2b_base64(
+            self._buffer[self._start + first_group * 4:min(self._start + last_group * 4, self._end)]
+        )
+        skip = start - first_group * 3
+        return decoded[skip:skip + end - start]
+
+    def chunks(self, start: int = 0, end: Optional[int] = None, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Bytes decodificados de start até end, em partes de até size bytes"""
+        end = self._size if end is None else end
+        for offset in range(start, end, size):
+            yield self.read(offset, min(offset + size, end))
+
+    def decode(self) -> bytes:
+        """Valor inteiro decodificado (uma cópia; prefira chunks())"""
+        return self.read(0, self._size)
+
+
+def _map_values(buffer) -> Optional[dict]:
+    """
+    Lê o json do arquivo trocando os valores de MAPPED_VALUES por Base64Value
+
+    Returns:
+        Conteúdo do arquivo, ou None se os valores não estão onde
+        esperado (o chamador lê o arquivo inteiro com json)
+    """
+    parts = []
+    values = {}
+    position = 0
+    while True:
+        match = _MAPPED_VALUE.search(buffer, position)
+        if match is None:
+            break
+        start = match.end()
+        end = buffer.find(b'"', start)
+        if end == -1 or buffer.find(b"\\", start, end) != -1 or match.group(1) in values:
+            return None
+        parts.append(buffer[position:start])
+        values[match.group(1)] = (start, end)
+        position = end
+    parts.append(buffer[position:])
+
+    data = json.loads(b"".join(parts))
+    data_section = data.get("data") if isinstance(data, dict) else None
+    for key, (start, end) in values.items():
+        # A chave pode ter aparecido fora de "data": lê do jeito normal
+        if not isinstance(data_section, dict) or data_section.get(key.decode()) != "":
+            return None
+        data_section[key.decode()] = Base64Value(buffer, start, end)
+    return data
+
+
+@contextmanager
+def open_wallet(path: str) -> Iterator[dict]:
+    """
+    Abre o arquivo do wallet mapeado em memória
+
+    Os valores de MAPPED_VALUES na seção "data" vêm como Base64Value e só
+    podem ser lidos dentro do bloco (o mapeamento é fechado na saída).
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existe
+        ValueError: Se o arquivo não é um json válido
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            raise json.JSONDecodeError("Arquivo vazio", "", 0)
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        data = _map_values(buffer)
+        if data is None:
+            data = json.loads(buffer[:])
+            data_section = data.get("data") if isinstance(data, dict) else None
+            if isinstance(data_section, dict):
+                for key in MAPPED_VALUES:
+                    if isinstance(data_section.get(key), str):
+                        encoded = data_section[key].encode("ascii")
+                        data_section[key] = Base64Value(encoded, 0, len(encoded))
+        yield data
+    finally:
+        buffer.close()
+
+
+class _TextStream:
+    """Texto decodificado de partes em UTF-8, lido da posição atual"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._done = False
+        self.text = ""
+        self.position = 0
+
+    def fill(self) -> bool:
+        """Lê a próxima parte (False se já leu tudo)"""
+        if self._done:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._done = True
+            chunk_text = self._decoder.decode(b"", final=True)
+        else:
+            chunk_text = self._decoder.decode(chunk)
+        self.text = self.text[self.position:] + chunk_text
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Próximo caractere depois dos espaços ("" no fim do texto)"""
+        if self.position < len(self.text) and self.text[self.position] not in " \t\n\r":
+            return self.text[self.position]
+        while True:
+            self.position = _WHITESPACE.match(self.text, self.position).end()
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Payload JSON inválido: esperado {char!r} na posição {self.position}")
+        self.position += 1
+
+    def value(self, scan_once):
+        """Próximo valor json (lendo mais partes até ele estar completo)"""
+        self.peek()
+        while True:
+            try:
+                value, end = scan_once(self.text, self.position)
+            except (StopIteration, json.JSONDecodeError):
+                if self.fill():
+                    continue
+                raise ValueError(f"Payload JSON inválido na posição {self.position}")
+            # Um número no fim do texto lido pode continuar na próxima parte
+            if end == len(self.text) and self.fill():
+                continue
+            self.position = end
+            return value
+
+
+def iter_json_entries(chunks: Iterable[bytes]) -> Iterator[dict]:
+    """
+    Entradas de um payload json ({"entries": [...]}) lido por partes
+
+    Cada entrada é devolvida assim que está completa; as demais chaves do
+    objeto são lidas e descartadas.
+
+    Args:
+        chunks: Payload em UTF-8, em partes (bytes ou memoryview)
+
+    Raises:
+        ValueError: Se o payload não é um objeto json
+    """
+    stream = _TextStream(chunks)
+    scan_once = json.scanner.make_scanner(json.JSONDecoder())
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value(scan_once)
+        stream.expect(":")
+        if key == "entries" and stream.peek() == "[":
+            stream.position += 1
+            if stream.peek() != "]":
+                while True:
+                    yield stream.value(scan_once)
+                    if stream.peek() != ",":
+                        break
+                    stream.position += 1
+            stream.expect("]")
+        else:
+            stream.value(scan_once)
+        if stream.peek() != ",":
+            break
+        stream.position += 1
+    stream.expect("}")